@@ -6,6 +6,13 @@ from src.routes.api.v1 import router as v1_router
 from src.utils.logger import setup_logger
 from contextlib import asynccontextmanager
 from src.services.firebase_service import initialize_firebase
+from src.services.auth_service import AuthService
+from src.config.db_config import SessionLocal, replica_sets
+from src.services.data_version_service import data_version_watcher
+from src.services.dimension_registry_service import dimension_registry
+from src.services.indicators_service import IndicatorsService
+from src.services.search_index_service import indicator_search_index
+from src.services.suggest_index_service import suggest_index
 from firebase_admin import delete_app, get_app
 
 logger = setup_logger(__name__, level=logging.INFO)
@@ -17,8 +24,28 @@ _SETTINGS = get_settings()
 async def lifespan(app: FastAPI):
     try:
         initialize_firebase()
+        if _SETTINGS.firebase_offline_verify:
+            await AuthService.token_verifier.start()
+        await AuthService.profile_writer.start()
+        for replicas in replica_sets():
+            await replicas.start()
+        await dimension_registry.start(SessionLocal, _SETTINGS.dimension_refresh_seconds)
+        await data_version_watcher.start(SessionLocal, _SETTINGS.data_version_check_seconds)
+        if _SETTINGS.search_index_enabled:
+            await indicator_search_index.start(SessionLocal, _SETTINGS.search_index_refresh_seconds)
+            await suggest_index.start(SessionLocal, _SETTINGS.search_index_refresh_seconds)
         yield
     finally:
+        await suggest_index.stop()
+        await indicator_search_index.stop()
+        await data_version_watcher.stop()
+        await dimension_registry.stop()
+        IndicatorsService.correlation_pool.shutdown()
+        IndicatorsService.series_loader.shutdown(wait=False, cancel_futures=True)
+        for replicas in replica_sets():
+            await replicas.stop()
+        await AuthService.profile_writer.stop()
+        await AuthService.token_verifier.stop()
         logger.info("Shutting down Firebase Admin SDK")
         delete_app(get_app())
 
@@ -0,0 +1,76 @@
+-- Resumen materializado de disponibilidad: una fila por (indicador, entidad) con datos no nulos.
+-- Se mantiene de forma incremental con triggers sobre data_values.
+
+CREATE TABLE IF NOT EXISTS indicator_entities (
+    indicator_id INT NOT NULL,
+    entity_id INT NOT NULL,
+    value_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (indicator_id, entity_id),
+    KEY ix_indicator_entities_entity (entity_id, indicator_id),
+    CONSTRAINT fk_indicator_entities_indicator FOREIGN KEY (indicator_id)
+        REFERENCES indicators (indicator_id) ON DELETE CASCADE,
+    CONSTRAINT fk_indicator_entities_entity FOREIGN KEY (entity_id)
+        REFERENCES entities (entity_id) ON DELETE CASCADE
+);
+
+INSERT INTO indicator_entities (indicator_id, entity_id, value_count)
+SELECT indicator_id, entity_id, COUNT(*)
+FROM data_values
+WHERE value IS NOT NULL
+AND indicator_id IS NOT NULL
+AND entity_id IS NOT NULL
+GROUP BY indicator_id, entity_id
+ON DUPLICATE KEY UPDATE value_count = VALUES(value_count);
+
+DROP TRIGGER IF EXISTS trg_data_values_indicator_entities_ai;
+DROP TRIGGER IF EXISTS trg_data_values_indicator_entities_ad;
+DROP TRIGGER IF EXISTS trg_data_values_indicator_entities_au;
+
+DELIMITER $$
+
+CREATE TRIGGER trg_data_values_indicator_entities_ai
+AFTER INSERT ON data_values
+FOR EACH ROW
+BEGIN
+    IF NEW.value IS NOT NULL AND NEW.indicator_id IS NOT NULL AND NEW.entity_id IS NOT NULL THEN
+        INSERT INTO indicator_entities (indicator_id, entity_id, value_count)
+        VALUES (NEW.indicator_id, NEW.entity_id, 1)
+        ON DUPLICATE KEY UPDATE value_count = value_count + 1;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_data_values_indicator_entities_ad
+AFTER DELETE ON data_values
+FOR EACH ROW
+BEGIN
+    IF OLD.value IS NOT NULL AND OLD.indicator_id IS NOT NULL AND OLD.entity_id IS NOT NULL THEN
+        UPDATE indicator_entities
+        SET value_count = value_count - 1
+        WHERE indicator_id = OLD.indicator_id AND entity_id = OLD.entity_id;
+
+        DELETE FROM indicator_entities
+        WHERE indicator_id = OLD.indicator_id AND entity_id = OLD.entity_id AND value_count <= 0;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_data_values_indicator_entities_au
+AFTER UPDATE ON data_values
+FOR EACH ROW
+BEGIN
+    IF OLD.value IS NOT NULL AND OLD.indicator_id IS NOT NULL AND OLD.entity_id IS NOT NULL THEN
+        UPDATE indicator_entities
+        SET value_count = value_count - 1
+        WHERE indicator_id = OLD.indicator_id AND entity_id = OLD.entity_id;
+
+        DELETE FROM indicator_entities
+        WHERE indicator_id = OLD.indicator_id AND entity_id = OLD.entity_id AND value_count <= 0;
+    END IF;
+
+    IF NEW.value IS NOT NULL AND NEW.indicator_id IS NOT NULL AND NEW.entity_id IS NOT NULL THEN
+        INSERT INTO indicator_entities (indicator_id, entity_id, value_count)
+        VALUES (NEW.indicator_id, NEW.entity_id, 1)
+        ON DUPLICATE KEY UPDATE value_count = value_count + 1;
+    END IF;
+END$$
+
+DELIMITER ;
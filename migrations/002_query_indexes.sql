@@ -0,0 +1,41 @@
+-- Índices secundarios para las consultas de IndicatorsService y EncajeLegalService.
+-- MySQL no tiene CREATE INDEX IF NOT EXISTS: el procedimiento `add_index_if_missing` crea solo
+-- los que faltan. Es la única definición: se conserva para que las migraciones siguientes lo usen.
+
+DROP PROCEDURE IF EXISTS add_index_if_missing;
+
+DELIMITER $$
+
+CREATE PROCEDURE add_index_if_missing(IN table_name_param VARCHAR(64), IN index_name_param VARCHAR(64), IN definition_param TEXT)
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE()
+        AND table_name = table_name_param
+        AND index_name = index_name_param
+    ) THEN
+        SET @ddl = CONCAT('ALTER TABLE ', table_name_param, ' ADD INDEX ', index_name_param, ' ', definition_param);
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END$$
+
+DELIMITER ;
+
+-- Series (indicador, entidad) y reconstrucción de indicator_entities: índice cubriente, sin leer la tabla
+CALL add_index_if_missing('data_values', 'ix_data_values_series', '(indicator_id, entity_id, period_id, value)');
+
+-- Búsqueda de entidades e indicadores por código
+CALL add_index_if_missing('entities', 'ix_entities_entity_code', '(entity_code)');
+CALL add_index_if_missing('indicators', 'ix_indicators_indicator_code', '(indicator_code)');
+
+-- Orden de búsqueda sin palabra clave y de favoritos: COALESCE(data_count, 0) DESC, indicator_id
+CALL add_index_if_missing('indicators', 'ix_indicators_rank', '((COALESCE(data_count, 0)) DESC, indicator_id)');
+
+-- Favoritos de un usuario
+CALL add_index_if_missing('user_indicator_favs', 'ix_user_indicator_favs_user', '(user_id, is_favorite, indicator_id)');
+
+-- Fechas de corte más recientes del encaje legal y filtro por fecha
+CALL add_index_if_missing('encaje_legal', 'ix_encaje_legal_fecha_corte', '(fecha_corte, category_id)');
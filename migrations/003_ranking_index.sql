@@ -0,0 +1,5 @@
+-- Índice para los rankings por (indicador, período) de /indicators/{code}/ranking.
+-- `add_index_if_missing` está definido en 002_query_indexes.sql.
+
+-- Valores de un indicador en un período, para todas las entidades: índice cubriente, sin leer la tabla
+CALL add_index_if_missing('data_values', 'ix_data_values_period', '(indicator_id, period_id, value, entity_id)');
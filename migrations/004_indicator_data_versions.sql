@@ -0,0 +1,57 @@
+-- Versión de los datos de cada indicador, incrementada por triggers en cada cambio de data_values.
+-- Los workers la consultan periódicamente para invalidar sus caches de series y rankings.
+
+CREATE TABLE IF NOT EXISTS indicator_data_versions (
+    indicator_id INT NOT NULL,
+    version BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (indicator_id),
+    CONSTRAINT fk_indicator_data_versions_indicator FOREIGN KEY (indicator_id)
+        REFERENCES indicators (indicator_id) ON DELETE CASCADE
+);
+
+DROP TRIGGER IF EXISTS trg_data_values_versions_ai;
+DROP TRIGGER IF EXISTS trg_data_values_versions_ad;
+DROP TRIGGER IF EXISTS trg_data_values_versions_au;
+
+DELIMITER $$
+
+CREATE TRIGGER trg_data_values_versions_ai
+AFTER INSERT ON data_values
+FOR EACH ROW
+BEGIN
+    IF NEW.indicator_id IS NOT NULL THEN
+        INSERT INTO indicator_data_versions (indicator_id, version)
+        VALUES (NEW.indicator_id, 1)
+        ON DUPLICATE KEY UPDATE version = version + 1;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_data_values_versions_ad
+AFTER DELETE ON data_values
+FOR EACH ROW
+BEGIN
+    IF OLD.indicator_id IS NOT NULL THEN
+        INSERT INTO indicator_data_versions (indicator_id, version)
+        VALUES (OLD.indicator_id, 1)
+        ON DUPLICATE KEY UPDATE version = version + 1;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_data_values_versions_au
+AFTER UPDATE ON data_values
+FOR EACH ROW
+BEGIN
+    IF OLD.indicator_id IS NOT NULL THEN
+        INSERT INTO indicator_data_versions (indicator_id, version)
+        VALUES (OLD.indicator_id, 1)
+        ON DUPLICATE KEY UPDATE version = version + 1;
+    END IF;
+
+    IF NEW.indicator_id IS NOT NULL AND NOT (NEW.indicator_id <=> OLD.indicator_id) THEN
+        INSERT INTO indicator_data_versions (indicator_id, version)
+        VALUES (NEW.indicator_id, 1)
+        ON DUPLICATE KEY UPDATE version = version + 1;
+    END IF;
+END$$
+
+DELIMITER ;
@@ -0,0 +1,65 @@
+"""
+Concurrency benchmark for the API.
+
+Fires the same authenticated GET request at increasing levels of in-flight
+concurrency and reports throughput and latency for each level. Run it once
+with DB_ASYNC=false and once with DB_ASYNC=true to compare both data-access
+paths against the same server and dataset.
+
+Usage:
+    python scripts/bench_concurrency.py --token <bearer> \
+        --path "/api/v1/indicators/search?query=inflation&limit=10"
+"""
+import argparse
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from bench_stats import percentile
+
+
+def _request(url: str, token: str) -> float:
+    request = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def run_level(url: str, token: str, concurrency: int, requests_per_level: int) -> dict:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(lambda _: _request(url, token), range(requests_per_level)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "throughput": requests_per_level / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/api/v1/indicators/search?query=gdp&limit=10")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--levels", default="1,2,4,8,16,32,64")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per concurrency level")
+    args = parser.parse_args()
+
+    url = args.base_url.rstrip("/") + args.path
+    # Calentamiento: caches de tokens, pool de conexiones
+    run_level(url, args.token, 1, 5)
+
+    print(f"{'in-flight':>9} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    for concurrency in (int(level) for level in args.levels.split(",")):
+        result = run_level(url, args.token, concurrency, max(args.requests, concurrency))
+        print(f"{result['concurrency']:>9} {result['throughput']:>10.1f} "
+              f"{result['p50_ms']:>10.1f} {result['p99_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+MySQL driver comparison benchmark.
+
+Runs the wide detail join used by `get_indicator_details_by_entities` against
+the configured database with every installed driver, and reports rows/second
+and p50/p99 latency per driver. Drivers that are not installed are skipped.
+
+Usage:
+    python scripts/bench_drivers.py --indicator NY.GDP.MKTP.CD --entities BOL,PER,CHL,ARG
+"""
+import argparse
+import asyncio
+import importlib.util
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import bindparam, text
+from src.config.db_config import create_async_db_engine, create_db_engine
+from src.config.db_drivers import DRIVERS
+from bench_stats import percentile
+
+# Módulo DBAPI que necesita cada driver
+_DBAPI_MODULES = {
+    "mysqlconnector": "mysql.connector",
+    "mysqldb": "MySQLdb",
+    "pymysql": "pymysql",
+    "aiomysql": "aiomysql",
+    "asyncmy": "asyncmy",
+}
+
+DETAILS_QUERY = text("""
+    SELECT i.indicator_code, il.indicator_name, il.description, i.source,
+           e.entity_code, el.entity_name, el.entity_type, dv.value, tp.period_label
+    FROM indicators i
+    JOIN indicators_lang il ON i.indicator_id = il.indicator_id
+    JOIN data_values dv ON i.indicator_id = dv.indicator_id
+    JOIN entities e ON dv.entity_id = e.entity_id
+    JOIN entities_lang el ON e.entity_id = el.entity_id
+    JOIN time_periods tp ON dv.period_id = tp.period_id
+    WHERE i.indicator_code = :indicator_code
+    AND e.entity_code IN :entity_codes
+    AND il.lang = :lang AND el.lang = :lang
+    ORDER BY e.entity_code, tp.period_label
+""").bindparams(bindparam("entity_codes", expanding=True))
+
+
+def _summary(name: str, latencies: list[float], rows: int) -> str:
+    latencies.sort()
+    p99 = percentile(latencies, 99)
+    rows_per_second = rows * len(latencies) / sum(latencies)
+    return (f"{name:>15} {rows:>8} {rows_per_second:>12.0f} "
+            f"{statistics.median(latencies) * 1000:>10.2f} {p99 * 1000:>10.2f}")
+
+
+def bench_sync(name: str, params: dict, iterations: int) -> str:
+    engine = create_db_engine(f"bench_{name}", driver=DRIVERS[name])
+    latencies, rows = [], 0
+    with engine.connect() as connection:
+        connection.execute(DETAILS_QUERY, params).fetchall()
+        for _ in range(iterations):
+            start = time.perf_counter()
+            rows = len(connection.execute(DETAILS_QUERY, params).fetchall())
+            latencies.append(time.perf_counter() - start)
+    engine.dispose()
+    return _summary(name, latencies, rows)
+
+
+async def bench_async(name: str, params: dict, iterations: int) -> str:
+    engine = create_async_db_engine(f"bench_{name}", driver=DRIVERS[name])
+    latencies, rows = [], 0
+    async with engine.connect() as connection:
+        (await connection.execute(DETAILS_QUERY, params)).fetchall()
+        for _ in range(iterations):
+            start = time.perf_counter()
+            rows = len((await connection.execute(DETAILS_QUERY, params)).fetchall())
+            latencies.append(time.perf_counter() - start)
+    await engine.dispose()
+    return _summary(name, latencies, rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--indicator", required=True)
+    parser.add_argument("--entities", required=True, help="Comma separated entity codes")
+    parser.add_argument("--lang", default="EN")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--drivers", default=",".join(DRIVERS))
+    args = parser.parse_args()
+
+    params = {"indicator_code": args.indicator, "entity_codes": args.entities.split(","), "lang": args.lang}
+
+    print(f"{'driver':>15} {'rows':>8} {'rows/s':>12} {'p50 ms':>10} {'p99 ms':>10}")
+    for name in args.drivers.split(","):
+        if importlib.util.find_spec(_DBAPI_MODULES[name]) is None:
+            print(f"{name:>15} not installed, skipped")
+            continue
+        if DRIVERS[name].is_async:
+            print(asyncio.run(bench_async(name, params, args.iterations)))
+        else:
+            print(bench_sync(name, params, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Before/after benchmark for the entity availability lookup of the search queries.
+
+Runs the top-N indicators query (the `/indicators/search` path without a
+keyword) twice: once building `entity_info` from `data_values` as before, and
+once reading the materialized `indicator_entities` table. Apply the
+migrations first (`python -m src.config.migrations`).
+
+Usage:
+    python scripts/bench_entity_info.py --limit 10 --iterations 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text
+from src.config.db_config import engine
+from bench_stats import percentile
+
+BASE_INDICATORS = """
+    SELECT i.indicator_id, i.indicator_code, il.indicator_name, il.description, i.data_count, i.source
+    FROM indicators i
+    INNER JOIN indicators_lang il ON i.indicator_id = il.indicator_id
+    WHERE il.lang = :lang
+    AND il.indicator_name IS NOT NULL AND il.indicator_name != ''
+    AND il.description IS NOT NULL AND il.description != ''
+    ORDER BY i.data_count DESC
+    LIMIT :limit
+"""
+
+ENTITIES_JSON = """
+    SELECT b.*, (
+        SELECT JSON_ARRAYAGG(JSON_OBJECT('id', entity_id, 'code', entity_code, 'name', entity_name))
+        FROM (SELECT * FROM entity_info WHERE indicator_id = b.indicator_id ORDER BY entity_name) as entities
+    ) as entities_json
+    FROM base b
+"""
+
+BEFORE = text(f"""
+    WITH base AS ({BASE_INDICATORS}),
+    entity_info AS (
+        SELECT DISTINCT dv.indicator_id, dv.entity_id, e.entity_code, el.entity_name
+        FROM data_values dv
+        JOIN base b ON dv.indicator_id = b.indicator_id
+        JOIN entities e ON dv.entity_id = e.entity_id
+        JOIN entities_lang el ON e.entity_id = el.entity_id
+        WHERE el.lang = :lang AND el.entity_name IS NOT NULL AND el.entity_name != ''
+        AND dv.value IS NOT NULL
+    )
+    {ENTITIES_JSON}
+""")
+
+AFTER = text(f"""
+    WITH base AS ({BASE_INDICATORS}),
+    entity_info AS (
+        SELECT ie.indicator_id, ie.entity_id, e.entity_code, el.entity_name
+        FROM indicator_entities ie
+        JOIN base b ON ie.indicator_id = b.indicator_id
+        JOIN entities e ON ie.entity_id = e.entity_id
+        JOIN entities_lang el ON e.entity_id = el.entity_id
+        WHERE el.lang = :lang AND el.entity_name IS NOT NULL AND el.entity_name != ''
+    )
+    {ENTITIES_JSON}
+""")
+
+
+def run(connection, statement, params: dict, iterations: int) -> list[float]:
+    connection.execute(statement, params).fetchall()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        connection.execute(statement, params).fetchall()
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--lang", default="EN")
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    params = {"limit": args.limit, "lang": args.lang}
+    print(f"{'query':>22} {'p50 ms':>10} {'p99 ms':>10}")
+    with engine.connect() as connection:
+        for name, statement in (("data_values (before)", BEFORE), ("indicator_entities", AFTER)):
+            latencies = run(connection, statement, params, args.iterations)
+            p99 = percentile(latencies, 99)
+            print(f"{name:>22} {statistics.median(latencies) * 1000:>10.2f} {p99 * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
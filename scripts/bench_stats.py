@@ -0,0 +1,9 @@
+"""Latency summaries shared by the benchmark scripts."""
+import math
+
+
+def percentile(latencies: list[float], q: float) -> float:
+    """Nearest-rank percentile (`q` in 0..100) of sorted `latencies`; valid for any sample size."""
+    if not latencies:
+        return math.nan
+    return latencies[min(max(math.ceil(len(latencies) * q / 100) - 1, 0), len(latencies) - 1)]
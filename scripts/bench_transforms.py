@@ -0,0 +1,104 @@
+"""
+Micro-benchmark for the series transforms of the detail endpoints.
+
+Shapes synthetic monthly series for a growing number of entities with
+`shape_many` (all entities transformed as one matrix) and, for comparison,
+with one pandas pipeline per entity. The transform step of `shape_many` has
+no per-entity Python overhead, so its cost per entity should stay flat (or
+drop) as entities are added, well below the per-entity pandas baseline. No
+database is needed.
+
+Usage:
+    python scripts/bench_transforms.py --entities 1 10 50 200 --years 30
+    python scripts/bench_transforms.py --transform yoy --iterations 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+from src.utils.series import MONTHS, PeriodTable, SeriesOptions, Transform, shape_many
+
+
+def synthetic(years: int, entities: int) -> tuple[PeriodTable, list[tuple[np.ndarray, np.ndarray]]]:
+    rng = np.random.default_rng(42)
+    rows = [
+        (index + 1, f"{2000 + index // 12}-{index % 12 + 1:02d}", 2000 + index // 12, MONTHS[index % 12], 2000 + index // 12)
+        for index in range(years * 12)
+    ]
+    period_ids = np.arange(1, len(rows) + 1, dtype=np.int32)
+    series = []
+    for _ in range(entities):
+        values = np.cumprod(1 + rng.normal(0.002, 0.01, len(rows))) * 100
+        values[rng.random(len(rows)) < 0.02] = np.nan
+        series.append((period_ids, values))
+    return PeriodTable(rows), series
+
+
+def pandas_baseline(periods: PeriodTable, series: list[tuple[np.ndarray, np.ndarray]], options: SeriesOptions):
+    """One pandas pipeline per entity, the shape of a per-series implementation."""
+    positions = periods.positions(series[0][0])
+    index = pd.PeriodIndex.from_fields(
+        year=periods.start_years[positions].astype(int), month=(periods.start_months[positions] % 12 + 1).astype(int), freq="M")
+    result = []
+    for _, values in series:
+        frame = pd.Series(values, index=index)
+        if options.transform == Transform.YOY:
+            frame = (frame / frame.shift(12) - 1) * 100
+        elif options.transform == Transform.PCT_CHANGE:
+            frame = frame.dropna().pct_change().reindex(index) * 100
+        elif options.transform == Transform.CAGR:
+            valid = frame.dropna()
+            years = (valid.index.year - valid.index[0].year) + (valid.index.month - valid.index[0].month) / 12
+            frame = ((valid / valid.iloc[0]) ** (1 / years) - 1).reindex(index) * 100
+        elif options.transform == Transform.ROLLING_MEAN:
+            frame = frame.rolling(options.rolling_window, min_periods=1).mean().where(frame.notna())
+        elif options.transform == Transform.INDEX:
+            frame = frame / frame[frame.index.year == frame.dropna().index[0].year].mean() * 100
+        result.append((index.astype(str).to_numpy(dtype=object), frame.to_numpy()))
+    return result
+
+
+def timed(fn, iterations: int) -> list[float]:
+    fn()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--years", type=int, default=30, help="Years of monthly data per series")
+    parser.add_argument("--transform", type=Transform, choices=list(Transform), default=None,
+                        help="Only this transform (default: all of them)")
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    transforms = [args.transform] if args.transform else list(Transform)
+    print(f"{'transform':>13} {'entities':>9} {'shape ms':>10} {'transform ms':>13} {'per entity us':>14} {'pandas ms':>10}")
+    for transform in transforms:
+        options = SeriesOptions(transform=transform)
+        for entities in args.entities:
+            periods, series = synthetic(args.years, entities)
+            shaped = timed(lambda: shape_many(series, periods, options), args.iterations)
+            # Costo base de ordenar y etiquetar cada serie, sin transformar
+            untransformed = timed(lambda: shape_many(series, periods, SeriesOptions(max_points=len(periods.ids))), args.iterations)
+            baseline = timed(lambda: pandas_baseline(periods, series, options), args.iterations)
+
+            shape_ms = statistics.median(shaped) * 1000
+            transform_ms = max(shape_ms - statistics.median(untransformed) * 1000, 0.0)
+            print(f"{transform:>13} {entities:>9} {shape_ms:>10.2f} {transform_ms:>13.3f} "
+                  f"{transform_ms * 1000 / entities:>14.1f} {statistics.median(baseline) * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
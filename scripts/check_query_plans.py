@@ -0,0 +1,307 @@
+"""
+Query-plan regression check for the service queries.
+
+Runs the request-path queries of IndicatorsService and EncajeLegalService,
+captures every SELECT they send to MySQL and runs `EXPLAIN FORMAT=JSON` on it.
+Exits with status 1 when a plan reads more than `--max-rows` estimated rows of
+a table with a full scan (`access_type: ALL`), or sorts more than `--max-rows`
+rows with a filesort. Small scans and sorts (lookup tables, materialized CTEs,
+one page of results) pass.
+
+Point the DB_* settings at a local MySQL 8. `--seed` creates the schema, loads
+synthetic data when the tables are empty and applies the migrations; never use
+it against a shared database. `tests/test_query_plans.py` runs the same checks
+when `TEST_MYSQL_DSN` is set.
+
+Usage:
+    python scripts/check_query_plans.py --seed --scale 2
+    python scripts/check_query_plans.py --max-rows 500 --verbose
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import date
+from typing import Callable, NamedTuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from src.config.db_config import SessionLocal, engine
+from src.config.migrations import migrate
+from src.models.base_model import Base
+from src.models import category_model, encaje_legal_model, indicators_model, user_model  # noqa: F401
+from src.models.indicators_model import LANGUAGE
+from src.schema.responses.indicators_responses import EntityInclude, RankingOrder
+from src.services.encaje_legal_service import EncajeLegalService
+from src.services.indicators_service import IndicatorsService
+from src.services.search_index_service import IndicatorSearchIndex, indicator_search_index
+from src.utils.correlation import CorrelationMethod
+from src.utils.series import Frequency, SeriesOptions
+
+MONTHS = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December')
+
+WORDS = ("growth", "inflation", "exports", "imports", "population", "debt", "employment",
+         "reserves", "credit", "deposits", "energy", "education", "health", "income")
+
+
+class StatementCapture:
+    """Collects the SELECT statements sent by any engine while enabled."""
+
+    def __init__(self):
+        self.enabled = False
+        self.statements: list[tuple[str, object]] = []
+        event.listen(Engine, "before_cursor_execute", self._capture)
+
+    def close(self):
+        event.remove(Engine, "before_cursor_execute", self._capture)
+
+    def _capture(self, conn, cursor, statement, parameters, context, executemany):
+        if self.enabled and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            self.statements.append((statement, parameters))
+
+    def run(self, fn) -> list[tuple[str, object]]:
+        self.statements = []
+        self.enabled = True
+        try:
+            fn()
+        finally:
+            self.enabled = False
+        return self.statements
+
+
+def plan_issues(plan: dict, max_rows: int) -> list[str]:
+    issues = []
+
+    def table_rows(node) -> int:
+        if isinstance(node, dict):
+            rows = node.get("rows_produced_per_join", 0) if "access_type" in node else 0
+            return max([rows] + [table_rows(child) for child in node.values()])
+        if isinstance(node, list):
+            return max([0] + [table_rows(child) for child in node])
+        return 0
+
+    def walk(node):
+        if isinstance(node, dict):
+            if node.get("access_type") == "ALL" and node.get("rows_examined_per_scan", 0) > max_rows:
+                issues.append(f"full scan of {node.get('table_name')} ({node['rows_examined_per_scan']} rows)")
+            if node.get("using_filesort") and table_rows(node) > max_rows:
+                issues.append(f"filesort over {table_rows(node)} rows")
+            for child in node.values():
+                walk(child)
+        elif isinstance(node, list):
+            for child in node:
+                walk(child)
+
+    walk(plan)
+    return issues
+
+
+def explain(db_engine: Engine, statement: str, parameters) -> dict:
+    with db_engine.connect() as connection:
+        row = connection.exec_driver_sql(f"EXPLAIN FORMAT=JSON {statement}", parameters).first()
+    return json.loads(row[0])
+
+
+def seed(db_engine: Engine, scale: int):
+    """Creates the schema and loads synthetic data into empty tables."""
+    Base.metadata.create_all(db_engine)
+    with db_engine.begin() as connection:
+        if connection.execute(text("SELECT COUNT(*) FROM indicators")).scalar():
+            print("Tables already have data, skipping the seed")
+        else:
+            _seed_data(connection, scale)
+        fulltext = connection.execute(text("""
+            SELECT COUNT(*) FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = 'indicators_lang' AND index_type = 'FULLTEXT'
+        """)).scalar()
+        if not fulltext:
+            connection.execute(text("ALTER TABLE indicators_lang ADD FULLTEXT INDEX ft_indicators_lang (indicator_name, description)"))
+    migrate(db_engine)
+
+
+def _seed_data(connection, scale: int):
+    rng = random.Random(42)
+    indicator_count, entity_count = 200 * scale, 100 * scale
+
+    periods = [
+        {"id": year - 1999, "label": str(year), "start_year": year, "start_month": "January",
+         "end_year": year, "end_month": "December"}
+        for year in range(2000, 2024)
+    ]
+    periods += [
+        {"id": 100 + index, "label": f"{2022 + index // 12}-{index % 12 + 1:02d}", "start_year": 2022 + index // 12,
+         "start_month": MONTHS[index % 12], "end_year": 2022 + index // 12, "end_month": MONTHS[index % 12]}
+        for index in range(24)
+    ]
+    connection.execute(text("""
+        INSERT INTO time_periods (period_id, period_label, start_year, start_month, end_year, end_month)
+        VALUES (:id, :label, :start_year, :start_month, :end_year, :end_month)
+    """), periods)
+
+    connection.execute(text("""
+        INSERT INTO indicators (indicator_id, indicator_code, unit_of_measurement, source)
+        VALUES (:id, :code, 'units', 'synthetic')
+    """), [{"id": i, "code": f"IND.{i:05d}"} for i in range(1, indicator_count + 1)])
+    connection.execute(text("""
+        INSERT INTO indicators_lang (indicator_id, lang, indicator_name, description)
+        VALUES (:id, :lang, :name, :description)
+    """), [
+        {"id": i, "lang": str(lang), "name": f"{' '.join(rng.sample(WORDS, 2)).title()} {i}",
+         "description": " ".join(rng.sample(WORDS, 6))}
+        for i in range(1, indicator_count + 1) for lang in LANGUAGE
+    ])
+
+    connection.execute(text("INSERT INTO entities (entity_id, entity_code) VALUES (:id, :code)"),
+                       [{"id": e, "code": f"E{e:04d}"} for e in range(1, entity_count + 1)])
+    connection.execute(text("""
+        INSERT INTO entities_lang (entity_id, lang, entity_name, entity_type)
+        VALUES (:id, :lang, :name, 'country')
+    """), [{"id": e, "lang": str(lang), "name": f"Entity {e}"} for e in range(1, entity_count + 1) for lang in LANGUAGE])
+
+    # Cada indicador tiene datos para una de cada cuatro entidades
+    connection.execute(text("""
+        INSERT INTO data_values (entity_id, indicator_id, period_id, value)
+        SELECT e.entity_id, i.indicator_id, tp.period_id, RAND(7) * 1000
+        FROM indicators i
+        JOIN entities e ON MOD(e.entity_id + i.indicator_id, 4) = 0
+        CROSS JOIN time_periods tp
+    """))
+    connection.execute(text("""
+        UPDATE indicators i
+        SET data_count = (SELECT COUNT(*) FROM data_values dv WHERE dv.indicator_id = i.indicator_id)
+    """))
+
+    connection.execute(text("""
+        INSERT INTO user (id, email, name, email_verified) VALUES (1, 'plans@example.com', 'Query plans', TRUE)
+    """))
+    connection.execute(text("""
+        INSERT INTO user_indicator_favs (user_id, indicator_id, is_favorite) VALUES (1, :id, TRUE)
+    """), [{"id": i} for i in rng.sample(range(1, indicator_count + 1), 25)])
+
+    connection.execute(text("INSERT INTO category (id, name) VALUES (1, 'Synthetic')"))
+    connection.execute(text("""
+        INSERT INTO encaje_legal (banco, tipo, categoria, subcategoria, valor, fecha_corte, category_id)
+        VALUES (:banco, 'MN', :categoria, :subcategoria, :valor, :fecha_corte, 1)
+    """), [
+        {"banco": f"Banco {bank}", "categoria": f"Categoria {category}", "subcategoria": f"Sub {sub}",
+         "valor": rng.uniform(0, 1000), "fecha_corte": date(2020 + month // 12, month % 12 + 1, 1)}
+        for month in range(48 * scale) for bank in range(10) for category in range(3) for sub in range(2)
+    ])
+    print(f"Seeded {indicator_count} indicators, {entity_count} entities and {len(periods)} periods")
+
+
+def sample_codes(db) -> tuple[list[str], list[str], int]:
+    rows = db.execute(text("""
+        SELECT i.indicator_code, e.entity_code
+        FROM indicator_entities ie
+        JOIN indicators i ON ie.indicator_id = i.indicator_id
+        JOIN entities e ON ie.entity_id = e.entity_id
+        ORDER BY ie.value_count DESC, ie.indicator_id, ie.entity_id
+        LIMIT 3
+    """)).fetchall()
+    user_id = db.execute(text("SELECT user_id FROM user_indicator_favs LIMIT 1")).scalar()
+    return list(dict.fromkeys(row[0] for row in rows)), list(dict.fromkeys(row[1] for row in rows)), user_id
+
+
+class Check(NamedTuple):
+    name: str
+    run: Callable[[], object]
+    # Se ejecuta antes de capturar: sus consultas no son parte del camino medido
+    prepare: Callable[[], object] | None = None
+
+
+def checks(db: Session, indicator_codes: list[str], entity_codes: list[str], user_id: int,
+           search_index: IndicatorSearchIndex = indicator_search_index) -> list[Check]:
+    service = IndicatorsService()
+    en = LANGUAGE.EN
+
+    def next_page():
+        page = service.search_indicators(None, 10, en, db)
+        service.search_indicators(None, 10, en, db, cursor=page.next_cursor)
+
+    # La búsqueda por palabra clave usa MATCH ... AGAINST hasta que el índice BM25 se carga
+    return [
+        Check("search without keyword", lambda: service.search_indicators(None, 10, en, db)),
+        Check("search without keyword, next page", next_page),
+        Check("search with entity_count", lambda: service.search_indicators(None, 10, en, db, include=EntityInclude.ENTITY_COUNT)),
+        Check("search keyword (MATCH fallback)", lambda: service.search_indicators("growth", 10, en, db)),
+        Check("search keyword (BM25 ids)", lambda: service.search_indicators("growth", 10, en, db),
+              prepare=lambda: search_index.refresh(db)),
+        Check("favorite ids", lambda: service.get_favorite_ids(db, user_id)),
+        Check("favorites page", lambda: service.get_user_favorites(db, user_id, 10)),
+        Check("available entities", lambda: service.get_indicator_entities(indicator_codes[0], en, db)),
+        Check("indicator details", lambda: service.get_indicator_details(indicator_codes[0], entity_codes[0], en, db)),
+        Check("indicator details, windowed", lambda: service.get_indicator_details(
+            indicator_codes[0], entity_codes[0], en, db, SeriesOptions(from_year=2010, to_year=2020, frequency=Frequency.YEARLY))),
+        Check("indicator details by entities", lambda: service.get_indicator_details_by_entities(indicator_codes[0], entity_codes, en, db)),
+        Check("indicator details batch", lambda: service.get_indicator_details_batch(indicator_codes, entity_codes, en, db)),
+        Check("indicator ranking", lambda: service.get_indicator_ranking(indicator_codes[0], "2020", 10, RankingOrder.DESC, entity_codes[0], en, db)),
+        Check("indicator correlation", lambda: service.get_indicator_correlation(
+            entity_codes[0], indicator_codes, CorrelationMethod.PEARSON, 2000, 2020, en, db)),
+        Check("encaje legal by date", lambda: EncajeLegalService().get_grouped_entries_by_date(db)),
+    ]
+
+
+def run_checks(db_engine: Engine, db: Session, max_rows: int, verbose: bool = False,
+               search_index: IndicatorSearchIndex = indicator_search_index) -> list[tuple[str, int, list[str]]]:
+    """`(name, statements, issues)` of every check, with `db` bound to `db_engine`."""
+    indicator_codes, entity_codes, user_id = sample_codes(db)
+    if not indicator_codes or user_id is None:
+        raise LookupError("No data to check: run with --seed against a local database")
+
+    capture = StatementCapture()
+    results = []
+    try:
+        for check in checks(db, indicator_codes, entity_codes, user_id, search_index):
+            IndicatorsService.search_cache.clear()
+            IndicatorsService.series_cache.clear()
+            IndicatorsService.ranking_cache.clear()
+            IndicatorsService.correlation_cache.clear()
+            if check.prepare:
+                check.prepare()
+            statements = capture.run(check.run)
+            issues = []
+            for statement, parameters in statements:
+                plan = explain(db_engine, statement, parameters)
+                issues += plan_issues(plan, max_rows)
+                if verbose:
+                    print(statement.strip(), json.dumps(plan, indent=2), sep="\n")
+            results.append((check.name, len(statements), list(dict.fromkeys(issues))))
+    finally:
+        capture.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="Create the schema and load synthetic data first")
+    parser.add_argument("--scale", type=int, default=1, help="Synthetic data size multiplier")
+    parser.add_argument("--max-rows", type=int, default=1000, help="Largest full scan or filesort allowed")
+    parser.add_argument("--verbose", action="store_true", help="Print every captured statement and its plan")
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(engine, args.scale)
+
+    with SessionLocal() as db:
+        try:
+            results = run_checks(engine, db, args.max_rows, args.verbose)
+        except LookupError as e:
+            sys.exit(str(e))
+
+    for name, statements, issues in results:
+        status = "FAIL" if issues else "ok"
+        print(f"{status:>4}  {name} ({statements} statements)")
+        for issue in issues:
+            print(f"      {issue}")
+
+    sys.exit(1 if any(issues for _, _, issues in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
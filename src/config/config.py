@@ -17,6 +17,30 @@ class Settings(BaseSettings):
     db_password: str = "root"
     db_port: int = 3306
     db_name: str = "axioma"
+    # Driver MySQL: mysqlconnector | mysqldb | pymysql (síncronos), aiomysql | asyncmy (asíncronos)
+    db_driver: str = "mysqlconnector"
+    db_async_driver: str = "aiomysql"
+    # Decodifica DECIMAL directamente a float en los drivers que lo permiten
+    db_decimal_as_float: bool = True
+    # Motor asíncrono; si es False se usa el motor síncrono en el threadpool. Las consultas
+    # con cálculo pesado (series, rankings, correlaciones) usan siempre el motor síncrono
+    db_async: bool = False
+
+    # Pool de conexiones
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    # Debe ser menor que el `wait_timeout` de MySQL para no reutilizar conexiones cerradas
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_isolation_level: str | None = None
+
+    # Réplicas de lectura: "host[:puerto]" separados por comas, mismas credenciales que el primario
+    db_replica_hosts: str = ""
+    db_replica_strategy: str = "round_robin"  # round_robin | least_connections
+    db_replica_health_interval_seconds: float = 10.0
+    # Tras escribir, las lecturas del usuario van al primario durante esta ventana
+    db_read_your_writes_seconds: float = 5.0
 
     # Firebase Configuration
     firebase_type: str = "service_account"
@@ -31,6 +55,63 @@ class Settings(BaseSettings):
     firebase_client_x509_cert_url: str
     firebase_universe_domain: str = "googleapis.com"
     firebase_database_url: str
+    # Verificación local de ID tokens con certificados precargados
+    firebase_offline_verify: bool = True
+    firebase_id_token_cert_url: str = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+    firebase_cert_min_refresh_seconds: int = 60
+
+    # Cache de tokens verificados (se desactiva en modo estricto de revocación)
+    auth_token_cache_enabled: bool = True
+    auth_token_cache_size: int = 10000
+    auth_check_revoked: bool = False
+
+    # Cache de identidad de usuarios y sincronización diferida de perfiles
+    user_cache_size: int = 50000
+    user_cache_ttl_seconds: int = 900
+    user_sync_interval_seconds: float = 5.0
+    user_sync_batch_size: int = 200
+
+    # Tokens de sesión locales firmados con HMAC; sin secreto quedan deshabilitados
+    session_token_secret: str = ""
+    session_token_ttl_seconds: int = 900
+    # Correos (separados por comas) con acceso a los endpoints internos de /metrics
+    admin_emails: str = ""
+
+    # Índice de búsqueda BM25 en memoria (si está deshabilitado se usa MATCH ... AGAINST)
+    search_index_enabled: bool = True
+    search_index_refresh_seconds: float = 300.0
+    # Cache compartido de resultados de búsqueda
+    search_cache_size: int = 2000
+    search_cache_ttl_seconds: float = 300.0
+    # Tamaño máximo de página en búsquedas y favoritos
+    max_page_size: int = 50
+    # Filas por lote al exportar indicadores (cursor del lado del servidor)
+    export_batch_size: int = 5000
+    # Registro en memoria de indicadores, entidades y períodos
+    dimension_refresh_seconds: float = 300.0
+    # Cache de series (indicador, entidad) para los detalles de indicadores, en bytes
+    series_cache_max_bytes: int = 128 * 1024 * 1024
+    # En un miss con ventana de años, las series con al menos estos valores se leen ya
+    # recortadas en SQL; la serie completa se carga al cache en segundo plano
+    series_window_min_values: int = 2000
+    # Cada cuánto se comparan las versiones de datos por indicador para invalidar los caches
+    data_version_check_seconds: float = 30.0
+    # Rankings ordenados por (indicador, período) y máximo de entidades por respuesta
+    ranking_cache_max_bytes: int = 32 * 1024 * 1024
+    ranking_max_top: int = 100
+    # Matrices de correlación: cache, límites y cálculo en procesos aparte a partir de
+    # `correlation_process_threshold` celdas (indicadores × períodos)
+    correlation_cache_size: int = 500
+    correlation_cache_ttl_seconds: float = 900.0
+    correlation_max_indicators: int = 50
+    correlation_min_periods: int = 3
+    correlation_process_threshold: int = 20000
+    correlation_workers: int = 2
+    # Límites de /indicators/batch
+    batch_max_indicators: int = 30
+    batch_max_entities: int = 50
+    # Sugerencias (typeahead): índice de prefijos en memoria, refrescado junto al de búsqueda
+    suggest_max_limit: int = 20
 
     class Config:
         env_file = ".env"
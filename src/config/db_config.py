@@ -1,14 +1,49 @@
 import logging
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from typing import Any, Callable, TypeVar
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 from src.config.config import get_settings
+from src.config.db_drivers import DRIVERS, DriverSpec, get_driver
+from src.config.db_routing import USE_PRIMARY, RecentWriters, Replica, ReplicaSet, RoutingSession
 from src.utils.logger import setup_logger
+from src.utils.pool_metrics import PoolMetrics
 
 logger = setup_logger(__name__, level=logging.DEBUG)
 
 _SETTINGS = get_settings()
 
-DATABASE_URL = f"mysql+mysqlconnector://{_SETTINGS.db_user}:{_SETTINGS.db_password}@{_SETTINGS.db_host}:{_SETTINGS.db_port}/{_SETTINGS.db_name}"
+T = TypeVar("T")
+
+# Drivers seleccionados por configuración
+SYNC_DRIVER = get_driver(_SETTINGS.db_driver, is_async=False)
+ASYNC_DRIVER = get_driver(_SETTINGS.db_async_driver, is_async=True)
+
+
+def _database_url(driver: DriverSpec, host: str, port: int) -> URL:
+    return URL.create(
+        f"mysql+{driver.name}",
+        username=_SETTINGS.db_user,
+        password=_SETTINGS.db_password,
+        host=host,
+        port=port,
+        database=_SETTINGS.db_name,
+    )
+
+
+def _replica_addresses() -> list[tuple[str, int]]:
+    addresses = []
+    for entry in filter(None, (item.strip() for item in _SETTINGS.db_replica_hosts.split(","))):
+        host, _, port = entry.partition(":")
+        addresses.append((host, int(port) if port else _SETTINGS.db_port))
+    return addresses
+
+
+DATABASE_URL = _database_url(SYNC_DRIVER, _SETTINGS.db_host, _SETTINGS.db_port)
+ASYNC_DATABASE_URL = _database_url(ASYNC_DRIVER, _SETTINGS.db_host, _SETTINGS.db_port)
 
 # Obteniendo el motor de la base de datos
 if not _SETTINGS.db_user or not _SETTINGS.db_password or not _SETTINGS.db_host or not _SETTINGS.db_port or not _SETTINGS.db_name:
@@ -16,8 +51,119 @@ if not _SETTINGS.db_user or not _SETTINGS.db_password or not _SETTINGS.db_host o
 else:
     logger.info('Variables de entorno de la base de datos configuradas')
 
-engine = create_engine(DATABASE_URL, echo=False)
-SessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=engine)
+# Métricas de cada pool, por nombre de motor
+pool_metrics: dict[str, PoolMetrics] = {}
+
+
+def _engine_options(driver: DriverSpec, pool_class: type[Pool]) -> dict:
+    options = {
+        "echo": False,
+        "connect_args": driver.connect_args(_SETTINGS.db_decimal_as_float),
+        "poolclass": pool_class,
+        "pool_size": _SETTINGS.db_pool_size,
+        "max_overflow": _SETTINGS.db_max_overflow,
+        "pool_timeout": _SETTINGS.db_pool_timeout,
+        "pool_recycle": _SETTINGS.db_pool_recycle,
+        "pool_pre_ping": _SETTINGS.db_pool_pre_ping,
+    }
+    if _SETTINGS.db_isolation_level:
+        options["isolation_level"] = _SETTINGS.db_isolation_level
+    return options
+
+
+def create_db_engine(name: str, driver: DriverSpec = SYNC_DRIVER, host: str = _SETTINGS.db_host, port: int = _SETTINGS.db_port) -> Engine:
+    metrics = PoolMetrics(name)
+    db_engine = create_engine(
+        _database_url(driver, host, port), **_engine_options(driver, metrics.instrument(QueuePool)))
+    metrics.attach(db_engine)
+    pool_metrics[name] = metrics
+    return db_engine
+
+
+def create_async_db_engine(name: str, driver: DriverSpec = ASYNC_DRIVER, host: str = _SETTINGS.db_host, port: int = _SETTINGS.db_port) -> AsyncEngine:
+    metrics = PoolMetrics(name)
+    db_engine = create_async_engine(
+        _database_url(driver, host, port), **_engine_options(driver, metrics.instrument(AsyncAdaptedQueuePool)))
+    metrics.attach(db_engine.sync_engine)
+    pool_metrics[name] = metrics
+    return db_engine
+
+
+def _sync_replica(name: str, host: str, port: int) -> Replica:
+    replica_engine = create_db_engine(name, host=host, port=port)
+
+    def _ping():
+        with replica_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    async def ping():
+        await run_in_threadpool(_ping)
+
+    return Replica(name=name, engine=replica_engine, ping=ping)
+
+
+def _async_replica(name: str, host: str, port: int) -> Replica:
+    replica_engine = create_async_db_engine(name, host=host, port=port)
+
+    async def ping():
+        async with replica_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    # Las sesiones asíncronas enlazan el motor síncrono subyacente
+    return Replica(name=name, engine=replica_engine.sync_engine, ping=ping)
+
+
+def _replica_set(factory: Callable[[str, str, int], Replica], suffix: str = "") -> ReplicaSet:
+    return ReplicaSet(
+        [factory(f"replica_{index}{suffix}", host, port) for index, (host, port) in enumerate(_replica_addresses())],
+        strategy=_SETTINGS.db_replica_strategy,
+        health_interval=_SETTINGS.db_replica_health_interval_seconds,
+    )
+
+
+engine = create_db_engine("primary")
+replica_set = _replica_set(_sync_replica)
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=True, bind=engine, class_=RoutingSession, replica_set=replica_set)
+
+# Motor asíncrono, solo si está habilitado por configuración
+async_engine = create_async_db_engine("primary_async") if _SETTINGS.db_async else None
+async_replica_set = _replica_set(_async_replica, "_async") if async_engine else None
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=True, expire_on_commit=False,
+    sync_session_class=RoutingSession, replica_set=async_replica_set) if async_engine else None
+
+# Usuarios que escribieron hace poco: sus lecturas van al primario
+recent_writers = RecentWriters(_SETTINGS.db_read_your_writes_seconds)
+
+
+def replica_sets() -> list[ReplicaSet]:
+    return [rs for rs in (replica_set, async_replica_set) if rs is not None]
+
+
+def stream_options(batch_size: int = 1000) -> dict:
+    """
+    Execution options to read large results in batches.
+
+    Only drivers with server-side cursors (mysqldb, pymysql, aiomysql, asyncmy)
+    stream rows from the server; mysqlconnector buffers the whole result, so
+    check `server_side_cursors` first. While the cursor is open the connection
+    cannot run other queries.
+    """
+    return {"stream_results": True, "yield_per": batch_size}
+
+
+def server_side_cursors(db: Session) -> bool:
+    """Whether the session's driver streams `stream_options` queries instead of buffering them."""
+    driver = DRIVERS.get(db.get_bind().dialect.driver)
+    return driver is not None and driver.server_side_cursors
+
+
+def use_primary(db: Session | AsyncSession):
+    """Pins the session to the primary, for writes and read-your-writes paths."""
+    session = db.sync_session if isinstance(db, AsyncSession) else db
+    session.info[USE_PRIMARY] = True
+
 
 def get_db():
     db = SessionLocal()
@@ -26,10 +172,45 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Dependencia de sesión usada por las rutas: asíncrona o síncrona según `db_async`
+get_session = get_async_db if _SETTINGS.db_async else get_db
+
+
+def _run_with_sync_session(pin_primary: bool, fn: Callable[..., T], args: tuple, kwargs: dict) -> T:
+    with SessionLocal() as session:
+        if pin_primary:
+            session.info[USE_PRIMARY] = True
+        return fn(session, *args, **kwargs)
+
+
+async def run_db(db: Session | AsyncSession, fn: Callable[..., T], *args: Any, cpu_bound: bool = False, **kwargs: Any) -> T:
+    """
+    Runs synchronous data-access code `fn(session, *args, **kwargs)` without blocking the event loop.
+
+    With a Session the code runs in the threadpool. With an AsyncSession it runs
+    on the async driver through `run_sync`, which executes `fn` itself on the
+    event loop: fine for code that mostly waits on queries, but not for code
+    that also shapes series or sorts arrays. `cpu_bound=True` runs such code in
+    the threadpool on a sync session, which keeps the request's primary pin.
+    """
+    if isinstance(db, AsyncSession):
+        if cpu_bound:
+            pin_primary = bool(db.sync_session.info.get(USE_PRIMARY))
+            return await run_in_threadpool(_run_with_sync_session, pin_primary, fn, args, kwargs)
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
 if __name__ == "__main__":
     try:
         logger.info("Iniciando conexión a la base de datos")
         with engine.connect() as connection:
             logger.info("Conexión a la base de datos establecida correctamente.")
     except Exception as e:
-        logger.error(f"Error al conectar con la base de datos: {e}")
\ No newline at end of file
+        logger.error(f"Error al conectar con la base de datos: {e}")
@@ -0,0 +1,64 @@
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+def _mysqldb_connect_args(decimal_as_float: bool) -> dict:
+    if not decimal_as_float:
+        return {}
+    from MySQLdb.constants import FIELD_TYPE
+    from MySQLdb.converters import conversions
+    conv = conversions.copy()
+    conv[FIELD_TYPE.DECIMAL] = float
+    conv[FIELD_TYPE.NEWDECIMAL] = float
+    return {"conv": conv}
+
+
+def _pymysql_connect_args(decimal_as_float: bool) -> dict:
+    # aiomysql reutiliza los conversores de PyMySQL
+    if not decimal_as_float:
+        return {}
+    from pymysql.constants import FIELD_TYPE
+    from pymysql.converters import conversions
+    conv = conversions.copy()
+    conv[FIELD_TYPE.DECIMAL] = float
+    conv[FIELD_TYPE.NEWDECIMAL] = float
+    return {"conv": conv}
+
+
+@dataclass(frozen=True)
+class DriverSpec:
+    """
+    A MySQL DBAPI driver usable by the engine factory.
+
+    Args:
+        name (str): SQLAlchemy driver name (`mysql+<name>://`).
+        is_async (bool): Whether the driver is used through `create_async_engine`.
+        server_side_cursors (bool): Whether `stream_results` / `yield_per` use an unbuffered cursor.
+        connect_args (Callable): Builds driver `connect_args`; receives `decimal_as_float`, which
+            decodes DECIMAL columns straight to float instead of building `Decimal` objects.
+    """
+    name: str
+    is_async: bool
+    server_side_cursors: bool
+    connect_args: Callable[[bool], dict] = field(default=lambda decimal_as_float: {})
+
+
+DRIVERS: dict[str, DriverSpec] = {
+    # Conector puro Python (por defecto)
+    "mysqlconnector": DriverSpec("mysqlconnector", is_async=False, server_side_cursors=False),
+    # mysqlclient, extensión en C
+    "mysqldb": DriverSpec("mysqldb", is_async=False, server_side_cursors=True, connect_args=_mysqldb_connect_args),
+    "pymysql": DriverSpec("pymysql", is_async=False, server_side_cursors=True, connect_args=_pymysql_connect_args),
+    "aiomysql": DriverSpec("aiomysql", is_async=True, server_side_cursors=True, connect_args=_pymysql_connect_args),
+    "asyncmy": DriverSpec("asyncmy", is_async=True, server_side_cursors=True),
+}
+
+
+def get_driver(name: str, is_async: bool) -> DriverSpec:
+    driver = DRIVERS.get(name)
+    if driver is None:
+        raise ValueError(f"Unknown MySQL driver '{name}'. Available: {', '.join(DRIVERS)}")
+    if driver.is_async != is_async:
+        kind = "async" if is_async else "sync"
+        raise ValueError(f"MySQL driver '{name}' cannot be used as the {kind} driver")
+    return driver
@@ -0,0 +1,161 @@
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+from sqlalchemy import Delete, Insert, Update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__, level=logging.INFO)
+
+# Clave en `Session.info` que fija la sesión al primario
+USE_PRIMARY = "use_primary"
+_REPLICA = "replica"
+
+ROUND_ROBIN = "round_robin"
+LEAST_CONNECTIONS = "least_connections"
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: Engine
+    ping: Callable[[], Awaitable[None]]
+    healthy: bool = True
+    # Marcas de tiempo (epoch) del último chequeo y del último chequeo exitoso
+    last_check_at: float | None = None
+    last_healthy_at: float | None = None
+
+
+class ReplicaSet:
+    """
+    Read replicas of one primary, with health checks and a selection strategy.
+
+    `choose()` returns a healthy replica engine (round robin or least checked-out
+    connections) or None when every replica is down, so callers fall back to the primary.
+    """
+
+    def __init__(self, replicas: list[Replica], strategy: str = ROUND_ROBIN, health_interval: float = 10.0):
+        if strategy not in (ROUND_ROBIN, LEAST_CONNECTIONS):
+            raise ValueError(f"Unknown replica strategy: {strategy}")
+        self.replicas = replicas
+        self.strategy = strategy
+        self.health_interval = health_interval
+        self._counter = itertools.count()
+        self._task: asyncio.Task | None = None
+
+    def choose(self) -> Engine | None:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.strategy == LEAST_CONNECTIONS:
+            return min(healthy, key=lambda replica: replica.engine.pool.checkedout()).engine
+        return healthy[next(self._counter) % len(healthy)].engine
+
+    async def check(self):
+        for replica in self.replicas:
+            try:
+                await asyncio.wait_for(replica.ping(), timeout=self.health_interval)
+                if not replica.healthy:
+                    logger.info(f"Replica {replica.name} is healthy again")
+                replica.healthy = True
+                replica.last_healthy_at = time.time()
+            except Exception as e:
+                # El detalle del error solo va al log, nunca a la respuesta de /metrics
+                if replica.healthy:
+                    logger.error(f"Replica {replica.name} failed its health check: {e}")
+                else:
+                    logger.debug(f"Replica {replica.name} is still unhealthy: {e}")
+                replica.healthy = False
+            replica.last_check_at = time.time()
+
+    async def _run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.health_interval)
+
+    async def start(self):
+        if self.replicas:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> list[dict]:
+        """Health state and check timestamps of each replica, without hosts or error details."""
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "last_check_at": replica.last_check_at,
+                "last_healthy_at": replica.last_healthy_at,
+            }
+            for replica in self.replicas
+        ]
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to a replica and writes to the primary bind.
+
+    The replica is chosen once per session. As soon as the session flushes or
+    executes DML it stays on the primary, so it reads its own writes.
+    """
+
+    def __init__(self, *args, replica_set: ReplicaSet | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica_set = replica_set
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.info[USE_PRIMARY] = True
+
+        if self.replica_set is None or self.info.get(USE_PRIMARY):
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+        if _REPLICA not in self.info:
+            self.info[_REPLICA] = self.replica_set.choose()
+        return self.info[_REPLICA] or super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+class RecentWriters:
+    """Remembers which users wrote recently, so their next reads go to the primary."""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._writes: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def note(self, user_id: int):
+        now = time.monotonic()
+        with self._lock:
+            # Reinsertar deja el dict ordenado por vencimiento: los vencidos están al principio
+            self._writes.pop(user_id, None)
+            self._writes[user_id] = now + self.window_seconds
+            expired = [key for key, _ in itertools.takewhile(lambda item: item[1] <= now, self._writes.items())]
+            for key in expired:
+                del self._writes[key]
+
+    def is_recent(self, user_id: int) -> bool:
+        deadline = self._writes.get(user_id)
+        if deadline is None:
+            return False
+        if deadline <= time.monotonic():
+            with self._lock:
+                if self._writes.get(user_id, 0.0) <= time.monotonic():
+                    self._writes.pop(user_id, None)
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._writes)
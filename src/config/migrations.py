@@ -0,0 +1,74 @@
+import logging
+from pathlib import Path
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from src.config.db_config import engine
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__, level=logging.INFO)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+
+
+def split_statements(sql: str) -> list[str]:
+    """
+    Splits a migration script into statements.
+
+    Supports the `DELIMITER` directive of the mysql client, so trigger and
+    procedure bodies containing `;` can be written as usual.
+    """
+    statements = []
+    delimiter = ";"
+    buffer = []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if stripped.upper().startswith("DELIMITER "):
+            delimiter = stripped.split(None, 1)[1]
+            continue
+        if not buffer and (not stripped or stripped.startswith("--")):
+            continue
+        buffer.append(line)
+        if stripped.endswith(delimiter):
+            statement = "\n".join(buffer).rstrip()[:-len(delimiter)].strip()
+            if statement:
+                statements.append(statement)
+            buffer = []
+    if "\n".join(buffer).strip():
+        statements.append("\n".join(buffer).strip())
+    return statements
+
+
+def migrate(db_engine: Engine = engine) -> list[str]:
+    """Applies pending `migrations/*.sql` files in name order and records them in `schema_migrations`."""
+    with db_engine.begin() as connection:
+        connection.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version VARCHAR(255) PRIMARY KEY,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+        applied = set(connection.execute(text("SELECT version FROM schema_migrations")).scalars())
+
+    newly_applied = []
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        if path.stem in applied:
+            continue
+        logger.info(f"Applying migration {path.name}")
+        # MySQL confirma implícitamente el DDL: cada archivo debe ser idempotente
+        with db_engine.begin() as connection:
+            for statement in split_statements(path.read_text(encoding="utf-8")):
+                connection.exec_driver_sql(statement)
+            connection.execute(
+                text("INSERT INTO schema_migrations (version) VALUES (:version)"), {"version": path.stem})
+        newly_applied.append(path.stem)
+
+    logger.info(f"Applied {len(newly_applied)} migrations")
+    return newly_applied
+
+
+if __name__ == "__main__":
+    try:
+        migrate()
+    except Exception as e:
+        logger.error(f"Error applying migrations: {e}")
+        raise
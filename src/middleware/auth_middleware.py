@@ -1,75 +1,79 @@
 import logging
 import traceback
-from typing import Callable
-from fastapi import Request, HTTPException, status
+from fastapi import Depends, Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.services.auth_service import AuthService
-from src.config.db_config import get_db
-from functools import wraps
-from src.schema.auth_schemas import User
+from src.config.config import get_settings
+from src.config.db_config import get_session, recent_writers, use_primary
+from src.schema.auth_schemas import UserIdentity
 from src.utils.logger import setup_logger
 
 security = HTTPBearer()
 logger = setup_logger(__name__, level=logging.INFO)
 
+_ADMIN_EMAILS = {email.strip().lower() for email in get_settings().admin_emails.split(",") if email.strip()}
 
-def verify_token(func: Callable) -> Callable:
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        # Get request from kwargs instead of args
-        request = kwargs.get('request')
 
-        if not request or not isinstance(request, Request):
-            logger.error(f"Request not found in kwargs: {kwargs}")
+async def verify_token(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session | AsyncSession = Depends(get_session),
+) -> UserIdentity:
+    # FastAPI cachea las dependencias por request: `get_session` aquí y en la ruta
+    # resuelven a la misma sesión, que se cierra al terminar la request.
+    try:
+        if not credentials:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Request object not found"
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Bearer token missing"
             )
 
-        try:
-            # Extract token from Authorization header
-            credentials: HTTPAuthorizationCredentials = await security(request)
-            if not credentials:
+        token = credentials.credentials
+        if AuthService.session_tokens.is_session_token(token):
+            # Token de sesión local: solo verificación HMAC, sin Firebase ni base de datos
+            try:
+                decoded_token = AuthService.session_tokens.verify(token)
+            except ValueError as e:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Bearer token missing"
+                    detail=f"Invalid session token: {e}"
                 )
+            user = AuthService.session_tokens.to_identity(decoded_token)
+        else:
+            # Verify Firebase token and get or create the user in database
+            decoded_token, user = await AuthService.authenticate_firebase(db, token)
 
-            # Verify token using existing AuthService
-            token = credentials.credentials
-            decoded_token = await AuthService.validate_token(token)
-
-            # Create user if not exists using Firebase user info
-            user_info = User(
-                email=decoded_token.get('email'),
-                name=decoded_token.get('name'),
-                picture=decoded_token.get('picture'),
-                email_verified=decoded_token.get('email_verified', False),
-                phone=decoded_token.get('phone_number', None),
-            )
-
-            # Get database session
-            db = next(get_db())
+        # Read-your-writes: tras una escritura reciente el usuario lee del primario
+        if recent_writers.is_recent(user.id):
+            use_primary(db)
 
-            # Get or create user in database
-            user = await AuthService.get_or_create_user(db, user_info)
+        # Add both decoded token and database user to request state
+        request.state.user = decoded_token
+        request.state.db_user = user
 
-            # Add both decoded token and database user to request state
-            request.state.user = decoded_token
-            request.state.db_user = user
+        return user
 
-            return await func(*args, **kwargs)
+    except HTTPException as e:
+        logger.error(
+            f"HTTP error occurred while verifying token: {e}\nTraceback:\n{traceback.format_exc()}")
+        raise e
+    except Exception as e:
+        logger.error(
+            f"Error occurred while verifying token: {e}\nTraceback:\n{traceback.format_exc()}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Invalid authentication credentials: {str(e)}"
+        )
 
-        except HTTPException as e:
-            logger.error(
-                f"HTTP error occurred while verifying token: {e}\nTraceback:\n{traceback.format_exc()}")
-            raise e
-        except Exception as e:
-            logger.error(
-                f"Error occurred while verifying token: {e}\nTraceback:\n{traceback.format_exc()}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Invalid authentication credentials: {str(e)}"
-            )
 
-    return wrapper
+async def require_admin(user: UserIdentity = Depends(verify_token)) -> UserIdentity:
+    # Endpoints internos (métricas): solo los correos de `admin_emails`
+    if user.email.lower() not in _ADMIN_EMAILS:
+        logger.warning(f"User {user.id} denied access to an admin endpoint")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return user
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DECIMAL, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, DECIMAL, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from src.models.base_model import Base
 
@@ -14,5 +14,9 @@ class EncajeLegalModel(Base):
     fecha_corte = Column(Date, nullable=False)
     category_id = Column(Integer, ForeignKey('category.id', ondelete="CASCADE"), nullable=False)
 
+    __table_args__ = (
+        Index('ix_encaje_legal_fecha_corte', 'fecha_corte', 'category_id'),
+    )
+
     # Relación con CategoryModel
     category = relationship("CategoryModel", back_populates="encajes")
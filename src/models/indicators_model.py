@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, String, Integer, ForeignKey, DECIMAL, Text, Enum as EnumDB, Index, Table
+    BigInteger, Column, String, Integer, ForeignKey, DECIMAL, Text, Enum as EnumDB, Index, Table, func
 )
 from src.models.base_model import Base
 from enum import StrEnum
@@ -13,7 +13,7 @@ class LANGUAGE(StrEnum):
 class Entity(Base):
     __tablename__ = "entities"
     entity_id = Column(Integer, primary_key=True)
-    entity_code = Column(String(50), nullable=False)
+    entity_code = Column(String(50), nullable=False, index=True)
 
 
 class EntityLang(Base):
@@ -51,6 +51,10 @@ class Indicator(Base):
     source = Column(String(100))
 
 
+# Orden de búsqueda y favoritos: COALESCE(data_count, 0) DESC, indicator_id
+Index("ix_indicators_rank", func.coalesce(Indicator.data_count, 0).desc(), Indicator.indicator_id)
+
+
 class IndicatorLang(Base):
     __tablename__ = "indicators_lang"
     indicator_id = Column(Integer, ForeignKey(
@@ -81,3 +85,28 @@ class DataValue(Base):
     indicator_id = Column(Integer, ForeignKey("indicators.indicator_id"))
     period_id = Column(Integer, ForeignKey("time_periods.period_id"))
     value = Column(DECIMAL(20, 10))
+
+    __table_args__ = (
+        # Cubre la lectura de series (indicador, entidad) sin tocar la tabla
+        Index("ix_data_values_series", "indicator_id", "entity_id", "period_id", "value"),
+        # Cubre los rankings (indicador, período) entre entidades
+        Index("ix_data_values_period", "indicator_id", "period_id", "value", "entity_id"),
+    )
+
+
+class IndicatorEntity(Base):
+    # Resumen mantenido por triggers: (indicador, entidad) con al menos un valor no nulo
+    __tablename__ = "indicator_entities"
+    indicator_id = Column(Integer, ForeignKey(
+        "indicators.indicator_id"), primary_key=True)
+    entity_id = Column(Integer, ForeignKey(
+        "entities.entity_id"), primary_key=True)
+    value_count = Column(Integer, nullable=False, default=0)
+
+
+class IndicatorDataVersion(Base):
+    # Contador por indicador que los triggers incrementan en cada cambio de data_values
+    __tablename__ = "indicator_data_versions"
+    indicator_id = Column(Integer, ForeignKey(
+        "indicators.indicator_id"), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
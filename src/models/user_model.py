@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, TIMESTAMP, text
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, TIMESTAMP, Index, text
 from src.models.base_model import Base
 
 
@@ -24,3 +24,7 @@ class UserIndicatorFavorites(Base):
     created_at = Column(TIMESTAMP, server_default=text('CURRENT_TIMESTAMP'))
     updated_at = Column(TIMESTAMP, server_default=text(
         'CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'))
+
+    __table_args__ = (
+        Index('ix_user_indicator_favs_user', 'user_id', 'is_favorite', 'indicator_id'),
+    )
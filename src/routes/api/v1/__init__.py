@@ -1,6 +1,8 @@
+from . import auth
 from . import encaje_legal
 from . import indicators
 from . import favorites
+from . import metrics
 from fastapi import APIRouter
 import sys
 import os
@@ -9,6 +11,8 @@ sys.path.append(os.path.abspath(
     os.path.join(os.path.dirname(__file__), "../../")))
 
 router = APIRouter()
+router.include_router(auth.router, tags=["Auth"])
 router.include_router(encaje_legal.router, tags=["Encaje Legal"])
 router.include_router(indicators.router, tags=["Indicadores"])
 router.include_router(favorites.router, tags=["Favorites"])
+router.include_router(metrics.router, tags=["Metrics"])
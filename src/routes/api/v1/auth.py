@@ -0,0 +1,56 @@
+import logging
+import time
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.config.db_config import get_session
+from src.middleware.auth_middleware import security
+from src.schema.auth_schemas import SessionTokenResponseModel
+from src.services.auth_service import AuthService
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__, level=logging.INFO)
+router = APIRouter()
+
+
+@router.post(
+    "/auth/session",
+    response_model=SessionTokenResponseModel,
+    description="Exchange a Firebase ID token for a short-lived session token accepted by every authenticated endpoint."
+)
+async def create_session(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session | AsyncSession = Depends(get_session)
+):
+    if not AuthService.session_tokens.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Session tokens are not configured"
+        )
+
+    token = credentials.credentials
+    # Solo se aceptan tokens de Firebase: un token de sesión no puede renovarse a sí mismo
+    if AuthService.session_tokens.is_session_token(token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="A Firebase ID token is required to create a session"
+        )
+
+    try:
+        _, user = await AuthService.authenticate_firebase(db, token)
+        session_token, expires_at = AuthService.session_tokens.issue(user)
+        logger.info(f"Issued session token for user {user.id}")
+        return SessionTokenResponseModel(
+            session_token=session_token,
+            expires_at=expires_at,
+            expires_in=max(expires_at - int(time.time()), 0),
+        )
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        logger.error(f"Error creating session token: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials"
+        )
@@ -1,10 +1,11 @@
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.services.encaje_legal_service import EncajeLegalService
 from src.schema.responses.response_encaje_legal_models import EncajeLegalGroupedResponseModel
 from src.schema.examples.response_encaje_legal_examples import encaje_legal_responses
-from src.config.db_config import get_db
+from src.config.db_config import get_session
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__, level=logging.INFO)
@@ -18,10 +19,10 @@ encaje_legal_service = EncajeLegalService()
     responses=encaje_legal_responses,
     description="Retrieve grouped records from 'encaje_legal' table. The values are expressed in thousands of Bolivianos."
 )
-async def get_encaje_legal_data(db: Session = Depends(get_db)):
+async def get_encaje_legal_data(db: Session | AsyncSession = Depends(get_session)):
     logger.info("Received request for grouped 'encaje_legal' records.")
     try:
-        response = encaje_legal_service.get_grouped_entries_by_date(db)
+        response = await encaje_legal_service.get_grouped_entries_by_date_async(db)
         
         if not response.get("fecha_corte"):
             logger.warning("No records found in 'encaje_legal' for the specified query.")
@@ -1,13 +1,21 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from src.config.db_config import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.config.config import get_settings
+from src.config.db_config import get_session
+from src.utils.cursor import InvalidCursor
 from src.utils.logger import setup_logger
 from src.middleware.auth_middleware import verify_token
+from src.schema.auth_schemas import UserIdentity
 from src.services.indicators_service import IndicatorsService
+from src.schema.responses.indicators_responses import EntityInclude, IndicatorSearchPageModel, IndicatorSearchResponseModel
 from pydantic import BaseModel
 
 logger = setup_logger(__name__, level=logging.INFO)
+
+_SETTINGS = get_settings()
+
 router = APIRouter()
 indicators_service = IndicatorsService()
 
@@ -18,15 +26,13 @@ class FavoriteToggle(BaseModel):
 
 
 @router.post("/favorites/toggle", description="Toggle an indicator as favorite for the current user")
-@verify_token
 async def toggle_favorite(
-    request: Request,
     favorite: FavoriteToggle,
-    db: Session = Depends(get_db)
+    db: Session | AsyncSession = Depends(get_session),
+    user: UserIdentity = Depends(verify_token)
 ):
     try:
-        user = request.state.db_user
-        result = await indicators_service.toggle_favorite_indicator(
+        result = await indicators_service.toggle_favorite_indicator_async(
             db,
             user.id,
             favorite.indicator_id,
@@ -41,16 +47,33 @@ async def toggle_favorite(
         )
 
 
-@router.get("/favorites", description="Get all favorite indicators for the current user")
-@verify_token
+@router.get(
+    "/favorites",
+    response_model=list[IndicatorSearchResponseModel] | IndicatorSearchPageModel,
+    response_model_exclude_unset=True,
+    description="Get all favorite indicators of the current user. "
+                "Pagination is opt-in: with `limit` (or `cursor`) the response is one page, `{items, next_cursor}`; "
+                "pass the returned `next_cursor` as `cursor` to fetch the next page. "
+                "`include` returns each indicator's entity list, only its `entity_count`, or neither."
+)
 async def get_favorites(
-    request: Request,
-    db: Session = Depends(get_db)
+    limit: int = Query(None, ge=1, description="Page size, capped by the server maximum; enables pagination"),
+    cursor: str = Query(None, description="`next_cursor` of the previous page; enables pagination"),
+    include: EntityInclude = EntityInclude.ENTITIES,
+    db: Session | AsyncSession = Depends(get_session),
+    user: UserIdentity = Depends(verify_token)
 ):
+    # Sin `limit` ni `cursor` se devuelve la lista completa, como antes de paginar
+    if limit is not None or cursor is not None:
+        limit = min(limit or _SETTINGS.max_page_size, _SETTINGS.max_page_size)
     try:
-        user = request.state.db_user
-        favorites = await indicators_service.get_user_favorites(db, user.id)
+        favorites = await indicators_service.get_user_favorites_async(db, user.id, limit, cursor, include)
         return favorites
+    except InvalidCursor as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error getting favorites: {e}")
         raise HTTPException(
@@ -1,44 +1,141 @@
 import logging
 import traceback
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
-from src.models.user_model import UserModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.services.indicators_service import IndicatorsService
+from src.services.suggest_index_service import suggest_index
 from src.schema.responses.indicators_responses import (
+    EntityBasicInfo,
+    EntityInclude,
+    ExportFormat,
+    IndicatorCorrelationModel,
     IndicatorDetailsCustomResponseModelList,
-    IndicatorSearchResponseModel,
+    IndicatorRankingModel,
+    IndicatorSearchPageModel,
     IndicatorDetailsCustomResponseModel,
+    RankingOrder,
+    SuggestionModel,
 )
 from src.models.indicators_model import LANGUAGE
-from src.config.db_config import get_db
+from src.config.config import get_settings
+from src.config.db_config import get_session
+from src.utils.cursor import InvalidCursor
 from src.utils.logger import setup_logger
 from src.middleware.auth_middleware import verify_token
+from src.schema.auth_schemas import UserIdentity
+from src.utils.columnar import MEDIA_TYPES, ColumnarFormat, serialize
+from src.utils.correlation import CorrelationMethod
+from src.utils.series import Aggregation, Frequency, SeriesOptions, Transform
+from pydantic import BaseModel, ConfigDict, Field
 
 logger = setup_logger(__name__, level=logging.INFO)
 
+_SETTINGS = get_settings()
+
 router = APIRouter()
 indicators_service = IndicatorsService()
 
 
+def series_options(
+    from_year: int | None = Query(None, alias="from", description="First year of the window"),
+    to_year: int | None = Query(None, alias="to", description="Last year of the window"),
+    frequency: Frequency | None = Query(None, description="Resample to a coarser frequency"),
+    aggregation: Aggregation = Query(Aggregation.LAST, description="How periods are combined when resampling"),
+    max_points: int | None = Query(None, ge=3, description="Downsample each series to at most this many points (LTTB)"),
+    transform: Transform | None = Query(None, description="Return the series transformed instead of its raw values"),
+    rolling_window: int = Query(3, ge=1, description="Periods averaged by `transform=rolling_mean`"),
+    base_year: int | None = Query(None, description="Year equal to 100 for `transform=index`; defaults to the first year with data"),
+) -> SeriesOptions:
+    return SeriesOptions(from_year, to_year, frequency, aggregation, max_points, transform, rolling_window, base_year)
+
+
+def columnar_format(
+    request: Request,
+    response_format: ColumnarFormat | None = Query(
+        None, alias="format", description="Columnar response instead of JSON; also negotiated through the Accept header"),
+) -> ColumnarFormat | None:
+    if response_format is not None:
+        return response_format
+    accept = request.headers.get("accept", "")
+    return next((fmt for fmt, media_type in MEDIA_TYPES.items() if media_type in accept), None)
+
+
+async def columnar_response(indicator_code: str, entity_codes: list[str], lang: LANGUAGE, db: Session | AsyncSession,
+                            options: SeriesOptions, response_format: ColumnarFormat) -> Response:
+    try:
+        table = await indicators_service.get_indicator_table_async(indicator_code, entity_codes, lang, db, options)
+        if table is None:
+            logger.warning(
+                f"No details found for indicator: {indicator_code} and entities: {entity_codes}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No details found for indicator code: {indicator_code} and entities: {entity_codes}"
+            )
+        content = await run_in_threadpool(serialize, table, response_format)
+        return Response(content=content, media_type=MEDIA_TYPES[response_format])
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while building {response_format} indicator details: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred. Please try again later."
+        )
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+class IndicatorBatchRequest(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    indicator_codes: list[str] = Field(..., min_length=1)
+    entity_codes: list[str] = Field(..., min_length=1)
+    lang: LANGUAGE = LANGUAGE.EN
+    from_year: int | None = Field(None, alias="from")
+    to_year: int | None = Field(None, alias="to")
+    frequency: Frequency | None = None
+    aggregation: Aggregation = Aggregation.LAST
+    max_points: int | None = Field(None, ge=3)
+    transform: Transform | None = None
+    rolling_window: int = Field(3, ge=1)
+    base_year: int | None = None
+
+    def series_options(self) -> SeriesOptions:
+        return SeriesOptions(self.from_year, self.to_year, self.frequency, self.aggregation, self.max_points,
+                             self.transform, self.rolling_window, self.base_year)
+
+
 @router.get(
     "/indicators/search",
-    response_model=list[IndicatorSearchResponseModel],
-    description="Search for indicators based on a keyword, with optional language and result limit."
+    response_model=IndicatorSearchPageModel,
+    response_model_exclude_unset=True,
+    description="Search for indicators based on a keyword, with optional language and page size. "
+                "Pass the returned `next_cursor` as `cursor` to fetch the next page. "
+                "`include` returns each indicator's entity list, only its `entity_count`, or neither."
 )
-@verify_token
 async def search_indicators(
-    request: Request,
     query: str = None,
-    limit: int = 10,
+    limit: int = Query(10, ge=1, description="Page size, capped by the server maximum"),
+    cursor: str = None,
+    include: EntityInclude = EntityInclude.ENTITIES,
     lang: LANGUAGE = LANGUAGE.EN,
-    db: Session = Depends(get_db)
+    db: Session | AsyncSession = Depends(get_session),
+    user: UserIdentity = Depends(verify_token)
 ):
+    limit = min(limit, _SETTINGS.max_page_size)
     logger.info(
-        f"Searching indicators with query: {query}, limit: {limit}, lang: {lang}")
+        f"Searching indicators with query: {query}, limit: {limit}, lang: {lang}, include: {include}")
     try:
-        user: UserModel = request.state.db_user
-        response = indicators_service.search_indicators(
-            query, limit, lang, db, user.id)
+        response = await indicators_service.search_indicators_async(
+            query, limit, lang, db, user.id, cursor, include)
 
         if response is None:
             logger.warning("No indicators found for the provided query.")
@@ -46,14 +143,19 @@ async def search_indicators(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No indicators found for the specified query."
             )
-        if not response:
+        if not response.items:
             logger.info(
-                "No indicators found for the provided query, returning empty list")
-            return []
+                "No indicators found for the provided query, returning empty page")
+            return response
 
-        logger.info(f"Found {len(response)} indicators for query: {query}")
+        logger.info(f"Found {len(response.items)} indicators for query: {query}")
         return response
 
+    except InvalidCursor as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except HTTPException as http_exc:
         if http_exc.status_code == status.HTTP_404_NOT_FOUND:
             raise http_exc
@@ -72,24 +174,143 @@ async def search_indicators(
         )
 
 
+@router.get(
+    "/indicators/suggest",
+    response_model=list[SuggestionModel],
+    description="Typeahead suggestions of indicator and entity names starting with `q`, ranked by data count. "
+                "Served from an in-memory prefix index, without database access."
+)
+async def suggest_indicators(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(8, ge=1, description="Number of suggestions, capped by the server maximum"),
+    lang: LANGUAGE = LANGUAGE.EN,
+    user: UserIdentity = Depends(verify_token)
+):
+    suggestions = suggest_index.suggest(lang, q, min(limit, _SETTINGS.suggest_max_limit))
+    if suggestions is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Suggestions are not available yet, please try again later."
+        )
+    return [SuggestionModel(**suggestion._asdict()) for suggestion in suggestions]
+
+
+@router.get(
+    "/indicators/correlation",
+    response_model=IndicatorCorrelationModel,
+    description="Correlation matrix (Pearson or Spearman) of several indicators for one entity. "
+                "Each pair is correlated over the periods where both indicators have a value; "
+                "`observations` holds that number of periods and pairs with too few of them are null. "
+                "`from`/`to` window the series by year."
+)
+async def get_indicator_correlation(
+    entity_code: str,
+    indicator_codes: list[str] = Query(..., description="Indicator codes to correlate (at least two)"),
+    method: CorrelationMethod = CorrelationMethod.PEARSON,
+    from_year: int | None = Query(None, alias="from", description="First year of the window"),
+    to_year: int | None = Query(None, alias="to", description="Last year of the window"),
+    lang: LANGUAGE = LANGUAGE.EN,
+    db: Session | AsyncSession = Depends(get_session),
+    user: UserIdentity = Depends(verify_token)
+):
+    if len(indicator_codes) > _SETTINGS.correlation_max_indicators:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A correlation accepts at most {_SETTINGS.correlation_max_indicators} indicators"
+        )
+
+    logger.info(
+        f"Computing {method} correlation for entity: {entity_code}, indicators: {indicator_codes}, lang: {lang}")
+    try:
+        response = await indicators_service.get_indicator_correlation_async(
+            entity_code, indicator_codes, method, from_year, to_year, lang, db)
+
+        if response is None:
+            logger.warning(f"No correlation for entity: {entity_code} and indicators: {indicator_codes}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Entity {entity_code} or at least two of the indicators {indicator_codes} were not found"
+            )
+
+        return response
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while computing indicator correlation: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred. Please try again later."
+        )
+
+
+@router.post(
+    "/indicators/batch",
+    response_model=list[IndicatorDetailsCustomResponseModelList],
+    description="Retrieve detailed data for several indicators across several entities in one request, "
+                "grouped by indicator and then by entity."
+)
+async def get_indicator_details_batch(
+    batch: IndicatorBatchRequest,
+    db: Session | AsyncSession = Depends(get_session),
+    user: UserIdentity = Depends(verify_token)
+):
+    if len(batch.indicator_codes) > _SETTINGS.batch_max_indicators or len(batch.entity_codes) > _SETTINGS.batch_max_entities:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A batch accepts at most {_SETTINGS.batch_max_indicators} indicators "
+                   f"and {_SETTINGS.batch_max_entities} entities"
+        )
+
+    logger.info(
+        f"Fetching batch details for {len(batch.indicator_codes)} indicators and {len(batch.entity_codes)} entities, lang: {batch.lang}")
+    try:
+        response = await indicators_service.get_indicator_details_batch_async(
+            batch.indicator_codes, batch.entity_codes, batch.lang, db, batch.series_options())
+
+        if not response:
+            logger.warning("No details found for the requested batch")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No details found for the requested indicators and entities"
+            )
+
+        return response
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while fetching batch indicator details: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred. Please try again later."
+        )
+
+
 @router.get(
     "/indicators/{indicator_code}",
     response_model=IndicatorDetailsCustomResponseModel,
-    description="Retrieve detailed data for a specific indicator and entity."
+    description="Retrieve detailed data for a specific indicator and entity. "
+                "`from`/`to` window the series by year, `frequency` resamples it and `max_points` downsamples it. "
+                "`transform` returns YoY change, period change, CAGR, a rolling mean or a base-year index instead of the raw values. "
+                "`format=arrow|parquet` (or the matching Accept header) returns an (entity_code, period, value) table."
 )
-@verify_token
 async def get_indicator_details(
-    request: Request,
     indicator_code: str,
     entity_code: str,
     lang: LANGUAGE = LANGUAGE.EN,
-    db: Session = Depends(get_db)
+    options: SeriesOptions = Depends(series_options),
+    response_format: ColumnarFormat | None = Depends(columnar_format),
+    db: Session | AsyncSession = Depends(get_session),
+    user: UserIdentity = Depends(verify_token)
 ):
     logger.info(
         f"Fetching details for indicator: {indicator_code}, entity: {entity_code}, lang: {lang}")
+    if response_format is not None:
+        return await columnar_response(indicator_code, [entity_code], lang, db, options, response_format)
     try:
-        response = indicators_service.get_indicator_details(
-            indicator_code, entity_code, lang, db)
+        response = await indicators_service.get_indicator_details_async(
+            indicator_code, entity_code, lang, db, options)
 
         if not response:
             logger.warning(
@@ -114,24 +335,30 @@ async def get_indicator_details(
 @router.get(
     "/indicators/{indicator_code}/entities",
     response_model=IndicatorDetailsCustomResponseModelList,
-    description="Retrieve detailed data for a specific indicator across multiple entities."
+    description="Retrieve detailed data for a specific indicator across multiple entities. "
+                "`from`/`to` window the series by year, `frequency` resamples it and `max_points` downsamples it. "
+                "`transform` returns YoY change, period change, CAGR, a rolling mean or a base-year index instead of the raw values. "
+                "`format=arrow|parquet` (or the matching Accept header) returns an (entity_code, period, value) table."
 )
-@verify_token
 async def get_indicator_details_by_entities(
-    request: Request,
     indicator_code: str,
     entity_codes: list[str] = Query(...,
                                     description="List of entity codes to fetch details for"),
     lang: LANGUAGE = LANGUAGE.EN,
-    db: Session = Depends(get_db)
+    options: SeriesOptions = Depends(series_options),
+    response_format: ColumnarFormat | None = Depends(columnar_format),
+    db: Session | AsyncSession = Depends(get_session),
+    user: UserIdentity = Depends(verify_token)
 ):
     logger.info(
         f"Fetching details for indicator: {indicator_code}, entities: {entity_codes}, lang: {lang}")
+    if response_format is not None:
+        return await columnar_response(indicator_code, entity_codes, lang, db, options, response_format)
     try:
         logger.info(f"Entity codes: {entity_codes}")
         logger.info(f"Indicator code: {indicator_code}")
-        response = indicators_service.get_indicator_details_by_entities(
-            indicator_code, entity_codes, lang, db)
+        response = await indicators_service.get_indicator_details_by_entities_async(
+            indicator_code, entity_codes, lang, db, options)
 
         if not response:
             logger.warning(
@@ -151,3 +378,119 @@ async def get_indicator_details_by_entities(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred. Please try again later."
         )
+
+
+@router.get(
+    "/indicators/{indicator_code}/available-entities",
+    response_model=list[EntityBasicInfo],
+    description="List the entities that have data for an indicator, for search results fetched without `entities`."
+)
+async def get_indicator_entities(
+    indicator_code: str,
+    lang: LANGUAGE = LANGUAGE.EN,
+    db: Session | AsyncSession = Depends(get_session),
+    user: UserIdentity = Depends(verify_token)
+):
+    logger.info(
+        f"Fetching available entities for indicator: {indicator_code}, lang: {lang}")
+    try:
+        response = await indicators_service.get_indicator_entities_async(
+            indicator_code, lang, db)
+
+        if response is None:
+            logger.warning(f"Indicator not found: {indicator_code}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Indicator not found: {indicator_code}"
+            )
+
+        return response
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while fetching indicator entities: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred. Please try again later."
+        )
+
+
+@router.get(
+    "/indicators/{indicator_code}/ranking",
+    response_model=IndicatorRankingModel,
+    description="Rank the entities of an indicator by their value in one period (its label, e.g. `2022`). "
+                "Returns the `top` entities in `order` with their rank and percentile, and the position of `entity_code` when given."
+)
+async def get_indicator_ranking(
+    indicator_code: str,
+    period: str = Query(..., description="Period label"),
+    top: int = Query(10, ge=1, description="Number of entities, capped by the server maximum"),
+    order: RankingOrder = RankingOrder.DESC,
+    entity_code: str | None = Query(None, description="Also return this entity's rank and percentile"),
+    lang: LANGUAGE = LANGUAGE.EN,
+    db: Session | AsyncSession = Depends(get_session),
+    user: UserIdentity = Depends(verify_token)
+):
+    top = min(top, _SETTINGS.ranking_max_top)
+    logger.info(
+        f"Fetching ranking for indicator: {indicator_code}, period: {period}, top: {top}, order: {order}, lang: {lang}")
+    try:
+        response = await indicators_service.get_indicator_ranking_async(
+            indicator_code, period, top, order, entity_code, lang, db)
+
+        if response is None:
+            logger.warning(f"No ranking found for indicator: {indicator_code} and period: {period}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No data found for indicator code: {indicator_code} and period: {period}"
+            )
+
+        return response
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while fetching indicator ranking: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred. Please try again later."
+        )
+
+
+@router.get(
+    "/indicators/{indicator_code}/export",
+    response_class=StreamingResponse,
+    description="Stream every value of an indicator, optionally for some entities, as NDJSON or CSV."
+)
+async def export_indicator(
+    indicator_code: str,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    entity_codes: list[str] | None = Query(None, description="Only export these entities"),
+    lang: LANGUAGE = LANGUAGE.EN,
+    db: Session | AsyncSession = Depends(get_session),
+    user: UserIdentity = Depends(verify_token)
+):
+    logger.info(
+        f"Exporting indicator: {indicator_code}, entities: {entity_codes}, format: {export_format}, lang: {lang}")
+    try:
+        target = await indicators_service.get_export_target_async(indicator_code, entity_codes, lang, db)
+    except Exception as e:
+        logger.error(f"Unexpected error while preparing indicator export: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred. Please try again later."
+        )
+
+    if target is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No data found for indicator code: {indicator_code} and entities: {entity_codes}"
+        )
+
+    indicator, entity_ids = target
+    return StreamingResponse(
+        indicators_service.export_indicator(indicator, entity_ids, lang, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{indicator.indicator_code}.{export_format}"'},
+    )
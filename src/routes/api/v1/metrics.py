@@ -0,0 +1,36 @@
+import logging
+from fastapi import APIRouter, Depends
+from src.config.db_config import pool_metrics, replica_sets
+from src.middleware.auth_middleware import require_admin
+from src.services.auth_service import AuthService
+from src.services.indicators_service import IndicatorsService
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__, level=logging.INFO)
+# Exponen el estado interno del servicio: solo para administradores
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/metrics/db-pool", description="Connection pool gauges, counters and checkout wait-time histogram per engine")
+async def get_db_pool_metrics():
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+
+
+@router.get("/metrics/db-replicas", description="Health state and last check timestamps of the read replicas")
+async def get_db_replica_metrics():
+    return [status for replicas in replica_sets() for status in replicas.status()]
+
+
+@router.get("/metrics/caches", description="Size and hit/miss/eviction counters of the in-process caches")
+async def get_cache_metrics():
+    return {
+        "auth_tokens": AuthService.token_cache.stats(),
+        "users": {
+            **AuthService.user_cache.stats(),
+            "pending_profile_updates": AuthService.profile_writer.pending,
+        },
+        "indicator_search": IndicatorsService.search_cache.stats(),
+        "indicator_series": IndicatorsService.series_cache.stats(),
+        "indicator_rankings": IndicatorsService.ranking_cache.stats(),
+        "indicator_correlations": IndicatorsService.correlation_cache.stats(),
+    }
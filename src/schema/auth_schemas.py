@@ -9,3 +9,14 @@ class User(BaseModel):
     picture: Optional[str] = None
     country_code: Optional[str] = None
     email_verified: Optional[bool] = False
+
+
+class UserIdentity(User):
+    id: int
+
+
+class SessionTokenResponseModel(BaseModel):
+    session_token: str
+    token_type: str = "bearer"
+    expires_at: int
+    expires_in: int
@@ -1,5 +1,24 @@
+from enum import StrEnum
 from pydantic import BaseModel
 from typing import List, Optional
+from src.utils.correlation import CorrelationMethod
+
+
+class EntityInclude(StrEnum):
+    # Cómo se devuelven las entidades de cada indicador en búsquedas y favoritos
+    ENTITIES = "entities"
+    ENTITY_COUNT = "entity_count"
+    NONE = "none"
+
+
+class ExportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class RankingOrder(StrEnum):
+    ASC = "asc"
+    DESC = "desc"
 
 
 class EntityBasicInfo(BaseModel):
@@ -16,7 +35,22 @@ class IndicatorSearchResponseModel(BaseModel):
     data_count: Optional[int]
     source: Optional[str]
     is_favorite: Optional[bool]
-    entities: List[EntityBasicInfo]
+    # Solo uno de los dos, según `include`; las rutas omiten el que no se pidió
+    entities: Optional[List[EntityBasicInfo]] = None
+    entity_count: Optional[int] = None
+
+
+class IndicatorSearchPageModel(BaseModel):
+    items: List[IndicatorSearchResponseModel]
+    next_cursor: Optional[str] = None
+
+
+class SuggestionModel(BaseModel):
+    kind: str
+    id: int
+    code: str
+    name: str
+    data_count: int
 
 
 class IndicatorDetailModel(BaseModel):
@@ -59,3 +93,32 @@ class IndicatorDetailsCustomResponseModelList(BaseModel):
     indicator_desc: str
     source: str
     entities: List[IndicatorEntityModel]
+
+
+class RankingEntryModel(BaseModel):
+    rank: int
+    entity_code: Optional[str]
+    entity_name: Optional[str]
+    value: float
+    percentile: float
+
+
+class IndicatorRankingModel(BaseModel):
+    indicator_code: str
+    indicator_name: Optional[str]
+    period: str
+    order: RankingOrder
+    total: int
+    entries: List[RankingEntryModel]
+    # Posición de `entity_code`, si se pidió y tiene valor en el período
+    entity: Optional[RankingEntryModel] = None
+
+
+class IndicatorCorrelationModel(BaseModel):
+    entity_code: str
+    entity_name: Optional[str]
+    method: CorrelationMethod
+    indicator_codes: List[str]
+    # Filas y columnas en el orden de `indicator_codes`; null si no hay suficientes períodos comunes
+    matrix: List[List[Optional[float]]]
+    observations: List[List[int]]
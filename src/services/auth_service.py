@@ -1,20 +1,188 @@
+import asyncio
+import hashlib
 import logging
+import re
+import time
+from typing import Protocol
+import requests
+from google.auth import jwt as google_jwt
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from firebase_admin import auth
+from src.config.config import get_settings
+from src.config.db_config import SessionLocal, run_db, use_primary
 from src.models.user_model import UserModel
-from src.schema.auth_schemas import User
+from src.schema.auth_schemas import User, UserIdentity
+from src.services.session_token_service import SessionTokenService
+from src.services.user_sync_service import UserProfileWriter
+from src.utils.cache import TTLCache
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__, level=logging.INFO)
 
+_SETTINGS = get_settings()
+
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+class CertSource(Protocol):
+    async def fetch(self) -> tuple[dict[str, str], float]:
+        """Return the `kid -> PEM certificate` mapping and its max-age in seconds."""
+        ...
+
+
+class GoogleCertSource:
+    def __init__(self, url: str, timeout: float = 10.0):
+        self.url = url
+        self.timeout = timeout
+
+    async def fetch(self) -> tuple[dict[str, str], float]:
+        response = await run_in_threadpool(requests.get, self.url, timeout=self.timeout)
+        response.raise_for_status()
+        match = _MAX_AGE_PATTERN.search(response.headers.get("Cache-Control", ""))
+        max_age = float(match.group(1)) if match else 0.0
+        return response.json(), max_age
+
+
+class StaticCertSource:
+    """Fixed certificate set, for tests and benchmarks signed with a local key pair."""
+
+    def __init__(self, certs: dict[str, str], max_age: float = 3600.0):
+        self.certs = certs
+        self.max_age = max_age
+
+    async def fetch(self) -> tuple[dict[str, str], float]:
+        return dict(self.certs), self.max_age
+
+
+class FirebaseTokenVerifier:
+    """
+    Verifies Firebase ID tokens against an in-memory certificate set.
+
+    The certificates are refreshed by a background task according to their
+    Cache-Control max-age, so `verify` never performs network I/O. It still
+    checks an RSA signature, so async callers run it in the threadpool.
+    """
+
+    def __init__(self, project_id: str, cert_source: CertSource, min_refresh_seconds: float = 60.0):
+        self.project_id = project_id
+        self.issuer = f"https://securetoken.google.com/{project_id}"
+        self.cert_source = cert_source
+        self.min_refresh_seconds = min_refresh_seconds
+        self._certs: dict[str, str] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._certs)
+
+    async def refresh(self) -> float:
+        certs, max_age = await self.cert_source.fetch()
+        if not certs:
+            raise ValueError("Empty certificate set")
+        self._certs = certs
+        logger.info(f"Loaded {len(certs)} Firebase signing certificates (max-age {max_age:.0f}s)")
+        return max_age
+
+    async def _refresh_loop(self, delay: float):
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                max_age = await self.refresh()
+                delay = max(max_age * 0.9, self.min_refresh_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Se conservan los certificados anteriores hasta el siguiente intento
+                logger.error(f"Error refreshing Firebase signing certificates: {e}")
+                delay = self.min_refresh_seconds
+
+    async def start(self):
+        try:
+            max_age = await self.refresh()
+            delay = max(max_age * 0.9, self.min_refresh_seconds)
+        except Exception as e:
+            logger.error(f"Error prefetching Firebase signing certificates: {e}")
+            delay = self.min_refresh_seconds
+        self._task = asyncio.create_task(self._refresh_loop(delay))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def verify(self, token: str) -> dict:
+        if not self._certs:
+            raise ValueError("Firebase signing certificates not loaded")
+
+        # Verifica firma (por `kid`), `exp`/`iat` y audiencia
+        claims = google_jwt.decode(token, certs=self._certs, audience=self.project_id)
+
+        if claims.get("iss") != self.issuer:
+            raise ValueError(f"Invalid token issuer: {claims.get('iss')}")
+        subject = claims.get("sub")
+        if not isinstance(subject, str) or not subject or len(subject) > 128:
+            raise ValueError("Invalid token subject")
+
+        claims["uid"] = subject
+        return claims
+
 
 class AuthService:
+    # Claims decodificados, indexados por el hash del token y válidos hasta su `exp`
+    token_cache = TTLCache(maxsize=_SETTINGS.auth_token_cache_size)
+    token_verifier = FirebaseTokenVerifier(
+        _SETTINGS.firebase_project_id,
+        GoogleCertSource(_SETTINGS.firebase_id_token_cert_url),
+        min_refresh_seconds=_SETTINGS.firebase_cert_min_refresh_seconds,
+    )
+    # Identidad de usuarios por email, precargada la primera vez que se ve cada usuario
+    user_cache = TTLCache(maxsize=_SETTINGS.user_cache_size, ttl=_SETTINGS.user_cache_ttl_seconds)
+    profile_writer = UserProfileWriter(
+        SessionLocal,
+        flush_interval=_SETTINGS.user_sync_interval_seconds,
+        batch_size=_SETTINGS.user_sync_batch_size,
+    )
+    session_tokens = SessionTokenService(
+        _SETTINGS.session_token_secret, ttl_seconds=_SETTINGS.session_token_ttl_seconds)
+
+    @staticmethod
+    def _token_cache_enabled() -> bool:
+        return _SETTINGS.auth_token_cache_enabled and not _SETTINGS.auth_check_revoked
+
+    @staticmethod
+    def _offline_verify_enabled() -> bool:
+        # La revocación requiere consultar Firebase, por lo que no puede verificarse localmente
+        return (
+            _SETTINGS.firebase_offline_verify
+            and not _SETTINGS.auth_check_revoked
+            and AuthService.token_verifier.ready
+        )
+
     @staticmethod
     async def validate_token(token: str):
+        use_cache = AuthService._token_cache_enabled()
+        token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+        if use_cache:
+            cached_token = AuthService.token_cache.get(token_hash)
+            if cached_token is not None:
+                return cached_token
+
         try:
-            decoded_token = auth.verify_id_token(token)
-            return decoded_token
+            if AuthService._offline_verify_enabled():
+                # La verificación RSA es trabajo de CPU: también fuera del event loop
+                decoded_token = await run_in_threadpool(AuthService.token_verifier.verify, token)
+            else:
+                # firebase_admin puede descargar certificados: se ejecuta fuera del event loop
+                decoded_token = await run_in_threadpool(
+                    auth.verify_id_token, token, check_revoked=_SETTINGS.auth_check_revoked)
         except Exception as e:
             logger.error(f"Error validating token: {e}")
             raise HTTPException(
@@ -22,50 +190,83 @@ class AuthService:
                 detail="Invalid token"
             )
 
+        if use_cache:
+            AuthService.token_cache.set(
+                token_hash, decoded_token, ttl=decoded_token.get("exp", 0) - time.time())
+
+        return decoded_token
+
     @staticmethod
-    async def get_or_create_user(db: Session, user_info: User):
+    async def authenticate_firebase(db: Session | AsyncSession, token: str) -> tuple[dict, UserIdentity]:
+        decoded_token = await AuthService.validate_token(token)
+
+        # Create user if not exists using Firebase user info
+        user_info = User(
+            email=decoded_token.get('email'),
+            name=decoded_token.get('name'),
+            picture=decoded_token.get('picture'),
+            email_verified=decoded_token.get('email_verified', False),
+            phone=decoded_token.get('phone_number', None),
+        )
+        user = await AuthService.get_or_create_user(db, user_info)
+        return decoded_token, user
+
+    @staticmethod
+    def _load_or_create_user(db: Session, user_info: User) -> UserIdentity:
+        # En el primario: evita duplicar usuarios que aún no llegaron a la réplica
+        use_primary(db)
+
+        # Check if user exists
+        user = db.query(UserModel).filter(
+            UserModel.email == user_info.email).first()
+
+        if not user:
+            # Create new user
+            user = UserModel(
+                email=user_info.email,
+                name=user_info.name,
+                phone=user_info.phone,
+                picture=user_info.picture,
+                email_verified=True,
+                country_code=user_info.country_code
+            )
+            logger.info(f"Creating new user with email {user_info.email}")
+            db.add(user)
+            db.commit()
+            db.refresh(user)
+
+        return UserIdentity.model_validate(user, from_attributes=True)
+
+    @staticmethod
+    async def get_or_create_user(db: Session | AsyncSession, user_info: User) -> UserIdentity:
         try:
-            # Check if user exists
-            user = db.query(UserModel).filter(
-                UserModel.email == user_info.email).first()
-
-            if user:
-                # Update fields only if they are different
-                updated_fields = {
-                    "name": user_info.name,
-                    "phone": user_info.phone,
-                    "picture": user_info.picture,
-                    "email_verified": user_info.email_verified,
-                    "country_code": user_info.country_code
-                }
-
-                changes_made = False
-                for field, value in updated_fields.items():
-                    if value and getattr(user, field) != value:
-                        setattr(user, field, value)
-                        changes_made = True
-
-                # Only commit if changes were made
-                if changes_made:
-                    logger.info(f"Updating user information for {user.email}")
-                    db.commit()
-                    db.refresh(user)
-            else:
-                # Create new user
-                user = UserModel(
-                    email=user_info.email,
-                    name=user_info.name,
-                    phone=user_info.phone,
-                    picture=user_info.picture,
-                    email_verified=True,
-                    country_code=user_info.country_code
-                )
-                logger.info(f"Creating new user with email {user_info.email}")
-                db.add(user)
-                db.commit()
-                db.refresh(user)
-
-            return user
+            identity = AuthService.user_cache.get(user_info.email)
+
+            if identity is None:
+                identity = await run_db(db, AuthService._load_or_create_user, user_info)
+
+            # Update fields only if they are different
+            updated_fields = {
+                "name": user_info.name,
+                "phone": user_info.phone,
+                "picture": user_info.picture,
+                "email_verified": user_info.email_verified,
+                "country_code": user_info.country_code
+            }
+            changes = {
+                field: value
+                for field, value in updated_fields.items()
+                if value and getattr(identity, field) != value
+            }
+
+            # Los cambios de perfil se escriben en segundo plano, fuera de la request
+            if changes:
+                logger.info(f"Queueing user information update for {identity.email}")
+                identity = identity.model_copy(update=changes)
+                AuthService.profile_writer.enqueue(identity.id, changes)
+
+            AuthService.user_cache.set(user_info.email, identity)
+            return identity
         except Exception as e:
             logger.error(f"Error getting or creating social user: {e}")
             raise HTTPException(
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Callable
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__, level=logging.INFO)
+
+
+class DataVersionWatcher:
+    """
+    Detects changes to `data_values` through the per-indicator counters of
+    `indicator_data_versions`, which triggers bump on every insert, update
+    and delete.
+
+    Each check reads one small row per indicator and notifies the listeners
+    with the ids of the indicators whose version changed, so every worker
+    drops its cached series within one interval of a data load. When the
+    versions cannot be read, listeners get None and drop everything.
+    """
+
+    def __init__(self):
+        self._versions: dict[int, int] | None = None
+        self._listeners: list[Callable[[list[int] | None], None]] = []
+        self._task: asyncio.Task | None = None
+
+    def add_listener(self, listener: Callable[[list[int] | None], None]):
+        """Registers a callback run with the changed indicator ids (None for all of them)."""
+        self._listeners.append(listener)
+
+    def _notify(self, indicator_ids: list[int] | None):
+        for listener in self._listeners:
+            listener(indicator_ids)
+
+    def check(self, db: Session) -> list[int] | None:
+        """Compares the versions with the previous check and notifies the listeners of the changes."""
+        rows = db.execute(text("SELECT indicator_id, version FROM indicator_data_versions")).fetchall()
+        versions = {row.indicator_id: row.version for row in rows}
+        previous, self._versions = self._versions, versions
+        # La primera lectura es la referencia: los caches aún están vacíos
+        if previous is None:
+            return []
+
+        changed = [indicator_id for indicator_id, version in versions.items() if previous.get(indicator_id) != version]
+        changed += [indicator_id for indicator_id in previous if indicator_id not in versions]
+        if changed:
+            logger.info(f"Data changed for {len(changed)} indicators, invalidating cached series")
+            self._notify(changed)
+        return changed
+
+    def _check_with(self, session_factory: Callable[[], Session]) -> list[int] | None:
+        with session_factory() as db:
+            return self.check(db)
+
+    async def _run(self, session_factory: Callable[[], Session], interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_in_threadpool(self._check_with, session_factory)
+            except Exception as e:
+                # Sin versiones no se sabe qué cambió: se descarta todo para no servir datos viejos
+                logger.error(f"Error checking data versions, invalidating all cached series: {e}")
+                self._versions = None
+                self._notify(None)
+
+    async def start(self, session_factory: Callable[[], Session], interval: float):
+        try:
+            await run_in_threadpool(self._check_with, session_factory)
+        except Exception as e:
+            logger.error(f"Error loading data versions: {e}")
+        self._task = asyncio.create_task(self._run(session_factory, interval))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+data_version_watcher = DataVersionWatcher()
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, NamedTuple
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from src.models.indicators_model import LANGUAGE
+from src.utils.logger import setup_logger
+from src.utils.series import PeriodTable
+
+logger = setup_logger(__name__, level=logging.INFO)
+
+
+class IndicatorInfo(NamedTuple):
+    indicator_id: int
+    indicator_code: str
+    indicator_name: str
+    description: str | None
+    source: str | None
+
+
+class EntityInfo(NamedTuple):
+    entity_id: int
+    entity_code: str
+    entity_name: str
+    entity_type: str | None
+
+
+@dataclass
+class _Dimensions:
+    indicator_ids: dict[str, int] = field(default_factory=dict)
+    indicators: dict[tuple[int, str], IndicatorInfo] = field(default_factory=dict)
+    entity_ids: dict[str, int] = field(default_factory=dict)
+    entities: dict[tuple[int, str], EntityInfo] = field(default_factory=dict)
+    periods: PeriodTable = field(default_factory=PeriodTable)
+    version: int | None = None
+
+
+class DimensionRegistry:
+    """
+    In-process copy of the small dimension tables: indicators, entities (with
+    their names per language) and time periods.
+
+    Translates codes to ids and ids to labels in Python, so hot queries only
+    touch `data_values` by integer keys. Loaded at startup and refreshed in the
+    background; a refresh builds a new snapshot and swaps it in. Lookups return
+    the codes they could not resolve, so callers can fall back to the database
+    for rows added since the last refresh.
+    """
+
+    def __init__(self):
+        self._dimensions = _Dimensions()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._dimensions.version is not None
+
+    @property
+    def periods(self) -> PeriodTable:
+        return self._dimensions.periods
+
+    def indicators(self, indicator_codes: list[str], lang: LANGUAGE) -> tuple[list[IndicatorInfo], list[str]]:
+        dimensions = self._dimensions
+        found, missing = [], []
+        for code in indicator_codes:
+            info = dimensions.indicators.get((dimensions.indicator_ids.get(code), str(lang)))
+            if info is None:
+                missing.append(code)
+            else:
+                found.append(info)
+        return found, missing
+
+    def entities(self, entity_codes: list[str], lang: LANGUAGE) -> tuple[list[EntityInfo], list[str]]:
+        dimensions = self._dimensions
+        found, missing = [], []
+        for code in entity_codes:
+            info = dimensions.entities.get((dimensions.entity_ids.get(code), str(lang)))
+            if info is None:
+                missing.append(code)
+            else:
+                found.append(info)
+        return found, missing
+
+    def entity(self, entity_id: int, lang: LANGUAGE) -> EntityInfo | None:
+        return self._dimensions.entities.get((entity_id, str(lang)))
+
+    def indicator_id(self, indicator_code: str) -> int | None:
+        return self._dimensions.indicator_ids.get(indicator_code)
+
+    def _load_periods(self, db: Session) -> PeriodTable:
+        result = db.execute(text("""
+            SELECT period_id, period_label, start_year, start_month, end_year
+            FROM time_periods
+        """)).fetchall()
+        return PeriodTable([tuple(row) for row in result])
+
+    def reload_periods(self, db: Session) -> PeriodTable:
+        """Reloads only the periods, when a series references one the registry does not know yet."""
+        self._dimensions.periods = self._load_periods(db)
+        return self._dimensions.periods
+
+    def refresh(self, db: Session) -> bool:
+        indicators = db.execute(text("""
+            SELECT i.indicator_id, i.indicator_code, i.source, il.lang, il.indicator_name, il.description
+            FROM indicators i
+            LEFT JOIN indicators_lang il ON il.indicator_id = i.indicator_id
+        """)).fetchall()
+        entities = db.execute(text("""
+            SELECT e.entity_id, e.entity_code, el.lang, el.entity_name, el.entity_type
+            FROM entities e
+            LEFT JOIN entities_lang el ON el.entity_id = e.entity_id
+        """)).fetchall()
+        periods = self._load_periods(db)
+
+        version = hash((
+            tuple(map(tuple, indicators)),
+            tuple(map(tuple, entities)),
+            tuple(periods.ids.tolist()),
+            tuple(periods.labels.tolist()),
+        ))
+        if version == self._dimensions.version:
+            return False
+
+        dimensions = _Dimensions(periods=periods, version=version)
+        for row in indicators:
+            dimensions.indicator_ids[row.indicator_code] = row.indicator_id
+            if row.lang is not None:
+                dimensions.indicators[(row.indicator_id, row.lang)] = IndicatorInfo(
+                    row.indicator_id, row.indicator_code, row.indicator_name, row.description, row.source)
+        for row in entities:
+            dimensions.entity_ids[row.entity_code] = row.entity_id
+            if row.lang is not None:
+                dimensions.entities[(row.entity_id, row.lang)] = EntityInfo(
+                    row.entity_id, row.entity_code, row.entity_name, row.entity_type)
+
+        self._dimensions = dimensions
+        logger.info(
+            f"Dimension registry loaded: {len(dimensions.indicator_ids)} indicators, "
+            f"{len(dimensions.entity_ids)} entities, {len(periods.ids)} periods")
+        return True
+
+    def _refresh_with(self, session_factory: Callable[[], Session]) -> bool:
+        with session_factory() as db:
+            return self.refresh(db)
+
+    async def _run(self, session_factory: Callable[[], Session], interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_in_threadpool(self._refresh_with, session_factory)
+            except Exception as e:
+                logger.error(f"Error refreshing dimension registry: {e}")
+
+    async def start(self, session_factory: Callable[[], Session], interval: float):
+        # La primera carga se hace antes de aceptar requests
+        try:
+            await run_in_threadpool(self._refresh_with, session_factory)
+        except Exception as e:
+            logger.error(f"Error loading dimension registry, falling back to database lookups: {e}")
+        self._task = asyncio.create_task(self._run(session_factory, interval))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+dimension_registry = DimensionRegistry()
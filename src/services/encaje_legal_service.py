@@ -4,6 +4,8 @@ from sqlalchemy import desc, func
 from sqlalchemy.sql import distinct
 from src.models.encaje_legal_model import EncajeLegalModel
 from src.models.category_model import CategoryModel
+from src.config.db_config import run_db
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__, level=logging.INFO)
@@ -124,3 +126,6 @@ class EncajeLegalService:
         except Exception as e:
             logger.error(f"Error grouping entries: {e}")
             raise e
+
+    async def get_grouped_entries_by_date_async(self, db: Session | AsyncSession):
+        return await run_db(db, self.get_grouped_entries_by_date)
@@ -1,215 +1,525 @@
 import logging
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import select, text
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.sql.elements import TextClause
 from src.models.indicators_model import (
     LANGUAGE,
     IndicatorLang,
     Indicator,
-    DataValue,
     Entity,
-    EntityLang,
-    TimePeriod
+    EntityLang
 )
 from src.models.user_model import UserIndicatorFavorites
 from src.schema.responses.indicators_responses import (
+    EntityBasicInfo,
+    EntityInclude,
+    ExportFormat,
+    IndicatorCorrelationModel,
     IndicatorDetailsCustomResponseModelList,
+    IndicatorRankingModel,
+    IndicatorSearchPageModel,
     IndicatorSearchResponseModel,
     IndicatorDetailsCustomResponseModel,
+    RankingEntryModel,
+    RankingOrder,
 )
+from src.config.db_config import SessionLocal, recent_writers, run_db, server_side_cursors, stream_options, use_primary
+from src.services.data_version_service import data_version_watcher
+from src.services.dimension_registry_service import dimension_registry
+from src.services.search_index_service import indicator_search_index
+from src.config.config import get_settings
+from src.utils.cache import TTLCache
+from src.utils.cursor import cursor_kind, decode_cursor, encode_cursor
 from src.utils.logger import setup_logger
-from sqlalchemy import func
+from src.utils.series import PeriodTable, SeriesOptions, shape_many
+from src.utils.series_cache import Ranking, Series, SeriesCache
+from src.utils.columnar import series_table
+from src.utils.correlation import CorrelationMethod, ProcessPool, align_series, correlation_matrix
+import pyarrow as pa
+from sqlalchemy.ext.asyncio import AsyncSession
+import csv
+import io
+import threading
 import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+import numpy as np
 
 logger = setup_logger(__name__, level=logging.INFO)
 
+_SETTINGS = get_settings()
+
+
+# Claves de orden de los cursores de paginación
+CURSOR_RELEVANCE = "bm25"
+CURSOR_MATCH = "match"
+CURSOR_DATA_COUNT = "data_count"
+
+
+# Entidades con datos de cada indicador en `:lang`, leídas de `indicator_entities`
+_ENTITY_INFO_SQL = """
+    SELECT
+        ie.indicator_id,
+        ie.entity_id,
+        e.entity_code,
+        el.entity_name
+    FROM indicator_entities ie
+    JOIN base b ON ie.indicator_id = b.indicator_id
+    JOIN entities e ON ie.entity_id = e.entity_id
+    JOIN entities_lang el ON e.entity_id = el.entity_id
+    WHERE el.lang = :lang
+    AND el.entity_name IS NOT NULL 
+    AND el.entity_name != ''
+"""
+
+
+def _indicators_with_entities(base_sql: str, order_by: str = "", include: EntityInclude = EntityInclude.ENTITIES) -> TextClause:
+    """
+    Wraps a query over indicators (aliased `base`) with the entities that have data
+    for each indicator in `:lang`: the JSON list (`entities_json`), only their number
+    (`entity_count`), or nothing at all, which skips the entity subquery entirely.
+    """
+    if include == EntityInclude.NONE:
+        return text(f"""
+            WITH base AS ({base_sql})
+            SELECT b.*
+            FROM base b
+            {order_by}
+        """)
+
+    if include == EntityInclude.ENTITY_COUNT:
+        return text(f"""
+            WITH base AS ({base_sql}),
+            entity_info AS ({_ENTITY_INFO_SQL})
+            SELECT 
+                b.*,
+                (
+                    SELECT COUNT(*)
+                    FROM entity_info
+                    WHERE indicator_id = b.indicator_id
+                ) as entity_count
+            FROM base b
+            {order_by}
+        """)
+
+    return text(f"""
+        WITH base AS ({base_sql}),
+        entity_info AS ({_ENTITY_INFO_SQL})
+        SELECT 
+            b.*,
+            (
+                SELECT JSON_ARRAYAGG(
+                    JSON_OBJECT(
+                        'id', entity_id,
+                        'code', entity_code,
+                        'name', entity_name
+                    )
+                )
+                FROM (
+                    SELECT *
+                    FROM entity_info
+                    WHERE indicator_id = b.indicator_id
+                    ORDER BY entity_name
+                ) as entities
+            ) as entities_json
+        FROM base b
+        {order_by}
+    """)
+
+
+def _to_search_response(row, is_favorite: bool = False, include: EntityInclude = EntityInclude.ENTITIES) -> IndicatorSearchResponseModel:
+    fields = {
+        "id": row.indicator_id,
+        "code": row.indicator_code,
+        "name": row.indicator_name,
+        "description": row.description,
+        "data_count": row.data_count,
+        "source": row.source,
+        "is_favorite": is_favorite,
+    }
+    # Solo se asigna el campo pedido, para que `response_model_exclude_unset` omita el otro
+    if include == EntityInclude.ENTITIES:
+        fields["entities"] = json.loads(
+            row.entities_json) if row.entities_json else []
+    elif include == EntityInclude.ENTITY_COUNT:
+        fields["entity_count"] = row.entity_count
+    return IndicatorSearchResponseModel(**fields)
+
+
+def _search_page(rows: list[tuple], limit: int, cursor_kind: str, favorites: bool = False, include: EntityInclude = EntityInclude.ENTITIES) -> IndicatorSearchPageModel:
+    """Builds a page from `(sort_value, row)` pairs fetched with `limit + 1`."""
+    page_rows = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit and page_rows:
+        sort_value, last_row = page_rows[-1]
+        next_cursor = encode_cursor(cursor_kind, sort_value, last_row.indicator_id)
+
+    return IndicatorSearchPageModel(
+        items=[
+            _to_search_response(row, is_favorite=row.is_favorite if favorites else False, include=include)
+            for _, row in page_rows
+        ],
+        next_cursor=next_cursor,
+    )
+
 
 class IndicatorsService:
-    def search_indicators(self, query: str | None, limit: int, lang: LANGUAGE, db: Session, user_id: int = None):
+    # Resultados de búsqueda independientes del usuario, compartidos entre todos los usuarios
+    search_cache = TTLCache(maxsize=_SETTINGS.search_cache_size, ttl=_SETTINGS.search_cache_ttl_seconds)
+    # Series (indicador, entidad) en arreglos NumPy, limitadas por memoria
+    series_cache = SeriesCache(max_bytes=_SETTINGS.series_cache_max_bytes)
+    # Carga en segundo plano de las series completas que se leyeron recortadas a una ventana
+    series_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="series-cache")
+    _series_pending: set[tuple[int, int]] = set()
+    _series_pending_lock = threading.Lock()
+    ranking_cache = SeriesCache(max_bytes=_SETTINGS.ranking_cache_max_bytes)
+    correlation_cache = TTLCache(maxsize=_SETTINGS.correlation_cache_size, ttl=_SETTINGS.correlation_cache_ttl_seconds)
+    correlation_pool = ProcessPool(max_workers=_SETTINGS.correlation_workers)
+
+    def search_indicators(self, query: str | None, limit: int, lang: LANGUAGE, db: Session, user_id: int = None, cursor: str | None = None, include: EntityInclude = EntityInclude.ENTITIES) -> IndicatorSearchPageModel:
         try:
             logger.info(
-                f"Searching indicators with query: {query}, limit: {limit}, lang: {lang}")
-
-            if query and len(query) > 0:
-                sql_query = text("""
-                    WITH matched_indicators AS (
-                        SELECT DISTINCT i.indicator_id, i.indicator_code, il.indicator_name, 
-                               il.description, i.data_count, i.source,
-                               CASE WHEN uif.is_favorite IS TRUE THEN TRUE ELSE FALSE END as is_favorite
-                        FROM indicators i
-                        INNER JOIN indicators_lang il ON i.indicator_id = il.indicator_id
-                        LEFT JOIN user_indicator_favs uif ON i.indicator_id = uif.indicator_id AND uif.user_id = :user_id
-                        WHERE il.lang = :lang
-                        AND il.indicator_name IS NOT NULL 
-                        AND il.indicator_name != ''
-                        AND il.description IS NOT NULL 
-                        AND il.description != ''
-                        AND MATCH (il.indicator_name, il.description) AGAINST (:query IN NATURAL LANGUAGE MODE)
-                        LIMIT :limit
-                    ),
-                    entity_info AS (
-                        SELECT DISTINCT
-                            dv.indicator_id,
-                            dv.entity_id,
-                            e.entity_code,
-                            el.entity_name
-                        FROM data_values dv
-                        JOIN matched_indicators mi ON dv.indicator_id = mi.indicator_id
-                        JOIN entities e ON dv.entity_id = e.entity_id
-                        JOIN entities_lang el ON e.entity_id = el.entity_id
-                        WHERE el.lang = :lang
-                        AND el.entity_name IS NOT NULL 
-                        AND el.entity_name != ''
-                        AND dv.value IS NOT NULL
-                    )
-                    SELECT 
-                        mi.*,
-                        (
-                            SELECT JSON_ARRAYAGG(
-                                JSON_OBJECT(
-                                    'id', entity_id,
-                                    'code', entity_code,
-                                    'name', entity_name
-                                )
-                            )
-                            FROM (
-                                SELECT *
-                                FROM entity_info
-                                WHERE indicator_id = mi.indicator_id
-                                ORDER BY entity_name
-                            ) as entities
-                        ) as entities_json
-                    FROM matched_indicators mi
-                """)
-                result = db.execute(
-                    sql_query, {"query": query, "limit": limit, "lang": str(lang), "user_id": user_id}).fetchall()
-            else:
-                sql_query = text("""
-                    WITH base_indicators AS (
-                        SELECT DISTINCT i.indicator_id, i.indicator_code, il.indicator_name,
-                               il.description, i.data_count, i.source,
-                               CASE WHEN uif.is_favorite IS TRUE THEN TRUE ELSE FALSE END as is_favorite
-                        FROM indicators i
-                        INNER JOIN indicators_lang il ON i.indicator_id = il.indicator_id
-                        LEFT JOIN user_indicator_favs uif ON i.indicator_id = uif.indicator_id AND uif.user_id = :user_id
-                        WHERE il.lang = :lang
-                        AND il.indicator_name IS NOT NULL 
-                        AND il.indicator_name != ''
-                        AND il.description IS NOT NULL 
-                        AND il.description != ''
-                        ORDER BY i.data_count DESC
-                        LIMIT :limit
-                    ),
-                    entity_info AS (
-                        SELECT DISTINCT
-                            dv.indicator_id,
-                            dv.entity_id,
-                            e.entity_code,
-                            el.entity_name
-                        FROM data_values dv
-                        JOIN base_indicators bi ON dv.indicator_id = bi.indicator_id
-                        JOIN entities e ON dv.entity_id = e.entity_id
-                        JOIN entities_lang el ON e.entity_id = el.entity_id
-                        WHERE el.lang = :lang
-                        AND el.entity_name IS NOT NULL 
-                        AND el.entity_name != ''
-                        AND dv.value IS NOT NULL
-                    )
-                    SELECT 
-                        bi.*,
-                        (
-                            SELECT JSON_ARRAYAGG(
-                                JSON_OBJECT(
-                                    'id', entity_id,
-                                    'code', entity_code,
-                                    'name', entity_name
-                                )
-                            )
-                            FROM (
-                                SELECT *
-                                FROM entity_info
-                                WHERE indicator_id = bi.indicator_id
-                                ORDER BY entity_name
-                            ) as entities
-                        ) as entities_json
-                    FROM base_indicators bi
-                """)
-                result = db.execute(
-                    sql_query, {"limit": limit, "lang": str(lang), "user_id": user_id}).fetchall()
-
-            indicators = [
-                IndicatorSearchResponseModel(
-                    id=row.indicator_id,
-                    code=row.indicator_code,
-                    name=row.indicator_name,
-                    description=row.description,
-                    data_count=row.data_count,
-                    source=row.source,
-                    is_favorite=row.is_favorite,
-                    entities=json.loads(
-                        row.entities_json) if row.entities_json else []
-                )
-                for row in result
-            ]
+                f"Searching indicators with query: {query}, limit: {limit}, lang: {lang}, cursor: {cursor}, include: {include}")
 
-            return indicators
+            cache_key = (query or "", limit, str(lang), cursor, str(include))
+            page = IndicatorsService.search_cache.get(cache_key)
+            if page is None:
+                page = self._search_shared_indicators(query, limit, lang, db, cursor, include)
+                IndicatorsService.search_cache.set(cache_key, page)
+
+            # Los favoritos del usuario se aplican sobre el resultado compartido
+            favorite_ids = self.get_favorite_ids(db, user_id) if user_id and page.items else set()
+            return page.model_copy(update={"items": [
+                indicator.model_copy(update={"is_favorite": indicator.id in favorite_ids})
+                for indicator in page.items
+            ]})
 
         except Exception as e:
             logger.error(f"Error searching indicators: {e}")
             raise e
 
-    def get_indicator_details(self, indicator_code: str, entity_code: str, lang: LANGUAGE, db: Session):
-        try:
-            logger.info(
-                f"Fetching details for indicator: {indicator_code}, entity: {entity_code}")
+    def _search_shared_indicators(self, query: str | None, limit: int, lang: LANGUAGE, db: Session, cursor: str | None, include: EntityInclude) -> IndicatorSearchPageModel:
+        # Se pide un elemento extra para saber si existe una página siguiente
+        params = {"limit": limit + 1, "lang": str(lang)}
+        keyset = ""
+        ranked = None
+
+        if query and len(query) > 0:
+            kind = CURSOR_RELEVANCE if indicator_search_index.ready else CURSOR_MATCH
+            after = None
+            issued = cursor_kind(cursor) if cursor else None
+            if issued in (CURSOR_RELEVANCE, CURSOR_MATCH) and issued != kind:
+                # El cursor es del otro camino (el índice se cargó entre páginas): los
+                # puntajes no son comparables, así que la búsqueda vuelve a empezar
+                logger.info(f"Search cursor of kind {issued} restarted as {kind}")
+            elif cursor:
+                after = decode_cursor(cursor, kind)
+            # Con un cursor de MATCH no se consulta el índice aunque ya esté listo
+            ranked = indicator_search_index.search(lang, query, limit + 1, after=after) if kind == CURSOR_RELEVANCE else None
+            if ranked is not None:
+                # Índice en memoria: MySQL solo hidrata la página ya ordenada
+                if not ranked:
+                    return IndicatorSearchPageModel(items=[], next_cursor=None)
+                sql_query = _indicators_with_entities("""
+                    SELECT i.indicator_id, i.indicator_code, il.indicator_name,
+                           il.description, i.data_count, i.source
+                    FROM indicators i
+                    INNER JOIN indicators_lang il ON i.indicator_id = il.indicator_id
+                    WHERE il.lang = :lang
+                    AND i.indicator_id IN :ids
+                """, include=include).bindparams(bindparam("ids", expanding=True))
+                params["ids"] = [indicator_id for indicator_id, _ in ranked]
+            else:
+                if after:
+                    keyset = """
+                        AND (MATCH (il.indicator_name, il.description) AGAINST (:query IN NATURAL LANGUAGE MODE) < :after_value
+                             OR (MATCH (il.indicator_name, il.description) AGAINST (:query IN NATURAL LANGUAGE MODE) = :after_value
+                                 AND i.indicator_id > :after_id))
+                    """
+                    params["after_value"], params["after_id"] = after
+                sql_query = _indicators_with_entities(f"""
+                    SELECT i.indicator_id, i.indicator_code, il.indicator_name, 
+                           il.description, i.data_count, i.source,
+                           MATCH (il.indicator_name, il.description) AGAINST (:query IN NATURAL LANGUAGE MODE) AS sort_value
+                    FROM indicators i
+                    INNER JOIN indicators_lang il ON i.indicator_id = il.indicator_id
+                    WHERE il.lang = :lang
+                    AND il.indicator_name IS NOT NULL 
+                    AND il.indicator_name != ''
+                    AND il.description IS NOT NULL 
+                    AND il.description != ''
+                    AND MATCH (il.indicator_name, il.description) AGAINST (:query IN NATURAL LANGUAGE MODE)
+                    {keyset}
+                    ORDER BY sort_value DESC, i.indicator_id
+                    LIMIT :limit
+                """, order_by="ORDER BY b.sort_value DESC, b.indicator_id", include=include)
+                params["query"] = query
+        else:
+            kind = CURSOR_DATA_COUNT
+            if cursor:
+                keyset = """
+                    AND (COALESCE(i.data_count, 0) < :after_value
+                         OR (COALESCE(i.data_count, 0) = :after_value AND i.indicator_id > :after_id))
+                """
+                params["after_value"], params["after_id"] = decode_cursor(cursor, kind)
+            sql_query = _indicators_with_entities(f"""
+                SELECT i.indicator_id, i.indicator_code, il.indicator_name,
+                       il.description, i.data_count, i.source,
+                       COALESCE(i.data_count, 0) AS sort_value
+                FROM indicators i
+                INNER JOIN indicators_lang il ON i.indicator_id = il.indicator_id
+                WHERE il.lang = :lang
+                AND il.indicator_name IS NOT NULL 
+                AND il.indicator_name != ''
+                AND il.description IS NOT NULL 
+                AND il.description != ''
+                {keyset}
+                ORDER BY sort_value DESC, i.indicator_id
+                LIMIT :limit
+            """, order_by="ORDER BY b.sort_value DESC, b.indicator_id", include=include)
 
-            result = (
+        result = db.execute(sql_query, params).fetchall()
+
+        if ranked is not None:
+            scores = dict(ranked)
+            rows = sorted(
+                ((scores[row.indicator_id], row) for row in result),
+                key=lambda item: (-item[0], item[1].indicator_id))
+        else:
+            rows = [(row.sort_value, row) for row in result]
+
+        return _search_page(rows, limit, kind, include=include)
+
+    def get_favorite_ids(self, db: Session, user_id: int) -> set[int]:
+        result = db.execute(text("""
+            SELECT indicator_id
+            FROM user_indicator_favs
+            WHERE user_id = :user_id
+            AND is_favorite = TRUE
+        """), {"user_id": user_id}).scalars()
+        return set(result)
+
+    def _indicator_info(self, db: Session, indicator_code: str, lang: LANGUAGE):
+        indicators = self._indicators_info(db, [indicator_code], lang)
+        return indicators[0] if indicators else None
+
+    def _indicators_info(self, db: Session, indicator_codes: list[str], lang: LANGUAGE):
+        indicators, missing = dimension_registry.indicators(indicator_codes, lang)
+        if missing:
+            # Indicadores creados después del último refresco del registro
+            indicators += (
                 db.query(
+                    Indicator.indicator_id,
                     Indicator.indicator_code,
                     IndicatorLang.indicator_name,
                     IndicatorLang.description,
-                    Indicator.source,
+                    Indicator.source
+                )
+                .join(IndicatorLang, Indicator.indicator_id == IndicatorLang.indicator_id)
+                .filter(Indicator.indicator_code.in_(missing))
+                .filter(IndicatorLang.lang == str(lang))
+                .all()
+            )
+        return indicators
+
+    def _entities_info(self, db: Session, entity_codes: list[str], lang: LANGUAGE):
+        entities, missing = dimension_registry.entities(entity_codes, lang)
+        if missing:
+            entities += (
+                db.query(
+                    Entity.entity_id,
                     Entity.entity_code,
                     EntityLang.entity_name,
-                    EntityLang.entity_type,
-                    DataValue.value,
-                    TimePeriod.period_label
+                    EntityLang.entity_type
                 )
-                .join(IndicatorLang, Indicator.indicator_id == IndicatorLang.indicator_id)
-                .join(DataValue, Indicator.indicator_id == DataValue.indicator_id)
-                .join(Entity, DataValue.entity_id == Entity.entity_id)
                 .join(EntityLang, Entity.entity_id == EntityLang.entity_id)
-                .join(TimePeriod, DataValue.period_id == TimePeriod.period_id)
-                .filter(Indicator.indicator_code == indicator_code)
-                .filter(Entity.entity_code == entity_code)
-                .filter(IndicatorLang.lang == str(lang))
+                .filter(Entity.entity_code.in_(missing))
                 .filter(EntityLang.lang == str(lang))
-                .order_by(TimePeriod.period_label.asc())
                 .all()
             )
+        return sorted({entity.entity_id: entity for entity in entities}.values(), key=lambda entity: entity.entity_code)
+
+    def _entities_by_id(self, db: Session, entity_ids: list[int], lang: LANGUAGE) -> list:
+        entities = [dimension_registry.entity(entity_id, lang) for entity_id in entity_ids]
+        if None not in entities:
+            return entities
+        missing = [entity_id for entity_id, entity in zip(entity_ids, entities) if entity is None]
+        return [entity for entity in entities if entity is not None] + (
+            db.query(
+                Entity.entity_id,
+                Entity.entity_code,
+                EntityLang.entity_name,
+                EntityLang.entity_type
+            )
+            .join(EntityLang, Entity.entity_id == EntityLang.entity_id)
+            .filter(Entity.entity_id.in_(missing))
+            .filter(EntityLang.lang == str(lang))
+            .all()
+        )
+
+    def get_series(self, db: Session, indicator_ids: list[int], entity_ids: list[int],
+                   from_year: int | None = None, to_year: int | None = None) -> dict[tuple[int, int], Series]:
+        """
+        Series by `(indicator_id, entity_id)`, from the series cache.
+
+        Misses are loaded whole and cached, so any year window is later served
+        from the same series (`shape_many` applies it). For a windowed request,
+        misses with at least `series_window_min_values` values are read already
+        cut to the window in SQL instead, and their full series is cached in the
+        background.
+        """
+        found, missing = IndicatorsService.series_cache.get_many(
+            [(indicator_id, entity_id) for indicator_id in indicator_ids for entity_id in entity_ids])
+        series = dict(found)
+        if not missing:
+            return series
+
+        large = self._large_series(db, missing) if from_year is not None or to_year is not None else set()
+        if large:
+            window_ids = self.get_periods(db).window_ids(from_year, to_year)
+            series.update(self._load_series(db, sorted(large), window_ids))
+            self._fill_series_cache(sorted(large))
+        series.update(self._load_series(db, [key for key in missing if key not in large]))
+        return series
+
+    def _large_series(self, db: Session, keys: list[tuple[int, int]]) -> set[tuple[int, int]]:
+        """Keys with at least `series_window_min_values` values, from the counts of `indicator_entities`."""
+        rows = db.execute(text("""
+            SELECT indicator_id, entity_id
+            FROM indicator_entities
+            WHERE indicator_id IN :indicator_ids
+            AND entity_id IN :entity_ids
+            AND value_count >= :min_values
+        """).bindparams(bindparam("indicator_ids", expanding=True), bindparam("entity_ids", expanding=True)), {
+            "indicator_ids": sorted({indicator_id for indicator_id, _ in keys}),
+            "entity_ids": sorted({entity_id for _, entity_id in keys}),
+            "min_values": _SETTINGS.series_window_min_values,
+        }).fetchall()
+        return {(row.indicator_id, row.entity_id) for row in rows} & set(keys)
+
+    def _load_series(self, db: Session, keys: list[tuple[int, int]], window_ids: np.ndarray | None = None) -> dict[tuple[int, int], Series]:
+        """
+        Loads series with one set-based query that only reads `data_values`;
+        each series is then sorted by period label with the dimension registry.
+        Full series (no `window_ids`) are cached.
+        """
+        if not keys:
+            return {}
+        if window_ids is not None and not len(window_ids):
+            return {key: Series.from_rows([], []) for key in keys}
+
+        window_filter = "AND period_id IN :period_ids" if window_ids is not None else ""
+        statement = text(f"""
+            SELECT indicator_id, entity_id, period_id, value
+            FROM data_values
+            WHERE indicator_id IN :indicator_ids
+            AND entity_id IN :entity_ids
+            {window_filter}
+            ORDER BY indicator_id, entity_id
+        """).bindparams(bindparam("indicator_ids", expanding=True), bindparam("entity_ids", expanding=True))
+        params = {
+            "indicator_ids": sorted({indicator_id for indicator_id, _ in keys}),
+            "entity_ids": sorted({entity_id for _, entity_id in keys}),
+        }
+        if window_ids is not None:
+            statement = statement.bindparams(bindparam("period_ids", expanding=True))
+            params["period_ids"] = window_ids.tolist()
+        result = db.execute(statement, params).fetchall()
+
+        grouped: dict[tuple[int, int], tuple[list, list]] = {}
+        for row in result:
+            period_ids, values = grouped.setdefault((row.indicator_id, row.entity_id), ([], []))
+            period_ids.append(row.period_id)
+            values.append(row.value)
+
+        periods = self.get_periods(db, np.fromiter({row.period_id for row in result}, dtype=np.int64))
+        series = {}
+        # También se cachean las series vacías, para no volver a consultarlas
+        for key in keys:
+            loaded = Series.from_rows(*grouped.get(key, ([], [])))
+            # Como el join original con time_periods: se descartan períodos inexistentes
+            known = np.isin(loaded.period_ids, periods.ids)
+            period_ids, values = loaded.period_ids[known], loaded.values[known]
+            order = periods.label_order(period_ids)
+            series[key] = Series(period_ids[order], values[order])
+            if window_ids is None:
+                IndicatorsService.series_cache.set(key, series[key])
+        return series
+
+    def _fill_series_cache(self, keys: list[tuple[int, int]]):
+        """Loads and caches the full series of `keys` in the background, once per key at a time."""
+        with IndicatorsService._series_pending_lock:
+            keys = [key for key in keys if key not in IndicatorsService._series_pending]
+            IndicatorsService._series_pending.update(keys)
+        if not keys:
+            return
 
-            if not result:
+        def load():
+            try:
+                with SessionLocal() as db:
+                    self._load_series(db, keys)
+            except Exception as e:
+                logger.error(f"Error caching {len(keys)} full series in the background: {e}")
+            finally:
+                with IndicatorsService._series_pending_lock:
+                    IndicatorsService._series_pending.difference_update(keys)
+
+        IndicatorsService.series_loader.submit(load)
+
+    def get_periods(self, db: Session, period_ids: np.ndarray | None = None) -> PeriodTable:
+        """Time period metadata from the dimension registry; reloaded when a series references an unknown period."""
+        periods = dimension_registry.periods
+        if not len(periods.ids) or (period_ids is not None and not periods.covers(period_ids)):
+            periods = dimension_registry.reload_periods(db)
+        return periods
+
+    def _shape_entities(self, db: Session, indicator, entities: list, series: dict[tuple[int, int], Series], options: SeriesOptions) -> list[tuple]:
+        """`(entity, labels, values)` of the entities with data, shaped together so transforms run as one matrix."""
+        entity_series = [series[(indicator.indicator_id, entity.entity_id)] for entity in entities]
+        periods = self.get_periods(db, np.concatenate([values.period_ids for values in entity_series]))
+        shaped = shape_many([(values.period_ids, values.values) for values in entity_series], periods, options)
+        # Solo las entidades con datos, como con el join original
+        return [(entity, labels, values) for entity, (labels, values) in zip(entities, shaped) if len(values)]
+
+    def _entity_values(self, labels: np.ndarray, values: np.ndarray) -> list[dict]:
+        return [
+            {
+                "value": None if math.isnan(value) else value,
+                "period": label
+            }
+            for label, value in zip(labels.tolist(), values.tolist())
+        ]
+
+    def get_indicator_details(self, indicator_code: str, entity_code: str, lang: LANGUAGE, db: Session, options: SeriesOptions = SeriesOptions()):
+        try:
+            logger.info(
+                f"Fetching details for indicator: {indicator_code}, entity: {entity_code}")
+
+            indicator = self._indicator_info(db, indicator_code, lang)
+            entities = self._entities_info(db, [entity_code], lang)
+            if not indicator or not entities:
                 return None
 
-            # Get the first row for indicator and entity details
-            first_row = result[0]
+            series = self.get_series(
+                db, [indicator.indicator_id], [entity.entity_id for entity in entities], options.from_year, options.to_year)
+            shaped = self._shape_entities(db, indicator, entities, series, options)
+            if not shaped:
+                return None
+            entity, labels, values = shaped[0]
 
             # Structure the response
             indicator_details = {
-                "indicator_code": first_row.indicator_code,
-                "indicator_name": first_row.indicator_name,
-                "indicator_desc": first_row.description,
-                "source": first_row.source,
+                "indicator_code": indicator.indicator_code,
+                "indicator_name": indicator.indicator_name,
+                "indicator_desc": indicator.description,
+                "source": indicator.source,
                 "entity": {
-                    "entity_code": first_row.entity_code,
-                    "entity_name": first_row.entity_name,
-                    "entity_type": first_row.entity_type,
-                    "values": [
-                        {
-                            "value": row.value,
-                            "period": row.period_label
-                        }
-                        for row in result
-                    ]
+                    "entity_code": entity.entity_code,
+                    "entity_name": entity.entity_name,
+                    "entity_type": entity.entity_type,
+                    "values": self._entity_values(labels, values)
                 }
             }
 
@@ -219,80 +529,425 @@ class IndicatorsService:
             logger.error(f"Error fetching indicator details: {e}")
             raise e
 
-    def get_indicator_details_by_entities(self, indicator_code: str, entity_codes: list[str], lang: LANGUAGE, db: Session) -> IndicatorDetailsCustomResponseModelList:
+    def get_indicator_details_by_entities(self, indicator_code: str, entity_codes: list[str], lang: LANGUAGE, db: Session, options: SeriesOptions = SeriesOptions()) -> IndicatorDetailsCustomResponseModelList:
         try:
             logger.info(
                 f"Fetching details for indicator: {indicator_code}, entities: {entity_codes}")
 
-            result = (
-                db.query(
-                    Indicator.indicator_code,
-                    IndicatorLang.indicator_name,
-                    IndicatorLang.description,
-                    Indicator.source,
-                    Entity.entity_code,
-                    EntityLang.entity_name,
-                    EntityLang.entity_type,
-                    DataValue.value,
-                    TimePeriod.period_label
+            indicator = self._indicator_info(db, indicator_code, lang)
+            entities = self._entities_info(db, entity_codes, lang)
+            if not indicator or not entities:
+                return None
+
+            series = self.get_series(
+                db, [indicator.indicator_id], [entity.entity_id for entity in entities], options.from_year, options.to_year)
+            return self._indicator_with_entities(db, indicator, entities, series, options)
+
+        except Exception as e:
+            logger.error(f"Error fetching indicator details by entities: {e}")
+            raise e
+
+    def get_indicator_details_batch(self, indicator_codes: list[str], entity_codes: list[str], lang: LANGUAGE, db: Session, options: SeriesOptions = SeriesOptions()) -> list[IndicatorDetailsCustomResponseModelList]:
+        """Details of several indicators for several entities, in the order of `indicator_codes`."""
+        try:
+            logger.info(
+                f"Fetching batch details for indicators: {indicator_codes}, entities: {entity_codes}")
+
+            indicators = {
+                indicator.indicator_code: indicator
+                for indicator in self._indicators_info(db, indicator_codes, lang)
+            }
+            entities = self._entities_info(db, entity_codes, lang)
+            if not indicators or not entities:
+                return []
+
+            series = self.get_series(
+                db,
+                [indicator.indicator_id for indicator in indicators.values()],
+                [entity.entity_id for entity in entities],
+                options.from_year, options.to_year)
+
+            response = []
+            for code in dict.fromkeys(indicator_codes):
+                indicator = indicators.get(code)
+                details = self._indicator_with_entities(db, indicator, entities, series, options) if indicator else None
+                if details:
+                    response.append(details)
+            return response
+
+        except Exception as e:
+            logger.error(f"Error fetching batch indicator details: {e}")
+            raise e
+
+    def _indicator_with_entities(self, db: Session, indicator, entities: list, series: dict[tuple[int, int], Series], options: SeriesOptions) -> IndicatorDetailsCustomResponseModelList | None:
+        shaped = self._shape_entities(db, indicator, entities, series, options)
+        if not shaped:
+            return None
+
+        # Create response with list of entities
+        response = {
+            "indicator_code": indicator.indicator_code,
+            "indicator_name": indicator.indicator_name,
+            "indicator_desc": indicator.description,
+            "source": indicator.source,
+            "entities": [
+                {
+                    "entity_code": entity.entity_code,
+                    "entity_name": entity.entity_name,
+                    "entity_type": entity.entity_type,
+                    "values": self._entity_values(labels, values)
+                }
+                for entity, labels, values in shaped
+            ]
+        }
+
+        return IndicatorDetailsCustomResponseModelList(**response)
+
+    def get_indicator_table(self, indicator_code: str, entity_codes: list[str], lang: LANGUAGE, db: Session, options: SeriesOptions = SeriesOptions()) -> pa.Table | None:
+        """Same data as the detail endpoints as an Arrow table, built from the series arrays without per-row dicts."""
+        try:
+            indicator = self._indicator_info(db, indicator_code, lang)
+            entities = self._entities_info(db, entity_codes, lang)
+            if not indicator or not entities:
+                return None
+
+            series = self.get_series(
+                db, [indicator.indicator_id], [entity.entity_id for entity in entities], options.from_year, options.to_year)
+            shaped = self._shape_entities(db, indicator, entities, series, options)
+            if not shaped:
+                return None
+
+            codes = [entity.entity_code for entity, _, _ in shaped]
+            labels = [entity_labels for _, entity_labels, _ in shaped]
+            values = [entity_values for _, _, entity_values in shaped]
+            return series_table(codes, labels, values, metadata={
+                "indicator_code": indicator.indicator_code,
+                "indicator_name": indicator.indicator_name or "",
+                "source": indicator.source or "",
+            })
+
+        except Exception as e:
+            logger.error(f"Error building indicator table: {e}")
+            raise e
+
+    def get_ranking(self, db: Session, indicator_id: int, period_id: int) -> Ranking:
+        """Values of an indicator in one period sorted across entities, built on first use and cached."""
+        key = (indicator_id, period_id)
+        ranking = IndicatorsService.ranking_cache.get(key)
+        if ranking is None:
+            rows = db.execute(text("""
+                SELECT entity_id, value
+                FROM data_values
+                WHERE indicator_id = :indicator_id
+                AND period_id = :period_id
+                AND value IS NOT NULL
+            """), {"indicator_id": indicator_id, "period_id": period_id}).fetchall()
+            ranking = Ranking.from_rows((row.entity_id for row in rows), (row.value for row in rows))
+            IndicatorsService.ranking_cache.set(key, ranking)
+        return ranking
+
+    def get_indicator_ranking(self, indicator_code: str, period: str, top: int, order: RankingOrder,
+                              entity_code: str | None, lang: LANGUAGE, db: Session) -> IndicatorRankingModel | None:
+        """
+        Top `top` entities of an indicator in one period, plus the rank of
+        `entity_code` when given. None when the indicator, the period or the
+        data are missing.
+        """
+        try:
+            indicator = self._indicator_info(db, indicator_code, lang)
+            if not indicator:
+                return None
+            period_id = self.get_periods(db).label_id(period)
+            if period_id is None:
+                period_id = dimension_registry.reload_periods(db).label_id(period)
+            if period_id is None:
+                return None
+
+            ranking = self.get_ranking(db, indicator.indicator_id, period_id)
+            if not len(ranking):
+                return None
+
+            descending = order == RankingOrder.DESC
+            positions = ranking.top(top, descending)
+            entity_position = None
+            if entity_code:
+                entities = self._entities_info(db, [entity_code], lang)
+                entity_position = ranking.position(entities[0].entity_id) if entities else None
+            if entity_position is not None:
+                positions = np.append(positions, entity_position)
+
+            # Solo se buscan los nombres de las entidades devueltas
+            entity_ids = ranking.entity_ids[positions].tolist()
+            entities = {entity.entity_id: entity for entity in self._entities_by_id(db, list(dict.fromkeys(entity_ids)), lang)}
+            entries = [
+                RankingEntryModel(
+                    rank=rank,
+                    entity_code=entities[entity_id].entity_code if entity_id in entities else None,
+                    entity_name=entities[entity_id].entity_name if entity_id in entities else None,
+                    value=value,
+                    percentile=percentile,
                 )
-                .join(IndicatorLang, Indicator.indicator_id == IndicatorLang.indicator_id)
-                .join(DataValue, Indicator.indicator_id == DataValue.indicator_id)
-                .join(Entity, DataValue.entity_id == Entity.entity_id)
-                .join(EntityLang, Entity.entity_id == EntityLang.entity_id)
-                .join(TimePeriod, DataValue.period_id == TimePeriod.period_id)
-                .filter(Indicator.indicator_code == indicator_code)
-                .filter(Entity.entity_code.in_(entity_codes))
-                .filter(IndicatorLang.lang == str(lang))
-                .filter(EntityLang.lang == str(lang))
-                .order_by(Entity.entity_code, TimePeriod.period_label.asc())
-                .all()
+                for entity_id, rank, value, percentile in zip(
+                    entity_ids,
+                    ranking.ranks(positions, descending).tolist(),
+                    ranking.values[positions].tolist(),
+                    ranking.percentiles(positions).tolist())
+            ]
+            entity = entries.pop() if entity_position is not None else None
+
+            return IndicatorRankingModel(
+                indicator_code=indicator.indicator_code,
+                indicator_name=indicator.indicator_name,
+                period=period,
+                order=order,
+                total=len(ranking),
+                entries=entries,
+                entity=entity,
             )
 
-            if not result:
+        except Exception as e:
+            logger.error(f"Error fetching ranking for indicator {indicator_code}: {e}")
+            raise e
+
+    def _correlation_inputs(self, entity_code: str, indicator_codes: list[str], method: CorrelationMethod,
+                            from_year: int | None, to_year: int | None, lang: LANGUAGE, db: Session):
+        """
+        Entity, indicators (in request order), sorted indicator ids and cache
+        key of a correlation, with the cached result or, on a miss, the aligned
+        series × periods matrix to compute it from. None when the entity or
+        fewer than two of the indicators exist.
+        """
+        entities = self._entities_info(db, [entity_code], lang)
+        indicators = {indicator.indicator_code: indicator for indicator in self._indicators_info(db, indicator_codes, lang)}
+        indicators = [indicators[code] for code in dict.fromkeys(indicator_codes) if code in indicators]
+        if not entities or len(indicators) < 2:
+            return None
+
+        entity = entities[0]
+        # El conjunto de indicadores se cachea en orden de id, sin importar el orden pedido
+        indicator_ids = sorted(indicator.indicator_id for indicator in indicators)
+        cache_key = (entity.entity_id, tuple(indicator_ids), from_year, to_year, method)
+        result = IndicatorsService.correlation_cache.get(cache_key)
+        if result is not None:
+            return entity, indicators, indicator_ids, cache_key, result, None
+
+        series = self.get_series(db, indicator_ids, [entity.entity_id], from_year, to_year)
+        entity_series = [series[(indicator_id, entity.entity_id)] for indicator_id in indicator_ids]
+        if from_year is not None or to_year is not None:
+            # Las series del cache están completas: se recortan a la ventana
+            window = self.get_periods(db).window_ids(from_year, to_year)
+            entity_series = [
+                (values.period_ids[mask], values.values[mask])
+                for values, mask in ((values, np.isin(values.period_ids, window)) for values in entity_series)
+            ]
+        return entity, indicators, indicator_ids, cache_key, None, align_series(entity_series)
+
+    @staticmethod
+    def _correlation_model(entity, indicators: list, indicator_ids: list[int], method: CorrelationMethod,
+                           result: tuple[np.ndarray, np.ndarray]) -> IndicatorCorrelationModel:
+        correlations, counts = result
+        order = [indicator_ids.index(indicator.indicator_id) for indicator in indicators]
+        correlations, counts = correlations[np.ix_(order, order)], counts[np.ix_(order, order)]
+        return IndicatorCorrelationModel(
+            entity_code=entity.entity_code,
+            entity_name=entity.entity_name,
+            method=method,
+            indicator_codes=[indicator.indicator_code for indicator in indicators],
+            matrix=[[None if math.isnan(value) else value for value in row] for row in correlations.tolist()],
+            observations=counts.tolist(),
+        )
+
+    def get_indicator_correlation(self, entity_code: str, indicator_codes: list[str], method: CorrelationMethod,
+                                  from_year: int | None, to_year: int | None, lang: LANGUAGE, db: Session) -> IndicatorCorrelationModel | None:
+        """
+        Correlation matrix of several indicators for one entity, each pair over
+        the periods where both have a value. None when the entity or fewer than
+        two of the indicators exist.
+
+        Results are cached per (entity, indicator set, window, method). This
+        variant computes in the calling thread; the routes use
+        `get_indicator_correlation_async`.
+        """
+        try:
+            inputs = self._correlation_inputs(entity_code, indicator_codes, method, from_year, to_year, lang, db)
+            if inputs is None:
                 return None
+            entity, indicators, indicator_ids, cache_key, result, matrix = inputs
+            if result is None:
+                result = correlation_matrix(matrix, method, _SETTINGS.correlation_min_periods)
+                IndicatorsService.correlation_cache.set(cache_key, result)
+            return self._correlation_model(entity, indicators, indicator_ids, method, result)
 
-            # Group results by entity
-            entities_data = {}
-            indicator_info = None
-
-            for row in result:
-                if not indicator_info:
-                    indicator_info = {
-                        "indicator_code": row.indicator_code,
-                        "indicator_name": row.indicator_name,
-                        "indicator_desc": row.description,
-                        "source": row.source,
-                    }
-
-                entity_code = row.entity_code
-                if entity_code not in entities_data:
-                    entities_data[entity_code] = {
-                        "entity_code": entity_code,
-                        "entity_name": row.entity_name,
-                        "entity_type": row.entity_type,
-                        "values": []
-                    }
-
-                entities_data[entity_code]["values"].append({
-                    "value": row.value,
-                    "period": row.period_label
-                })
-
-            # Create response with list of entities
-            response = {
-                **indicator_info,
-                "entities": list(entities_data.values())
+        except Exception as e:
+            logger.error(f"Error computing indicator correlation for entity {entity_code}: {e}")
+            raise e
+
+    @staticmethod
+    def invalidate_series(indicator_ids: list[int] | None = None):
+        """
+        Drops cached series and correlations after data changes, for the
+        given indicators or all of them. Run by the data version watcher on
+        every worker.
+        """
+        if indicator_ids is None:
+            IndicatorsService.series_cache.clear()
+        else:
+            for indicator_id in indicator_ids:
+                IndicatorsService.series_cache.invalidate(indicator_id)
+        # Las correlaciones mezclan indicadores: se descartan todas
+        IndicatorsService.correlation_cache.clear()
+
+    @staticmethod
+    def invalidate_rankings(indicator_ids: list[int] | None = None):
+        """Drops the cached rankings of the given indicators, or all of them, after data changes."""
+        if indicator_ids is None:
+            IndicatorsService.ranking_cache.clear()
+            return
+        for indicator_id in indicator_ids:
+            IndicatorsService.ranking_cache.invalidate(indicator_id)
+
+    def get_export_target(self, indicator_code: str, entity_codes: list[str] | None, lang: LANGUAGE, db: Session):
+        """Indicator and entity ids of an export, or None when the indicator or every entity is unknown."""
+        indicator = self._indicator_info(db, indicator_code, lang)
+        if not indicator:
+            return None
+        if not entity_codes:
+            return indicator, None
+        entity_ids = [entity.entity_id for entity in self._entities_info(db, entity_codes, lang)]
+        return (indicator, entity_ids) if entity_ids else None
+
+    @staticmethod
+    def _export_batches(db: Session, sql: str, params: dict, statement_params: list, batch_size: int) -> Iterator[list]:
+        """
+        Rows of an export query in `(entity_id, period_id, data_id)` order, one
+        batch at a time. `sql` takes an `{after}` placeholder for the keyset
+        condition and must not have ORDER BY or LIMIT.
+
+        With a server-side cursor the query is streamed once; with a buffered
+        driver (mysqlconnector) each batch is its own keyset-paginated query, so
+        memory stays bounded by the batch either way.
+        """
+        order = "ORDER BY entity_id, period_id, data_id"
+        if server_side_cursors(db):
+            result = db.execute(text(f"{sql.format(after='')} {order}").bindparams(*statement_params), params,
+                                execution_options=stream_options(batch_size))
+            yield from result.partitions()
+            return
+
+        statement = text(f"{sql.format(after='')} {order} LIMIT :batch_size").bindparams(*statement_params)
+        after = text(f"""{sql.format(after="AND (entity_id, period_id, data_id) > (:last_entity, :last_period, :last_data)")}
+            {order} LIMIT :batch_size""").bindparams(*statement_params)
+        rows = db.execute(statement, {**params, "batch_size": batch_size}).fetchall()
+        while rows:
+            yield rows
+            if len(rows) < batch_size:
+                return
+            last = rows[-1]
+            rows = db.execute(after, {
+                **params, "batch_size": batch_size,
+                "last_entity": last.entity_id, "last_period": last.period_id, "last_data": last.data_id,
+            }).fetchall()
+
+    def export_indicator(self, indicator, entity_ids: list[int] | None, lang: LANGUAGE, export_format: ExportFormat,
+                         session_factory: Callable[[], Session] = SessionLocal) -> Iterator[str]:
+        """
+        Streams every value of an indicator as NDJSON lines or CSV rows.
+
+        Uses its own session, since the response outlives the request's. Rows
+        are read, formatted and sent one batch at a time in index order (see
+        `_export_batches`), so memory stays flat and the first batch goes out
+        before the whole indicator has been read.
+        """
+        params = {"indicator_id": indicator.indicator_id}
+        entity_filter = ""
+        statement_params = []
+        if entity_ids is not None:
+            entity_filter = "AND entity_id IN :entity_ids"
+            params["entity_ids"] = entity_ids
+            statement_params.append(bindparam("entity_ids", expanding=True))
+
+        with session_factory() as db:
+            periods = self.get_periods(db)
+            period_labels = dict(zip(periods.ids.tolist(), periods.labels.tolist()))
+            if entity_ids is None:
+                entity_ids = db.execute(text("""
+                    SELECT DISTINCT entity_id
+                    FROM data_values
+                    WHERE indicator_id = :indicator_id
+                    AND entity_id IS NOT NULL
+                """), {"indicator_id": indicator.indicator_id}).scalars().all()
+            # Los nombres se resuelven antes de leer los valores: con un cursor del
+            # lado del servidor abierto la conexión no admite otras consultas
+            entities = {
+                entity.entity_id: (entity.entity_code, entity.entity_name)
+                for entity in self._entities_by_id(db, list(entity_ids), lang)
             }
 
-            return IndicatorDetailsCustomResponseModelList(**response)
+            sql = f"""
+                SELECT data_id, entity_id, period_id, value
+                FROM data_values
+                WHERE indicator_id = :indicator_id
+                AND entity_id IS NOT NULL
+                AND period_id IS NOT NULL
+                {entity_filter}
+                {{after}}
+            """
+
+            if export_format == ExportFormat.CSV:
+                yield "indicator_code,entity_code,entity_name,period,value\r\n"
 
+            for partition in self._export_batches(db, sql, params, statement_params, _SETTINGS.export_batch_size):
+                buffer = io.StringIO()
+                writer = csv.writer(buffer) if export_format == ExportFormat.CSV else None
+                for row in partition:
+                    entity_code, entity_name = entities.get(row.entity_id, (None, None))
+                    value = None if row.value is None else float(row.value)
+                    period = period_labels.get(row.period_id)
+                    if writer:
+                        writer.writerow((indicator.indicator_code, entity_code, entity_name, period, value))
+                    else:
+                        buffer.write(json.dumps({
+                            "indicator_code": indicator.indicator_code,
+                            "entity_code": entity_code,
+                            "entity_name": entity_name,
+                            "period": period,
+                            "value": value,
+                        }))
+                        buffer.write("\n")
+                yield buffer.getvalue()
+
+    def get_indicator_entities(self, indicator_code: str, lang: LANGUAGE, db: Session) -> list[EntityBasicInfo] | None:
+        """Entities with data for an indicator, or None when the indicator does not exist."""
+        try:
+            indicator_id = dimension_registry.indicator_id(indicator_code)
+            if indicator_id is None:
+                indicator_id = db.execute(
+                    select(Indicator.indicator_id).where(Indicator.indicator_code == indicator_code)
+                ).scalar()
+            if indicator_id is None:
+                return None
+
+            entity_ids = db.execute(text("""
+                SELECT entity_id
+                FROM indicator_entities
+                WHERE indicator_id = :indicator_id
+            """), {"indicator_id": indicator_id}).scalars().all()
+
+            # Los nombres se agregan desde el registro de dimensiones
+            entities = self._entities_by_id(db, entity_ids, lang)
+            return [
+                EntityBasicInfo(id=entity.entity_id, code=entity.entity_code, name=entity.entity_name)
+                for entity in sorted(
+                    (entity for entity in entities if entity.entity_name),
+                    key=lambda entity: entity.entity_name.casefold())
+            ]
         except Exception as e:
-            logger.error(f"Error fetching indicator details by entities: {e}")
-            raise e
+            logger.error(f"Error fetching entities for indicator {indicator_code}: {e}")
+            raise
 
-    async def toggle_favorite_indicator(self, db: Session, user_id: int, indicator_id: int, is_favorite: bool) -> bool:
+    def toggle_favorite_indicator(self, db: Session, user_id: int, indicator_id: int, is_favorite: bool) -> bool:
         try:
+            use_primary(db)
             favorite = db.query(UserIndicatorFavorites).filter(
                 UserIndicatorFavorites.user_id == user_id,
                 UserIndicatorFavorites.indicator_id == indicator_id
@@ -309,84 +964,166 @@ class IndicatorsService:
                 db.add(favorite)
 
             db.commit()
+            recent_writers.note(user_id)
             return is_favorite
         except Exception as e:
             db.rollback()
             logger.error(f"Error toggling favorite indicator: {e}")
             raise
 
-    async def get_user_favorites(self, db: Session, user_id: int):
+    def get_user_favorites(self, db: Session, user_id: int, limit: int | None = None, cursor: str | None = None,
+                           include: EntityInclude = EntityInclude.ENTITIES) -> IndicatorSearchPageModel | list[IndicatorSearchResponseModel]:
+        """
+        Favorite indicators of a user: one page when `limit` is given, otherwise
+        the full list, the original shape of `/favorites`.
+        """
         try:
-            sql_query = text("""
-                WITH favorite_indicators AS (
-                    SELECT DISTINCT i.indicator_id, i.indicator_code, il.indicator_name, 
-                           il.description, i.data_count, i.source,
-                           uif.is_favorite
-                    FROM indicators i
-                    INNER JOIN indicators_lang il ON i.indicator_id = il.indicator_id
-                    INNER JOIN user_indicator_favs uif ON i.indicator_id = uif.indicator_id
-                    WHERE uif.user_id = :user_id
-                    AND uif.is_favorite = TRUE
-                    AND il.lang = 'EN'
-                    AND il.indicator_name IS NOT NULL 
-                    AND il.indicator_name != ''
-                    AND il.description IS NOT NULL 
-                    AND il.description != ''
-                ),
-                entity_info AS (
-                    SELECT DISTINCT
-                        dv.indicator_id,
-                        dv.entity_id,
-                        e.entity_code,
-                        el.entity_name
-                    FROM data_values dv
-                    JOIN favorite_indicators fi ON dv.indicator_id = fi.indicator_id
-                    JOIN entities e ON dv.entity_id = e.entity_id
-                    JOIN entities_lang el ON e.entity_id = el.entity_id
-                    WHERE el.lang = 'EN'
-                    AND el.entity_name IS NOT NULL 
-                    AND el.entity_name != ''
-                    AND dv.value IS NOT NULL
-                )
-                SELECT 
-                    fi.*,
-                    (
-                        SELECT JSON_ARRAYAGG(
-                            JSON_OBJECT(
-                                'id', entity_id,
-                                'code', entity_code,
-                                'name', entity_name
-                            )
-                        )
-                        FROM (
-                            SELECT *
-                            FROM entity_info
-                            WHERE indicator_id = fi.indicator_id
-                            ORDER BY entity_name
-                        ) as entities
-                    ) as entities_json
-                FROM favorite_indicators fi
-            """)
-
-            result = db.execute(sql_query, {"user_id": user_id}).fetchall()
-
-            favorites = [
-                IndicatorSearchResponseModel(
-                    id=row.indicator_id,
-                    code=row.indicator_code,
-                    name=row.indicator_name,
-                    description=row.description,
-                    data_count=row.data_count,
-                    source=row.source,
-                    is_favorite=row.is_favorite,
-                    entities=json.loads(
-                        row.entities_json) if row.entities_json else []
-                )
-                for row in result
-            ]
+            params = {"user_id": user_id, "lang": str(LANGUAGE.EN)}
+            keyset = ""
+            limit_clause = ""
+            if limit is not None:
+                params["limit"] = limit + 1
+                limit_clause = "LIMIT :limit"
+            if cursor:
+                keyset = """
+                    AND (COALESCE(i.data_count, 0) < :after_value
+                         OR (COALESCE(i.data_count, 0) = :after_value AND i.indicator_id > :after_id))
+                """
+                params["after_value"], params["after_id"] = decode_cursor(cursor, CURSOR_DATA_COUNT)
 
-            return favorites
+            sql_query = _indicators_with_entities(f"""
+                SELECT i.indicator_id, i.indicator_code, il.indicator_name, 
+                       il.description, i.data_count, i.source,
+                       uif.is_favorite,
+                       COALESCE(i.data_count, 0) AS sort_value
+                FROM indicators i
+                INNER JOIN indicators_lang il ON i.indicator_id = il.indicator_id
+                INNER JOIN user_indicator_favs uif ON i.indicator_id = uif.indicator_id
+                WHERE uif.user_id = :user_id
+                AND uif.is_favorite = TRUE
+                AND il.lang = :lang
+                AND il.indicator_name IS NOT NULL 
+                AND il.indicator_name != ''
+                AND il.description IS NOT NULL 
+                AND il.description != ''
+                {keyset}
+                ORDER BY sort_value DESC, i.indicator_id
+                {limit_clause}
+            """, order_by="ORDER BY b.sort_value DESC, b.indicator_id", include=include)
+
+            result = db.execute(sql_query, params).fetchall()
+
+            if limit is None:
+                return [_to_search_response(row, is_favorite=row.is_favorite, include=include) for row in result]
+            return _search_page([(row.sort_value, row) for row in result], limit, CURSOR_DATA_COUNT, favorites=True, include=include)
 
         except Exception as e:
             logger.error(f"Error getting user favorites: {e}")
             raise
+
+    async def search_indicators_async(self, query: str | None, limit: int, lang: LANGUAGE, db: Session | AsyncSession, user_id: int = None, cursor: str | None = None, include: EntityInclude = EntityInclude.ENTITIES) -> IndicatorSearchPageModel:
+        return await run_db(db, lambda session: self.search_indicators(query, limit, lang, session, user_id, cursor, include), cpu_bound=True)
+
+    async def get_indicator_details_async(self, indicator_code: str, entity_code: str, lang: LANGUAGE, db: Session | AsyncSession, options: SeriesOptions = SeriesOptions()):
+        return await run_db(db, lambda session: self.get_indicator_details(indicator_code, entity_code, lang, session, options), cpu_bound=True)
+
+    async def get_indicator_details_by_entities_async(self, indicator_code: str, entity_codes: list[str], lang: LANGUAGE, db: Session | AsyncSession, options: SeriesOptions = SeriesOptions()) -> IndicatorDetailsCustomResponseModelList:
+        return await run_db(db, lambda session: self.get_indicator_details_by_entities(indicator_code, entity_codes, lang, session, options), cpu_bound=True)
+
+    async def get_indicator_details_batch_async(self, indicator_codes: list[str], entity_codes: list[str], lang: LANGUAGE, db: Session | AsyncSession, options: SeriesOptions = SeriesOptions()) -> list[IndicatorDetailsCustomResponseModelList]:
+        return await run_db(db, lambda session: self.get_indicator_details_batch(indicator_codes, entity_codes, lang, session, options), cpu_bound=True)
+
+    async def get_indicator_table_async(self, indicator_code: str, entity_codes: list[str], lang: LANGUAGE, db: Session | AsyncSession, options: SeriesOptions = SeriesOptions()) -> pa.Table | None:
+        return await run_db(db, lambda session: self.get_indicator_table(indicator_code, entity_codes, lang, session, options), cpu_bound=True)
+
+    async def get_export_target_async(self, indicator_code: str, entity_codes: list[str] | None, lang: LANGUAGE, db: Session | AsyncSession):
+        return await run_db(db, lambda session: self.get_export_target(indicator_code, entity_codes, lang, session))
+
+    async def get_indicator_entities_async(self, indicator_code: str, lang: LANGUAGE, db: Session | AsyncSession) -> list[EntityBasicInfo] | None:
+        return await run_db(db, lambda session: self.get_indicator_entities(indicator_code, lang, session))
+
+    async def get_indicator_ranking_async(self, indicator_code: str, period: str, top: int, order: RankingOrder,
+                                          entity_code: str | None, lang: LANGUAGE, db: Session | AsyncSession) -> IndicatorRankingModel | None:
+        return await run_db(db, lambda session: self.get_indicator_ranking(indicator_code, period, top, order, entity_code, lang, session), cpu_bound=True)
+
+    async def get_indicator_correlation_async(self, entity_code: str, indicator_codes: list[str], method: CorrelationMethod,
+                                              from_year: int | None, to_year: int | None, lang: LANGUAGE, db: Session | AsyncSession) -> IndicatorCorrelationModel | None:
+        """
+        Async `get_indicator_correlation`: the session only loads and aligns the
+        series; the matrix is computed afterwards outside it, in the process pool
+        from `correlation_process_threshold` cells on so it does not hold the GIL.
+        """
+        try:
+            inputs = await run_db(db, lambda session: self._correlation_inputs(
+                entity_code, indicator_codes, method, from_year, to_year, lang, session), cpu_bound=True)
+            if inputs is None:
+                return None
+            entity, indicators, indicator_ids, cache_key, result, matrix = inputs
+            if result is None:
+                # Con db_async, run_db corre en el event loop: el cálculo se espera acá y no dentro de la sesión
+                args = (matrix, method, _SETTINGS.correlation_min_periods)
+                if matrix.size >= _SETTINGS.correlation_process_threshold:
+                    result = await IndicatorsService.correlation_pool.run(correlation_matrix, *args)
+                else:
+                    result = await run_in_threadpool(correlation_matrix, *args)
+                IndicatorsService.correlation_cache.set(cache_key, result)
+            return self._correlation_model(entity, indicators, indicator_ids, method, result)
+
+        except Exception as e:
+            logger.error(f"Error computing indicator correlation for entity {entity_code}: {e}")
+            raise e
+
+    async def toggle_favorite_indicator_async(self, db: Session | AsyncSession, user_id: int, indicator_id: int, is_favorite: bool) -> bool:
+        return await run_db(db, self.toggle_favorite_indicator, user_id, indicator_id, is_favorite)
+
+    async def get_user_favorites_async(self, db: Session | AsyncSession, user_id: int, limit: int | None = None, cursor: str | None = None, include: EntityInclude = EntityInclude.ENTITIES) -> IndicatorSearchPageModel | list[IndicatorSearchResponseModel]:
+        return await run_db(db, self.get_user_favorites, user_id, limit, cursor, include)
+
+    def refresh_indicator_entities(self, db: Session, indicator_ids: list[int] | None = None) -> int:
+        """Rebuilds `indicator_entities` from `data_values`, for all indicators or only the given ones."""
+        try:
+            use_primary(db)
+            params = {}
+            scope = ""
+            if indicator_ids is not None:
+                if not indicator_ids:
+                    return 0
+                scope = "AND indicator_id IN :indicator_ids"
+                params["indicator_ids"] = indicator_ids
+
+            def scoped(sql: str):
+                statement = text(sql.format(scope=scope))
+                if indicator_ids is not None:
+                    statement = statement.bindparams(bindparam("indicator_ids", expanding=True))
+                return statement
+
+            db.execute(scoped("DELETE FROM indicator_entities WHERE 1 = 1 {scope}"), params)
+            result = db.execute(scoped("""
+                INSERT INTO indicator_entities (indicator_id, entity_id, value_count)
+                SELECT indicator_id, entity_id, COUNT(*)
+                FROM data_values
+                WHERE value IS NOT NULL
+                AND indicator_id IS NOT NULL
+                AND entity_id IS NOT NULL
+                {scope}
+                GROUP BY indicator_id, entity_id
+            """), params)
+            db.commit()
+            # Se llama después de cargar datos: las series cacheadas ya no son válidas
+            self.invalidate_series(indicator_ids)
+            self.invalidate_rankings(indicator_ids)
+
+            logger.info(f"Rebuilt {result.rowcount} indicator_entities rows")
+            return result.rowcount
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error refreshing indicator_entities: {e}")
+            raise
+
+
+# Un cambio en el índice de búsqueda invalida los resultados compartidos
+indicator_search_index.add_listener(IndicatorsService.search_cache.clear)
+
+# Un cambio en data_values (detectado por versión) invalida las series y los rankings cacheados
+data_version_watcher.add_listener(IndicatorsService.invalidate_series)
+data_version_watcher.add_listener(IndicatorsService.invalidate_rankings)
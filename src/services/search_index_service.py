@@ -0,0 +1,194 @@
+import asyncio
+import heapq
+import logging
+import math
+import threading
+from collections import Counter
+from typing import Callable
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from src.models.indicators_model import LANGUAGE
+from src.utils.convert import tokenize
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__, level=logging.INFO)
+
+# Los términos del nombre pesan más que los de la descripción
+NAME_WEIGHT = 2
+
+
+class BM25Index:
+    """
+    Inverted index with Okapi BM25 ranking.
+
+    Documents can be added, replaced and removed one at a time, so the index
+    is maintained incrementally instead of being rebuilt.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[int, int]] = {}
+        self._doc_terms: dict[int, list[str]] = {}
+        self._lengths: dict[int, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def upsert(self, doc_id: int, term_frequencies: Counter):
+        self.remove(doc_id)
+        for term, frequency in term_frequencies.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        self._doc_terms[doc_id] = list(term_frequencies)
+        length = sum(term_frequencies.values())
+        self._lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id: int):
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in self._doc_terms.pop(doc_id):
+            del self._postings[term][doc_id]
+            if not self._postings[term]:
+                del self._postings[term]
+
+    def scores(self, terms: list[str]) -> dict[int, float]:
+        if not self._lengths:
+            return {}
+
+        doc_count = len(self._lengths)
+        average_length = self._total_length / doc_count
+        scores: dict[int, float] = {}
+        for term in set(terms):
+            docs = self._postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (doc_count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, frequency in docs.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return scores
+
+    def search(self, terms: list[str], limit: int, after: tuple[float, int] | None = None) -> list[tuple[int, float]]:
+        """Top `limit` `(doc_id, score)` pairs, optionally strictly after the `(score, doc_id)` keyset `after`."""
+        candidates = self.scores(terms).items()
+        if after is not None:
+            after_key = (-after[0], after[1])
+            candidates = [item for item in candidates if (-item[1], item[0]) > after_key]
+        # Mayor puntaje primero; a igual puntaje, menor id primero
+        return heapq.nsmallest(limit, candidates, key=lambda item: (-item[1], item[0]))
+
+
+def _document_terms(name: str, description: str | None) -> Counter:
+    terms = Counter()
+    for term in tokenize(name):
+        terms[term] += NAME_WEIGHT
+    terms.update(tokenize(description))
+    return terms
+
+
+class IndicatorSearchIndex:
+    """
+    One BM25 index over `indicators_lang` per LANGUAGE.
+
+    Built at startup and refreshed in the background: each refresh compares the
+    rows against the indexed versions and only re-indexes the ones that changed.
+    """
+
+    def __init__(self):
+        self._indexes: dict[str, BM25Index] = {str(lang): BM25Index() for lang in LANGUAGE}
+        self._versions: dict[str, dict[int, int]] = {str(lang): {} for lang in LANGUAGE}
+        self._loaded = False
+        self._listeners: list[Callable[[], None]] = []
+        self._lock = threading.RLock()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._loaded
+
+    def add_listener(self, listener: Callable[[], None]):
+        """Registers a callback run after each refresh that changed the index."""
+        self._listeners.append(listener)
+
+    def upsert(self, lang: LANGUAGE, indicator_id: int, name: str, description: str | None):
+        with self._lock:
+            self._indexes[str(lang)].upsert(indicator_id, _document_terms(name, description))
+            self._versions[str(lang)][indicator_id] = hash((name, description))
+
+    def remove(self, lang: LANGUAGE, indicator_id: int):
+        with self._lock:
+            self._indexes[str(lang)].remove(indicator_id)
+            self._versions[str(lang)].pop(indicator_id, None)
+
+    def refresh(self, db: Session) -> int:
+        # Mismos filtros que la búsqueda en MySQL
+        rows = db.execute(text("""
+            SELECT indicator_id, lang, indicator_name, description
+            FROM indicators_lang
+            WHERE indicator_name IS NOT NULL
+            AND indicator_name != ''
+            AND description IS NOT NULL
+            AND description != ''
+        """)).fetchall()
+
+        seen: dict[str, set[int]] = {lang: set() for lang in self._indexes}
+        changes = 0
+        for row in rows:
+            if row.lang not in self._indexes:
+                continue
+            seen[row.lang].add(row.indicator_id)
+            if self._versions[row.lang].get(row.indicator_id) != hash((row.indicator_name, row.description)):
+                self.upsert(row.lang, row.indicator_id, row.indicator_name, row.description)
+                changes += 1
+
+        for lang, versions in self._versions.items():
+            for indicator_id in set(versions) - seen[lang]:
+                self.remove(lang, indicator_id)
+                changes += 1
+
+        self._loaded = True
+        if changes:
+            for listener in self._listeners:
+                listener()
+            sizes = ", ".join(f"{lang}: {len(index)}" for lang, index in self._indexes.items())
+            logger.info(f"Indicator search index updated with {changes} changes ({sizes})")
+        return changes
+
+    def search(self, lang: LANGUAGE, query: str, limit: int, after: tuple[float, int] | None = None) -> list[tuple[int, float]] | None:
+        """Ranked `(indicator_id, score)` pairs, or None while the index is not loaded."""
+        if not self._loaded:
+            return None
+        with self._lock:
+            return self._indexes[str(lang)].search(tokenize(query), limit, after=after)
+
+    def _refresh_with(self, session_factory: Callable[[], Session]) -> int:
+        with session_factory() as db:
+            return self.refresh(db)
+
+    async def _run(self, session_factory: Callable[[], Session], interval: float):
+        while True:
+            try:
+                await run_in_threadpool(self._refresh_with, session_factory)
+            except Exception as e:
+                logger.error(f"Error refreshing indicator search index: {e}")
+            await asyncio.sleep(interval)
+
+    async def start(self, session_factory: Callable[[], Session], interval: float):
+        self._task = asyncio.create_task(self._run(session_factory, interval))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+indicator_search_index = IndicatorSearchIndex()
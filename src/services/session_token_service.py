@@ -0,0 +1,74 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import time
+from src.schema.auth_schemas import UserIdentity
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__, level=logging.INFO)
+
+SESSION_TOKEN_PREFIX = "pst1."
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class SessionTokenService:
+    """
+    Issues and verifies short-lived session tokens signed with HMAC-SHA256.
+
+    Tokens have the form `pst1.<payload>.<signature>` and embed the internal
+    user id, so verifying them needs neither Firebase nor the database.
+
+    The secret must be shared by every worker and instance. Without one the
+    service is disabled: nothing is issued and every session token is rejected.
+    """
+
+    def __init__(self, secret: str, ttl_seconds: int = 900):
+        if not secret:
+            # Un secreto aleatorio por proceso rompería los tokens entre instancias y reinicios
+            logger.warning("SESSION_TOKEN_SECRET is not set; session tokens are disabled.")
+        self._key = secret.encode("utf-8") if secret else None
+        self.ttl_seconds = ttl_seconds
+
+    @property
+    def enabled(self) -> bool:
+        return self._key is not None
+
+    @staticmethod
+    def is_session_token(token: str) -> bool:
+        return token.startswith(SESSION_TOKEN_PREFIX)
+
+    def _sign(self, body: str) -> str:
+        return _b64encode(hmac.new(self._key, body.encode("ascii"), hashlib.sha256).digest())
+
+    def issue(self, user: UserIdentity) -> tuple[str, int]:
+        if not self.enabled:
+            raise RuntimeError("Session tokens are disabled")
+        expires_at = int(time.time()) + self.ttl_seconds
+        payload = {"uid": user.id, "email": user.email, "exp": expires_at}
+        body = _b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        return f"{SESSION_TOKEN_PREFIX}{body}.{self._sign(body)}", expires_at
+
+    def verify(self, token: str) -> dict:
+        if not self.enabled:
+            raise ValueError("Session tokens are disabled")
+        body, _, signature = token[len(SESSION_TOKEN_PREFIX):].partition(".")
+        if not body or not hmac.compare_digest(self._sign(body), signature):
+            raise ValueError("Invalid session token signature")
+
+        payload = json.loads(_b64decode(body))
+        if payload.get("exp", 0) <= time.time():
+            raise ValueError("Session token expired")
+        return payload
+
+    @staticmethod
+    def to_identity(payload: dict) -> UserIdentity:
+        return UserIdentity(id=payload["uid"], email=payload["email"])
@@ -0,0 +1,192 @@
+import asyncio
+import heapq
+import logging
+from bisect import bisect_left
+from typing import Callable, NamedTuple
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from src.config.config import get_settings
+from src.models.indicators_model import LANGUAGE
+from src.utils.convert import tokenize
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__, level=logging.INFO)
+
+_SETTINGS = get_settings()
+
+SUGGEST_INDICATOR = "indicator"
+SUGGEST_ENTITY = "entity"
+
+# Prefijos cortos (los primeros teclazos) tienen su top-k precalculado
+TOP_PREFIX_LENGTH = 2
+
+
+class Suggestion(NamedTuple):
+    kind: str
+    id: int
+    code: str
+    name: str
+    data_count: int
+
+
+def _normalize(value: str | None) -> str:
+    return " ".join(tokenize(value))
+
+
+def _ranked(suggestions_by_kind: list[list[Suggestion]]) -> list[Suggestion]:
+    """
+    Merges several kinds of suggestions into one ranking.
+
+    `data_count` means different things per kind (values of an indicator,
+    values of an entity across indicators), so each suggestion is scored by
+    its relative rank within its own kind: the top indicator and the top
+    entity tie, then the next ones, and so on.
+    """
+    scored = []
+    for suggestions in suggestions_by_kind:
+        ordered = sorted(suggestions, key=lambda s: (-s.data_count, s.name))
+        rank, previous = 0, None
+        for position, suggestion in enumerate(ordered):
+            # Mismo conteo, mismo rango
+            if suggestion.data_count != previous:
+                rank, previous = position, suggestion.data_count
+            scored.append((rank / len(ordered), suggestion.name, suggestion))
+    scored.sort(key=lambda item: item[:2])
+    return [suggestion for _, _, suggestion in scored]
+
+
+class PrefixIndex:
+    """
+    Immutable prefix index over suggestion names, using a sorted key array and bisect.
+
+    Every word start of a normalized name is a key, so "gdp" matches "Real GDP growth".
+    `suggestions` come ordered best first, so a suggestion's position is its
+    rank and the best matches are the smallest positions.
+    """
+
+    def __init__(self, suggestions: list[Suggestion], top_k: int):
+        self.suggestions = suggestions
+        self.top_k = top_k
+
+        keys: list[tuple[str, int]] = []
+        for position, suggestion in enumerate(self.suggestions):
+            name = _normalize(suggestion.name)
+            for start in {0, *(i + 1 for i, c in enumerate(name) if c == " ")}:
+                keys.append((name[start:], position))
+        keys.sort()
+        self._keys = [key for key, _ in keys]
+        self._positions = [position for _, position in keys]
+
+        top: dict[str, set[int]] = {}
+        for key, position in keys:
+            for length in range(1, min(TOP_PREFIX_LENGTH, len(key)) + 1):
+                top.setdefault(key[:length], set()).add(position)
+        self._top = {prefix: heapq.nsmallest(top_k, positions) for prefix, positions in top.items()}
+
+    def __len__(self) -> int:
+        return len(self.suggestions)
+
+    def search(self, prefix: str, limit: int) -> list[Suggestion]:
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+        if len(prefix) <= TOP_PREFIX_LENGTH and limit <= self.top_k:
+            positions = self._top.get(prefix, [])[:limit]
+        else:
+            low = bisect_left(self._keys, prefix)
+            high = bisect_left(self._keys, prefix + "\U0010ffff", low)
+            positions = heapq.nsmallest(limit, set(self._positions[low:high]))
+        return [self.suggestions[position] for position in positions]
+
+
+class SuggestIndex:
+    """
+    Typeahead over indicator and entity names, one PrefixIndex per LANGUAGE.
+
+    Indicators rank by `data_count` and entities by the number of values they
+    have across indicators, each relative to its own kind. Refreshed in the background; a refresh builds new
+    indexes and swaps them in, so requests never touch the database.
+    """
+
+    def __init__(self, top_k: int):
+        self.top_k = top_k
+        self._indexes: dict[str, PrefixIndex] = {}
+        self._version: int | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._indexes)
+
+    def refresh(self, db: Session) -> bool:
+        indicators = db.execute(text("""
+            SELECT i.indicator_id, i.indicator_code, il.lang, il.indicator_name, COALESCE(i.data_count, 0) AS data_count
+            FROM indicators i
+            JOIN indicators_lang il ON il.indicator_id = i.indicator_id
+            WHERE il.indicator_name IS NOT NULL
+            AND il.indicator_name != ''
+        """)).fetchall()
+        entities = db.execute(text("""
+            SELECT e.entity_id, e.entity_code, el.lang, el.entity_name, COALESCE(SUM(ie.value_count), 0) AS data_count
+            FROM entities e
+            JOIN entities_lang el ON el.entity_id = e.entity_id
+            AND el.entity_name IS NOT NULL
+            AND el.entity_name != ''
+            LEFT JOIN indicator_entities ie ON ie.entity_id = e.entity_id
+            GROUP BY e.entity_id, e.entity_code, el.lang, el.entity_name
+        """)).fetchall()
+
+        version = hash((tuple(map(tuple, indicators)), tuple(map(tuple, entities))))
+        if version == self._version:
+            return False
+
+        kinds = (SUGGEST_INDICATOR, SUGGEST_ENTITY)
+        suggestions: dict[str, dict[str, list[Suggestion]]] = {str(lang): {kind: [] for kind in kinds} for lang in LANGUAGE}
+        for kind, rows in zip(kinds, (indicators, entities)):
+            for row in rows:
+                if row[2] in suggestions:
+                    suggestions[row[2]][kind].append(Suggestion(kind, row[0], row[1], row[3], int(row[4])))
+
+        self._indexes = {
+            lang: PrefixIndex(_ranked(list(by_kind.values())), self.top_k)
+            for lang, by_kind in suggestions.items()
+        }
+        self._version = version
+        sizes = ", ".join(f"{lang}: {len(index)}" for lang, index in self._indexes.items())
+        logger.info(f"Suggest index rebuilt ({sizes})")
+        return True
+
+    def suggest(self, lang: LANGUAGE, prefix: str, limit: int) -> list[Suggestion] | None:
+        """Top `limit` suggestions for `prefix`, or None while the index is not loaded."""
+        index = self._indexes.get(str(lang))
+        if index is None:
+            return None
+        return index.search(prefix, limit)
+
+    def _refresh_with(self, session_factory: Callable[[], Session]) -> bool:
+        with session_factory() as db:
+            return self.refresh(db)
+
+    async def _run(self, session_factory: Callable[[], Session], interval: float):
+        while True:
+            try:
+                await run_in_threadpool(self._refresh_with, session_factory)
+            except Exception as e:
+                logger.error(f"Error refreshing suggest index: {e}")
+            await asyncio.sleep(interval)
+
+    async def start(self, session_factory: Callable[[], Session], interval: float):
+        self._task = asyncio.create_task(self._run(session_factory, interval))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+suggest_index = SuggestIndex(_SETTINGS.suggest_max_limit)
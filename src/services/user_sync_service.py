@@ -0,0 +1,79 @@
+import asyncio
+import logging
+from typing import Callable
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from src.models.user_model import UserModel
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__, level=logging.INFO)
+
+
+class UserProfileWriter:
+    """
+    Write-behind queue for user profile changes.
+
+    Changes are coalesced per user id and flushed in batches by a background
+    task, so request handlers never wait on a `commit()` for profile updates.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], flush_interval: float = 5.0, batch_size: int = 200):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending: dict[int, dict] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def enqueue(self, user_id: int, changes: dict):
+        self._pending.setdefault(user_id, {}).update(changes)
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _write(self, batch: list[dict]):
+        with self.session_factory() as db:
+            # UPDATE masivo por clave primaria: una sentencia por grupo de columnas
+            db.execute(update(UserModel), batch)
+            db.commit()
+
+    async def flush(self):
+        while self._pending:
+            user_ids = list(self._pending)[:self.batch_size]
+            changes = {user_id: self._pending.pop(user_id) for user_id in user_ids}
+            batch = [{"id": user_id, **fields} for user_id, fields in changes.items()]
+            try:
+                await run_in_threadpool(self._write, batch)
+                logger.info(f"Flushed profile changes for {len(batch)} users")
+            except Exception as e:
+                logger.error(f"Error flushing user profile changes: {e}")
+                # Reencolar sin pisar cambios más recientes
+                for user_id, fields in changes.items():
+                    self._pending[user_id] = {**fields, **self._pending.get(user_id, {})}
+                break
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
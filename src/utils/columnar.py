@@ -0,0 +1,43 @@
+from enum import StrEnum
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+class ColumnarFormat(StrEnum):
+    ARROW = "arrow"
+    PARQUET = "parquet"
+
+
+MEDIA_TYPES = {
+    ColumnarFormat.ARROW: "application/vnd.apache.arrow.stream",
+    ColumnarFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def series_table(entity_codes: list[str], labels: list[np.ndarray], values: list[np.ndarray], metadata: dict[str, str] | None = None) -> pa.Table:
+    """
+    Builds an `(entity_code, period, value)` table straight from the series arrays.
+
+    `entity_code` is dictionary encoded (one index per row, one string per entity)
+    and NaN values become nulls.
+    """
+    lengths = np.array([len(entity_values) for entity_values in values], dtype=np.int64)
+    indices = np.repeat(np.arange(len(entity_codes), dtype=np.int32), lengths)
+    columns = [
+        pa.DictionaryArray.from_arrays(pa.array(indices), pa.array(entity_codes, type=pa.string())),
+        pa.array(np.concatenate(labels) if labels else [], type=pa.string()),
+        pa.array(np.concatenate(values) if values else [], type=pa.float64(), from_pandas=True),
+    ]
+    table = pa.Table.from_arrays(columns, names=["entity_code", "period", "value"])
+    return table.replace_schema_metadata(metadata) if metadata else table
+
+
+def serialize(table: pa.Table, columnar_format: ColumnarFormat) -> bytes:
+    sink = pa.BufferOutputStream()
+    if columnar_format == ColumnarFormat.PARQUET:
+        pq.write_table(table, sink)
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -1,4 +1,5 @@
 import re
+import unicodedata
 import pandas as pd
 
 def convert_nan_to_none(value):
@@ -25,4 +26,14 @@ def remove_surrogates(text):
 def clean_dataframe(df):
     for col in df.select_dtypes(include=['object']):
         df[col] = df[col].apply(remove_surrogates)
-    return df
\ No newline at end of file
+    return df
+
+def fold_text(text):
+    """Lowercases and strips accents, so "Inflación" and "inflacion" compare equal."""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+def tokenize(text):
+    return re.findall(r"\w+", fold_text(text))
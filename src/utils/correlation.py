@@ -0,0 +1,69 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from enum import StrEnum
+import multiprocessing
+import threading
+import numpy as np
+import pandas as pd
+
+
+class CorrelationMethod(StrEnum):
+    PEARSON = "pearson"
+    SPEARMAN = "spearman"
+
+
+def align_series(series: list[tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+    """
+    Stacks `(period_ids, values)` series into a series × periods matrix over
+    the union of their period ids, NaN where a series has no value.
+    """
+    period_ids = np.unique(np.concatenate([ids for ids, _ in series] or [np.empty(0, dtype=np.int32)]))
+    matrix = np.full((len(series), len(period_ids)), np.nan)
+    for row, (ids, values) in enumerate(series):
+        matrix[row, np.searchsorted(period_ids, ids)] = values
+    return matrix
+
+
+def correlation_matrix(matrix: np.ndarray, method: CorrelationMethod, min_periods: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Correlation of every pair of rows over the periods where both have a value.
+
+    Returns the correlation matrix (NaN for pairs with fewer than `min_periods`
+    common periods or a constant series) and the number of common periods of
+    each pair. Module-level and free of state, so it can run in a worker process.
+    """
+    valid = (~np.isnan(matrix)).astype(np.int64)
+    counts = valid @ valid.T
+    correlations = pd.DataFrame(matrix.T).corr(method=str(method), min_periods=min_periods).to_numpy()
+    return correlations, counts
+
+
+class ProcessPool:
+    """
+    Lazily started process pool for CPU-bound work that would otherwise hold
+    the GIL in the request threads. `run` is awaited from the event loop,
+    never from data-access code that may itself run on it.
+
+    Args:
+        max_workers (int): Worker processes, created on the first `run`.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._executor is None:
+                # spawn: hacer fork de un proceso con hilos (servidor, pools de conexiones) no es seguro
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            executor = self._executor
+        return await asyncio.wrap_future(executor.submit(fn, *args))
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
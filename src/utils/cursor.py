@@ -0,0 +1,36 @@
+import base64
+import binascii
+import json
+
+
+class InvalidCursor(ValueError):
+    """A pagination cursor that is malformed or was issued by another listing."""
+
+
+def encode_cursor(kind: str, sort_value: float | int, last_id: int) -> str:
+    """Opaque keyset cursor: the sort key and id of the last item of a page."""
+    payload = json.dumps({"k": kind, "v": sort_value, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def _payload(cursor: str) -> dict:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if not isinstance(payload, dict):
+        raise InvalidCursor("Invalid cursor")
+    return payload
+
+
+def cursor_kind(cursor: str) -> str | None:
+    """Kind of a cursor, to tell which ordering issued it before decoding it."""
+    return _payload(cursor).get("k")
+
+
+def decode_cursor(cursor: str, kind: str) -> tuple[float | int, int]:
+    payload = _payload(cursor)
+    sort_value, last_id = payload.get("v"), payload.get("id")
+    if payload.get("k") != kind or not isinstance(sort_value, (int, float)) or not isinstance(last_id, int):
+        raise InvalidCursor("Invalid cursor")
+    return sort_value, last_id
@@ -0,0 +1,102 @@
+import bisect
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+
+# Límites superiores (segundos) del histograma de espera de checkout
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class PoolMetrics:
+    """
+    Connection pool counters and checkout wait-time histogram.
+
+    Counters are fed by SQLAlchemy pool events; the wait time is measured by
+    the pool class returned from `instrument`, around each checkout.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Pool | None = None
+        self._lock = threading.Lock()
+        self.bucket_counts = [0] * (len(WAIT_BUCKETS) + 1)
+        self.wait_sum = 0.0
+        self.wait_count = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+
+    def observe_wait(self, seconds: float):
+        with self._lock:
+            self.bucket_counts[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+            self.wait_sum += seconds
+            self.wait_count += 1
+
+    def instrument(self, pool_class: type[Pool]) -> type[Pool]:
+        metrics = self
+
+        class InstrumentedPool(pool_class):
+            def _do_get(self):
+                start = time.perf_counter()
+                try:
+                    return super()._do_get()
+                except PoolTimeoutError:
+                    metrics.timeouts += 1
+                    raise
+                finally:
+                    metrics.observe_wait(time.perf_counter() - start)
+
+        InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+        return InstrumentedPool
+
+    def attach(self, engine: Engine):
+        self.pool = engine.pool
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        self.checkins += 1
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        with self._lock:
+            histogram = {}
+            cumulative = 0
+            for bound, count in zip(WAIT_BUCKETS + (float("inf"),), self.bucket_counts):
+                cumulative += count
+                histogram["+Inf" if bound == float("inf") else str(bound)] = cumulative
+            wait = {
+                "count": self.wait_count,
+                "sum_seconds": self.wait_sum,
+                "buckets": histogram,
+            }
+
+        return {
+            "pool": type(pool).__name__ if pool else None,
+            "size": pool.size() if pool and hasattr(pool, "size") else None,
+            "checked_out": pool.checkedout() if pool and hasattr(pool, "checkedout") else None,
+            "idle": pool.checkedin() if pool and hasattr(pool, "checkedin") else None,
+            "overflow": max(pool.overflow(), 0) if pool and hasattr(pool, "overflow") else None,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "checkout_wait": wait,
+        }
@@ -0,0 +1,313 @@
+from dataclasses import dataclass
+from enum import StrEnum
+import numpy as np
+
+
+class Frequency(StrEnum):
+    MONTHLY = "monthly"
+    QUARTERLY = "quarterly"
+    YEARLY = "yearly"
+
+
+class Aggregation(StrEnum):
+    LAST = "last"
+    MEAN = "mean"
+    SUM = "sum"
+
+
+class Transform(StrEnum):
+    YOY = "yoy"
+    PCT_CHANGE = "pct_change"
+    CAGR = "cagr"
+    ROLLING_MEAN = "rolling_mean"
+    INDEX = "index"
+
+
+# Meses por período de cada frecuencia
+_FREQUENCY_MONTHS = {Frequency.MONTHLY: 1, Frequency.QUARTERLY: 3, Frequency.YEARLY: 12}
+
+MONTHS = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December')
+
+
+@dataclass(frozen=True)
+class SeriesOptions:
+    """
+    Server-side shaping of a series: a year window, a resample to a coarser
+    frequency, a transform and a cap on the number of points.
+    """
+    from_year: int | None = None
+    to_year: int | None = None
+    frequency: Frequency | None = None
+    aggregation: Aggregation = Aggregation.LAST
+    max_points: int | None = None
+    transform: Transform | None = None
+    rolling_window: int = 3
+    base_year: int | None = None
+
+    @property
+    def windowed(self) -> bool:
+        return self.from_year is not None or self.to_year is not None
+
+    @property
+    def reshaped(self) -> bool:
+        return self.frequency is not None or self.max_points is not None or self.transform is not None
+
+
+class PeriodTable:
+    """
+    `time_periods` metadata as arrays sorted by period id, so a whole series
+    is looked up with one `searchsorted`.
+
+    Args:
+        rows: `(period_id, period_label, start_year, start_month, end_year)` tuples.
+    """
+
+    def __init__(self, rows: list[tuple] = ()):
+        rows = sorted(rows, key=lambda row: row[0])
+        self.ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.labels = np.array([row[1] for row in rows], dtype=object)
+        self.start_years = np.array([np.nan if row[2] is None else row[2] for row in rows], dtype=np.float64)
+        self.end_years = np.array([np.nan if row[4] is None else row[4] for row in rows], dtype=np.float64)
+        # Inicio de cada período en meses desde el año 0 (enero si no tiene mes)
+        start_months = np.array([MONTHS.index(row[3]) if row[3] in MONTHS else 0 for row in rows], dtype=np.float64)
+        self.start_months = self.start_years * 12 + start_months
+        # Posición de cada etiqueta en orden alfabético, el orden original de las series
+        self.label_ranks = np.empty(len(rows), dtype=np.int64)
+        self.label_ranks[sorted(range(len(rows)), key=lambda i: (rows[i][1] or "").casefold())] = np.arange(len(rows))
+        # Primer período con cada etiqueta
+        self._label_ids = {}
+        for row in rows:
+            self._label_ids.setdefault(row[1], row[0])
+
+    def covers(self, period_ids: np.ndarray) -> bool:
+        return bool(np.isin(period_ids, self.ids).all())
+
+    def positions(self, period_ids: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self.ids, period_ids)
+
+    def label_order(self, period_ids: np.ndarray) -> np.ndarray:
+        """Indices that sort `period_ids` by period label."""
+        return np.argsort(self.label_ranks[self.positions(period_ids)], kind="stable")
+
+    def label_id(self, label: str) -> int | None:
+        return self._label_ids.get(label)
+
+    def window_ids(self, from_year: int | None, to_year: int | None) -> np.ndarray:
+        return self.ids[window_mask(self.start_years, self.end_years, from_year, to_year)]
+
+
+def window_mask(start_years: np.ndarray, end_years: np.ndarray, from_year: int | None, to_year: int | None) -> np.ndarray:
+    """Periods fully inside `[from_year, to_year]`; periods without years never match a bound."""
+    mask = np.ones(len(start_years), dtype=bool)
+    if from_year is not None:
+        mask &= start_years >= from_year
+    if to_year is not None:
+        mask &= end_years <= to_year
+    return mask
+
+
+def period_buckets(months: np.ndarray, frequency: Frequency) -> np.ndarray:
+    """Bucket of each period for `frequency`, from its start as months since year 0."""
+    return months // _FREQUENCY_MONTHS[frequency]
+
+
+def bucket_label(bucket: int, frequency: Frequency) -> str:
+    if frequency == Frequency.YEARLY:
+        return str(bucket)
+    if frequency == Frequency.QUARTERLY:
+        return f"{bucket // 4}-Q{bucket % 4 + 1}"
+    return f"{bucket // 12}-{bucket % 12 + 1:02d}"
+
+
+def resample(buckets: np.ndarray, values: np.ndarray, aggregation: Aggregation) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Aggregates chronologically sorted `values` per bucket, ignoring NaN.
+
+    Returns the distinct buckets and their aggregated values; a bucket with
+    no valid value aggregates to NaN.
+    """
+    if not len(buckets):
+        return buckets, values
+
+    keys, starts = np.unique(buckets, return_index=True)
+    valid = ~np.isnan(values)
+    counts = np.add.reduceat(valid.astype(np.int64), starts)
+
+    if aggregation == Aggregation.LAST:
+        # Índice del último valor válido de cada bucket (-1 si no hay)
+        last = np.maximum.reduceat(np.where(valid, np.arange(len(values)), -1), starts)
+        result = np.where(last >= 0, values[np.maximum(last, 0)], np.nan)
+    else:
+        sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+        if aggregation == Aggregation.MEAN:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                sums = sums / counts
+        result = np.where(counts > 0, sums, np.nan)
+    return keys, result
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of at most `threshold` points that keep the visual shape
+    of `(x, y)`, which must be sorted by `x` and free of NaN. The triangle areas
+    of each bucket are computed with NumPy, so the Python loop runs once per
+    output point rather than once per input point.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Buckets internos: se excluyen el primer y el último punto, que siempre se conservan
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = end, edges[bucket + 2] if bucket + 2 < len(edges) else n
+        average_x = x[next_start:next_end].mean()
+        average_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[a] - average_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (average_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected[bucket + 1] = a
+    return selected
+
+
+def _previous_valid(matrix: np.ndarray) -> np.ndarray:
+    """Per row, the last valid value strictly before each column (NaN if none)."""
+    columns = np.arange(matrix.shape[1])
+    last = np.maximum.accumulate(np.where(~np.isnan(matrix), columns, -1), axis=1)
+    previous = np.full_like(last, -1)
+    previous[:, 1:] = last[:, :-1]
+    rows = np.arange(matrix.shape[0])[:, None]
+    return np.where(previous >= 0, matrix[rows, np.maximum(previous, 0)], np.nan)
+
+
+def transform_matrix(months: np.ndarray, matrix: np.ndarray, options: SeriesOptions) -> np.ndarray:
+    """
+    Applies `options.transform` to every row of an entities × periods matrix at once.
+
+    `months` are the sorted period starts (months since year 0) shared by the
+    columns; missing observations are NaN and stay NaN. Changes and growth
+    rates are percentages, `rolling_mean` averages the valid values of the
+    last `rolling_window` columns and `index` is 100 at the mean of
+    `base_year` (or of each row's first year with data).
+    """
+    transform = options.transform
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if transform == Transform.PCT_CHANGE:
+            return (matrix / _previous_valid(matrix) - 1) * 100
+
+        if transform == Transform.YOY:
+            # Columna del mismo período un año antes, si existe
+            lagged = months - 12
+            columns = np.minimum(np.searchsorted(months, lagged), len(months) - 1)
+            found = months[columns] == lagged
+            return np.where(found, (matrix / matrix[:, columns] - 1) * 100, np.nan)
+
+        valid = ~np.isnan(matrix)
+        if transform == Transform.CAGR:
+            first = np.argmax(valid, axis=1)
+            start = matrix[np.arange(len(matrix)), first][:, None]
+            years = (months[None, :] - months[first][:, None]) / 12
+            result = ((matrix / start) ** (1 / years) - 1) * 100
+            return np.where((years > 0) & (start > 0) & (matrix > 0), result, np.nan)
+
+        if transform == Transform.ROLLING_MEAN:
+            window = options.rolling_window
+            sums = np.cumsum(np.where(valid, matrix, 0.0), axis=1)
+            counts = np.cumsum(valid, axis=1)
+            sums[:, window:] -= sums[:, :-window].copy()
+            counts[:, window:] -= counts[:, :-window].copy()
+            return np.where(valid & (counts > 0), sums / counts, np.nan)
+
+        if transform == Transform.INDEX:
+            years = months // 12
+            if options.base_year is None:
+                base_years = years[np.argmax(valid, axis=1)][:, None]
+            else:
+                base_years = np.full((len(matrix), 1), options.base_year)
+            in_base = valid & (years[None, :] == base_years)
+            counts = in_base.sum(axis=1)
+            base = np.where(counts > 0, np.where(in_base, matrix, 0.0).sum(axis=1) / counts, np.nan)
+            return np.where(base[:, None] != 0, matrix / base[:, None] * 100, np.nan)
+
+    return matrix
+
+
+def _prepare(period_ids: np.ndarray, values: np.ndarray, periods: PeriodTable, options: SeriesOptions) -> tuple[np.ndarray | None, np.ndarray, np.ndarray]:
+    """Window, chronological sort and resample of one series: `(months, labels, values)`."""
+    positions = periods.positions(period_ids)
+    if options.windowed:
+        mask = window_mask(periods.start_years[positions], periods.end_years[positions], options.from_year, options.to_year)
+        positions, values = positions[mask], values[mask]
+
+    labels = periods.labels[positions]
+    if not options.reshaped:
+        return None, labels, values
+
+    months = periods.start_months[positions]
+    dated = ~np.isnan(months)
+    order = np.argsort(months[dated], kind="stable")
+    months, values, labels = months[dated][order], values[dated][order], labels[dated][order]
+
+    if options.frequency is not None:
+        buckets, values = resample(period_buckets(months.astype(np.int64), options.frequency), values, options.aggregation)
+        labels = np.array([bucket_label(bucket, options.frequency) for bucket in buckets.tolist()], dtype=object)
+        months = (buckets * _FREQUENCY_MONTHS[options.frequency]).astype(np.float64)
+
+    return months, labels, values
+
+
+def _transform_all(prepared: list[tuple], options: SeriesOptions) -> list[tuple]:
+    """Aligns the series on their common months, transforms them as one matrix and splits them back."""
+    months = np.unique(np.concatenate([series_months for series_months, _, _ in prepared] or [np.empty(0)]))
+    if not len(months):
+        return prepared
+    columns = [np.searchsorted(months, series_months) for series_months, _, _ in prepared]
+    matrix = np.full((len(prepared), len(months)), np.nan)
+    for row, (series_columns, (_, _, values)) in enumerate(zip(columns, prepared)):
+        matrix[row, series_columns] = values
+
+    transformed = transform_matrix(months, matrix, options)
+    return [
+        (series_months, labels, transformed[row, series_columns])
+        for row, (series_columns, (series_months, labels, _)) in enumerate(zip(columns, prepared))
+    ]
+
+
+def shape_many(series: list[tuple[np.ndarray, np.ndarray]], periods: PeriodTable, options: SeriesOptions) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    Applies `options` to several `(period_ids, values)` series and returns
+    their period labels (object arrays) and values, in the same order.
+
+    Without resampling, a transform or a point cap each series keeps its order;
+    otherwise it is sorted chronologically and periods without a start year
+    are dropped. Transforms run once over all the series stacked as a matrix.
+    """
+    prepared = [_prepare(period_ids, values, periods, options) for period_ids, values in series]
+    if options.transform is not None:
+        prepared = _transform_all(prepared, options)
+
+    shaped = []
+    for months, labels, values in prepared:
+        if options.max_points is not None and len(values) > options.max_points:
+            valid = ~np.isnan(values)
+            months, values, labels = months[valid], values[valid], labels[valid]
+            keep = lttb(months, values, options.max_points)
+            values, labels = values[keep], labels[keep]
+        shaped.append((labels, values))
+    return shaped
+
+
+def shape_series(period_ids: np.ndarray, values: np.ndarray, periods: PeriodTable, options: SeriesOptions) -> tuple[np.ndarray, np.ndarray]:
+    """Applies `options` to a single series; see `shape_many`."""
+    return shape_many([(period_ids, values)], periods, options)[0]
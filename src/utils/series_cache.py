@@ -0,0 +1,157 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable, Iterable, NamedTuple
+import numpy as np
+
+# Costo aproximado por entrada además de los arreglos (clave, tupla, objetos ndarray)
+ENTRY_OVERHEAD_BYTES = 256
+
+
+class Series(NamedTuple):
+    """One indicator × entity series: `period_ids` (int32) aligned with `values` (float64, NaN for NULL)."""
+    period_ids: np.ndarray
+    values: np.ndarray
+
+    @classmethod
+    def from_rows(cls, period_ids: Iterable[int], values: Iterable[float | None]) -> "Series":
+        return cls(
+            np.fromiter(period_ids, dtype=np.int32),
+            np.array([np.nan if value is None else value for value in values], dtype=np.float64),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.period_ids.nbytes + self.values.nbytes + ENTRY_OVERHEAD_BYTES
+
+
+class Ranking(NamedTuple):
+    """
+    Non-NULL values of one indicator × period sorted ascending, with their entities.
+
+    Ranks use competition ranking (ties share the best rank); the percentile
+    is the share of the other entities with a lower value.
+    """
+    entity_ids: np.ndarray
+    values: np.ndarray
+
+    @classmethod
+    def from_rows(cls, entity_ids: Iterable[int], values: Iterable[float]) -> "Ranking":
+        entity_ids = np.fromiter(entity_ids, dtype=np.int32)
+        values = np.fromiter(values, dtype=np.float64)
+        order = np.lexsort((entity_ids, values))
+        return cls(entity_ids[order], values[order])
+
+    @property
+    def nbytes(self) -> int:
+        return self.entity_ids.nbytes + self.values.nbytes + ENTRY_OVERHEAD_BYTES
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def top(self, k: int, descending: bool = True) -> np.ndarray:
+        """Positions of the first `k` entities in the requested order."""
+        return np.arange(len(self) - 1, max(len(self) - k, 0) - 1, -1) if descending else np.arange(min(k, len(self)))
+
+    def position(self, entity_id: int) -> int | None:
+        positions = np.flatnonzero(self.entity_ids == entity_id)
+        return int(positions[0]) if len(positions) else None
+
+    def ranks(self, positions: np.ndarray, descending: bool = True) -> np.ndarray:
+        values = self.values[positions]
+        if descending:
+            return len(self) - np.searchsorted(self.values, values, side="right") + 1
+        return np.searchsorted(self.values, values, side="left") + 1
+
+    def percentiles(self, positions: np.ndarray) -> np.ndarray:
+        lower = np.searchsorted(self.values, self.values[positions], side="left")
+        return lower * 100.0 / max(len(self) - 1, 1) if len(self) > 1 else np.full(len(lower), 100.0)
+
+
+class SeriesCache:
+    """
+    LRU cache of `Series` (or `Ranking`) bounded by the bytes of its arrays
+    instead of the number of entries.
+
+    Keys start with the indicator id: `(indicator_id, entity_id)` for series,
+    `(indicator_id, period_id)` for rankings. Entries only change when new
+    data is loaded, so they do not expire: the data version watcher calls
+    `invalidate` for the indicators whose data changed.
+
+    Args:
+        max_bytes (int): Memory budget; the least recently used series are evicted above it.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[Hashable, Series] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_many(self, keys: Iterable[Hashable]) -> tuple[dict[Hashable, Series], list[Hashable]]:
+        """Returns the cached series by key and the keys that were missing."""
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                series = self._data.get(key)
+                if series is None:
+                    missing.append(key)
+                    continue
+                self._data.move_to_end(key)
+                found[key] = series
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def get(self, key: Hashable) -> Series | None:
+        found, _ = self.get_many([key])
+        return found.get(key)
+
+    def set(self, key: Hashable, series: Series):
+        if series.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._data[key] = series
+            self._bytes += series.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def invalidate(self, indicator_id: int, entity_ids: Iterable[int] | None = None) -> int:
+        """Drops the series of an indicator, for all its entities or only the given ones."""
+        with self._lock:
+            if entity_ids is None:
+                keys = [key for key in self._data if key[0] == indicator_id]
+            else:
+                keys = [(indicator_id, entity_id) for entity_id in entity_ids if (indicator_id, entity_id) in self._data]
+            for key in keys:
+                self._bytes -= self._data.pop(key).nbytes
+            self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
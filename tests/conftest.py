@@ -0,0 +1,9 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Settings obligatorios de Firebase, sin credenciales reales: los tests no llaman a Firebase
+for name in ("firebase_project_id", "firebase_private_key_id", "firebase_private_key", "firebase_client_email",
+             "firebase_client_id", "firebase_client_x509_cert_url", "firebase_database_url"):
+    os.environ.setdefault(name.upper(), "test")
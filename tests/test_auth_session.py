@@ -0,0 +1,89 @@
+"""An authenticated request checks out exactly one pooled connection, shared by `verify_token` and the route."""
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from src.config.db_config import get_session
+from src.middleware.auth_middleware import verify_token
+from src.models.user_model import UserModel
+from src.schema.auth_schemas import UserIdentity
+from src.services.auth_service import AuthService
+
+
+@pytest.fixture
+def checkouts(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'auth.db'}", poolclass=QueuePool, pool_size=5)
+    UserModel.__table__.create(engine)
+    with engine.begin() as connection:
+        connection.execute(UserModel.__table__.insert().values(
+            id=1, email="user@example.com", name="Test User", email_verified=True))
+    TestSession = sessionmaker(autocommit=False, autoflush=True, bind=engine)
+
+    counter = {"checkouts": 0, "checked_out": 0, "peak": 0}
+
+    @event.listens_for(engine, "checkout")
+    def count_checkout(dbapi_connection, connection_record, connection_proxy):
+        counter["checkouts"] += 1
+        counter["checked_out"] += 1
+        counter["peak"] = max(counter["peak"], counter["checked_out"])
+
+    @event.listens_for(engine, "checkin")
+    def count_checkin(dbapi_connection, connection_record):
+        counter["checked_out"] -= 1
+
+    def get_test_db():
+        db = TestSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def validate_token(token: str) -> dict:
+        return {"uid": "uid-1", "email": "user@example.com", "name": "Test User"}
+
+    monkeypatch.setattr(AuthService, "validate_token", staticmethod(validate_token))
+    AuthService.user_cache.clear()
+
+    app = FastAPI()
+
+    @app.get("/me")
+    def me(db: Session = Depends(get_session), user: UserIdentity = Depends(verify_token)):
+        count = db.execute(text("SELECT COUNT(*) FROM user")).scalar()
+        return {"id": user.id, "users": count}
+
+    app.dependency_overrides[get_session] = get_test_db
+    yield TestClient(app), counter
+    AuthService.user_cache.clear()
+    engine.dispose()
+
+
+def test_authenticated_request_checks_out_one_connection(checkouts):
+    client, counter = checkouts
+
+    # Sin el usuario en cache: verify_token lo lee y la ruta consulta con la misma sesión
+    response = client.get("/me", headers={"Authorization": "Bearer firebase-token"})
+
+    assert response.status_code == 200
+    assert response.json() == {"id": 1, "users": 1}
+    assert counter["checkouts"] == 1
+    # La conexión vuelve al pool al cerrar la sesión
+    assert counter["checked_out"] == 0
+
+
+def test_new_user_never_holds_two_connections(checkouts, monkeypatch):
+    client, counter = checkouts
+
+    async def validate_token(token: str) -> dict:
+        return {"uid": "uid-2", "email": "new@example.com", "name": "New User"}
+
+    monkeypatch.setattr(AuthService, "validate_token", staticmethod(validate_token))
+
+    # Crear el usuario hace commit y la sesión vuelve a tomar una conexión, pero nunca dos a la vez
+    response = client.get("/me", headers={"Authorization": "Bearer firebase-token"})
+
+    assert response.status_code == 200
+    assert response.json() == {"id": 2, "users": 2}
+    assert counter["peak"] == 1
+    assert counter["checked_out"] == 0
@@ -0,0 +1,27 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from src.routes.api.v1 import indicators
+from src.utils.columnar import ColumnarFormat
+from src.utils.series import SeriesOptions
+
+
+def test_columnar_errors_are_reported_as_500(monkeypatch):
+    async def broken(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(indicators.indicators_service, "get_indicator_table_async", broken)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(indicators.columnar_response("GDP", ["ARG"], "en", None, SeriesOptions(), ColumnarFormat.ARROW))
+    assert error.value.status_code == 500
+    assert error.value.detail == "An unexpected error occurred. Please try again later."
+
+
+def test_columnar_missing_table_is_404(monkeypatch):
+    async def missing(*args):
+        return None
+
+    monkeypatch.setattr(indicators.indicators_service, "get_indicator_table_async", missing)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(indicators.columnar_response("GDP", ["ARG"], "en", None, SeriesOptions(), ColumnarFormat.ARROW))
+    assert error.value.status_code == 404
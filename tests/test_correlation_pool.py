@@ -0,0 +1,31 @@
+import asyncio
+import numpy as np
+from src.utils.correlation import CorrelationMethod, ProcessPool, correlation_matrix
+
+
+def test_pool_run_is_awaited_without_blocking_the_loop():
+    matrix = np.array([[1.0, 2.0, 3.0, 4.0], [2.0, 4.0, 6.0, np.nan], [4.0, 3.0, 2.0, 1.0]])
+    pool = ProcessPool(max_workers=1)
+
+    async def compute():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        task = asyncio.create_task(ticker())
+        result = await pool.run(correlation_matrix, matrix, CorrelationMethod.PEARSON, 3)
+        task.cancel()
+        return result, ticks
+
+    try:
+        (correlations, counts), ticks = asyncio.run(compute())
+    finally:
+        pool.shutdown()
+    # El event loop siguió corriendo mientras arrancaba el proceso y se calculaba la matriz
+    assert ticks > 1
+    assert np.allclose(correlations, [[1.0, 1.0, -1.0], [1.0, 1.0, -1.0], [-1.0, -1.0, 1.0]])
+    assert counts.tolist() == [[4, 3, 4], [3, 3, 3], [4, 3, 4]]
@@ -0,0 +1,27 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from src.services.data_version_service import DataVersionWatcher
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE indicator_data_versions (indicator_id INTEGER PRIMARY KEY, version INTEGER)"))
+        connection.execute(text("INSERT INTO indicator_data_versions VALUES (1, 3), (2, 5)"))
+    return sessionmaker(bind=engine)()
+
+
+def test_check_notifies_only_changed_indicators():
+    db = make_session()
+    watcher = DataVersionWatcher()
+    notified = []
+    watcher.add_listener(notified.append)
+
+    # La primera lectura solo toma la referencia
+    assert watcher.check(db) == []
+    db.execute(text("UPDATE indicator_data_versions SET version = 4 WHERE indicator_id = 1"))
+    db.execute(text("INSERT INTO indicator_data_versions VALUES (3, 1)"))
+
+    assert sorted(watcher.check(db)) == [1, 3]
+    assert watcher.check(db) == []
+    assert [sorted(ids) for ids in notified] == [[1, 3]]
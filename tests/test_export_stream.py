@@ -0,0 +1,46 @@
+import json
+from types import SimpleNamespace
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from src.models import indicators_model, user_model  # noqa: F401
+from src.models.base_model import Base
+from src.models.indicators_model import LANGUAGE
+from src.schema.responses.indicators_responses import ExportFormat
+from src.services import indicators_service
+from src.services.indicators_service import IndicatorsService
+
+
+def test_export_resolves_entities_first_and_reads_values_in_bounded_batches(monkeypatch):
+    engine = create_engine("sqlite://")
+    for table in ("entities", "entities_lang", "time_periods", "data_values"):
+        Base.metadata.tables[table].create(engine)
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO entities VALUES (:id, :code)"), [{"id": 1, "code": "ARG"}, {"id": 2, "code": "BRA"}])
+        connection.execute(text("""
+            INSERT INTO entities_lang (entity_id, lang, entity_name, entity_type) VALUES (:id, 'EN', :name, 'country')
+        """), [{"id": 1, "name": "Argentina"}, {"id": 2, "name": "Brazil"}])
+        connection.execute(text("""
+            INSERT INTO time_periods (period_id, period_label, start_year, start_month, end_year, end_month)
+            VALUES (:id, :label, :year, 'January', :year, 'December')
+        """), [{"id": year - 1999, "label": str(year), "year": year} for year in range(2000, 2004)])
+        connection.execute(text("""
+            INSERT INTO data_values (entity_id, indicator_id, period_id, value) VALUES (:entity, 1, :period, :value)
+        """), [{"entity": entity, "period": period, "value": entity * 10 + period}
+               for entity in (2, 1) for period in range(4, 0, -1)])
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    monkeypatch.setattr(indicators_service._SETTINGS, "export_batch_size", 3)
+    indicator = SimpleNamespace(indicator_id=1, indicator_code="GDP")
+
+    lines = "".join(IndicatorsService().export_indicator(
+        indicator, None, LANGUAGE.EN, ExportFormat.NDJSON, sessionmaker(bind=engine))).splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [(row["entity_code"], row["period"]) for row in rows] == [
+        (code, str(year)) for code in ("ARG", "BRA") for year in range(2000, 2004)]
+    assert rows[0] == {"indicator_code": "GDP", "entity_code": "ARG", "entity_name": "Argentina", "period": "2000", "value": 11.0}
+
+    # 8 valores en lotes de 3: tres consultas, y ninguna de entidades después de la primera
+    reads = [index for index, statement in enumerate(statements) if "data_id" in statement]
+    assert len(reads) == 3
+    assert not any("entities" in statement for statement in statements[reads[0]:])
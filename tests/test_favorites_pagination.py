@@ -0,0 +1,55 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.config.db_config import get_session
+from src.middleware.auth_middleware import verify_token
+from src.models import indicators_model, user_model  # noqa: F401
+from src.models.base_model import Base
+from src.routes.api.v1 import favorites
+from src.schema.auth_schemas import UserIdentity
+
+
+@pytest.fixture
+def client(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    for table in ("user", "indicators", "indicators_lang"):
+        Base.metadata.tables[table].create(engine)
+    with engine.begin() as connection:
+        # `updated_at` usa ON UPDATE de MySQL: la tabla se crea a mano en SQLite
+        connection.execute(text("CREATE TABLE user_indicator_favs (user_id INTEGER, indicator_id INTEGER, is_favorite BOOLEAN)"))
+        connection.execute(text("INSERT INTO user (id, email, email_verified) VALUES (1, 'user@example.com', 1)"))
+        connection.execute(text("INSERT INTO indicators (indicator_id, indicator_code, data_count) VALUES (:id, :code, :id)"),
+                           [{"id": index, "code": f"IND{index}"} for index in range(1, 61)])
+        connection.execute(text("""
+            INSERT INTO indicators_lang (indicator_id, lang, indicator_name, description) VALUES (:id, 'EN', :name, 'Description')
+        """), [{"id": index, "name": f"Indicator {index}"} for index in range(1, 61)])
+        connection.execute(text("INSERT INTO user_indicator_favs (user_id, indicator_id, is_favorite) VALUES (1, :id, 1)"),
+                           [{"id": index} for index in range(1, 61)])
+    session_factory = sessionmaker(bind=engine)
+
+    def session():
+        with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(favorites.router)
+    app.dependency_overrides[get_session] = session
+    app.dependency_overrides[verify_token] = lambda: UserIdentity(id=1, email="user@example.com")
+    return TestClient(app)
+
+
+def test_favorites_return_the_full_list_by_default(client):
+    response = client.get("/favorites", params={"include": "none"})
+    assert response.status_code == 200
+    assert isinstance(response.json(), list) and len(response.json()) == 60
+
+
+def test_favorites_paginate_on_request(client):
+    page = client.get("/favorites", params={"include": "none", "limit": 40}).json()
+    assert len(page["items"]) == 40 and page["next_cursor"]
+    rest = client.get("/favorites", params={"include": "none", "cursor": page["next_cursor"]}).json()
+    assert len(rest["items"]) == 20 and rest["next_cursor"] is None
+    assert client.get("/favorites", params={"cursor": "broken"}).status_code == 400
@@ -0,0 +1,29 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.middleware import auth_middleware
+from src.middleware.auth_middleware import verify_token
+from src.routes.api.v1 import metrics
+from src.schema.auth_schemas import UserIdentity
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(auth_middleware, "_ADMIN_EMAILS", {"admin@example.com"})
+    app = FastAPI()
+    app.include_router(metrics.router)
+    yield TestClient(app), app
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("path", ["/metrics/db-pool", "/metrics/db-replicas", "/metrics/caches"])
+def test_metrics_require_credentials(client, path):
+    test_client, _ = client
+    assert test_client.get(path).status_code in (401, 403)
+
+
+@pytest.mark.parametrize("email, expected", [("user@example.com", 403), ("Admin@Example.com", 200)])
+def test_metrics_require_an_admin(client, email, expected):
+    test_client, app = client
+    app.dependency_overrides[verify_token] = lambda: UserIdentity(id=1, email=email)
+    assert test_client.get("/metrics/caches").status_code == expected
@@ -0,0 +1,34 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from src.models import indicators_model, user_model  # noqa: F401
+from src.models.base_model import Base
+from src.services.data_version_service import data_version_watcher
+from src.services.indicators_service import IndicatorsService
+
+
+def test_data_version_change_rebuilds_the_ranking():
+    engine = create_engine("sqlite://")
+    Base.metadata.tables["data_values"].create(engine)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE indicator_data_versions (indicator_id INTEGER PRIMARY KEY, version INTEGER)"))
+        connection.execute(text("INSERT INTO indicator_data_versions VALUES (1, 1), (2, 1)"))
+        connection.execute(text("""
+            INSERT INTO data_values (entity_id, indicator_id, period_id, value) VALUES (:entity, :indicator, 1, :value)
+        """), [{"entity": 1, "indicator": 1, "value": 10}, {"entity": 2, "indicator": 1, "value": 20},
+               {"entity": 1, "indicator": 2, "value": 5}])
+    service = IndicatorsService()
+    IndicatorsService.ranking_cache.clear()
+    db = sessionmaker(bind=engine)()
+    data_version_watcher.check(db)
+
+    assert service.get_ranking(db, 1, 1).values.tolist() == [10.0, 20.0]
+    other = service.get_ranking(db, 2, 1)
+    db.execute(text("UPDATE data_values SET value = 30 WHERE entity_id = 1 AND indicator_id = 1"))
+    db.execute(text("UPDATE indicator_data_versions SET version = 2 WHERE indicator_id = 1"))
+    assert data_version_watcher.check(db) == [1]
+
+    # Solo se reconstruye el ranking del indicador que cambió
+    assert service.get_ranking(db, 1, 1).values.tolist() == [20.0, 30.0]
+    assert service.get_ranking(db, 2, 1) is other
+    IndicatorsService.ranking_cache.clear()
+    data_version_watcher._versions = None
@@ -0,0 +1,26 @@
+import time
+from src.config.db_routing import RecentWriters
+
+
+def test_note_prunes_expired_writers():
+    writers = RecentWriters(window_seconds=0.01)
+    for user_id in range(1000):
+        writers.note(user_id)
+    time.sleep(0.02)
+
+    # Usuarios que no vuelven a leer no se quedan en memoria
+    writers.note(5000)
+
+    assert len(writers) == 1
+    assert writers.is_recent(5000)
+    assert not writers.is_recent(0)
+
+
+def test_note_renews_the_window():
+    writers = RecentWriters(window_seconds=60)
+    writers.note(1)
+    writers.note(2)
+    writers.note(1)
+
+    assert writers.is_recent(1) and writers.is_recent(2)
+    assert len(writers) == 2
@@ -0,0 +1,15 @@
+import asyncio
+from sqlalchemy import create_engine
+from src.config.db_routing import Replica, ReplicaSet
+
+
+def test_status_reports_health_without_error_details():
+    async def ping():
+        raise ConnectionError("Can't connect to MySQL server on 'db-replica.internal:3306'")
+
+    replicas = ReplicaSet([Replica(name="replica_0", engine=create_engine("sqlite://"), ping=ping)])
+    asyncio.run(replicas.check())
+    [status] = replicas.status()
+    assert status == {"name": "replica_0", "healthy": False, "last_check_at": status["last_check_at"], "last_healthy_at": None}
+    assert status["last_check_at"] is not None
+    assert "db-replica" not in str(status)
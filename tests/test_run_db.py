@@ -0,0 +1,26 @@
+import asyncio
+import threading
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from src.config.db_config import USE_PRIMARY, run_db, use_primary
+
+
+def test_cpu_bound_code_leaves_the_event_loop_with_an_async_session():
+    db = AsyncSession()
+    use_primary(db)
+    seen = {}
+
+    def compute(session, value, scale=1):
+        seen.update(thread=threading.get_ident(), session=session, pinned=session.info.get(USE_PRIMARY))
+        return value * scale
+
+    async def main():
+        result = await run_db(db, compute, 21, scale=2, cpu_bound=True)
+        return result, threading.get_ident()
+
+    result, loop_thread = asyncio.run(main())
+    assert result == 42
+    # Corre en el threadpool, con una sesión síncrona que conserva el primario fijado
+    assert seen["thread"] != loop_thread
+    assert type(seen["session"]) is not AsyncSession and isinstance(seen["session"], Session)
+    assert seen["pinned"] is True
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from src.models import indicators_model, user_model  # noqa: F401
+from src.models.base_model import Base
+from src.models.indicators_model import LANGUAGE
+from src.schema.responses.indicators_responses import EntityInclude
+from src.services import indicators_service
+from src.services.indicators_service import CURSOR_DATA_COUNT, CURSOR_MATCH, IndicatorsService
+from src.services.search_index_service import IndicatorSearchIndex
+from src.utils.cursor import InvalidCursor, cursor_kind, decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor(CURSOR_MATCH, 1.0, 3)[:-2], "W10"])
+def test_malformed_cursors_raise_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, CURSOR_MATCH)
+
+
+@pytest.fixture
+def search(monkeypatch):
+    engine = create_engine("sqlite://")
+    for table in ("indicators", "indicators_lang"):
+        Base.metadata.tables[table].create(engine)
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO indicators (indicator_id, indicator_code, data_count) VALUES (:id, :code, :id)"),
+                           [{"id": index, "code": f"GDP{index}"} for index in range(1, 4)])
+        connection.execute(text("""
+            INSERT INTO indicators_lang (indicator_id, lang, indicator_name, description)
+            VALUES (:id, 'EN', :name, 'Gross domestic product')
+        """), [{"id": index, "name": f"GDP {index}"} for index in range(1, 4)])
+    db = sessionmaker(bind=engine)()
+    index = IndicatorSearchIndex()
+    index.refresh(db)
+    monkeypatch.setattr(indicators_service, "indicator_search_index", index)
+
+    def run(cursor):
+        return IndicatorsService()._search_shared_indicators("gdp", 2, LANGUAGE.EN, db, cursor, EntityInclude.NONE)
+    return run
+
+
+def test_cursor_from_the_sql_search_restarts_on_the_index(search):
+    first = search(None)
+    assert cursor_kind(first.next_cursor) != CURSOR_MATCH
+    # Un cursor emitido por MATCH ... AGAINST antes de que el índice estuviera listo
+    restarted = search(encode_cursor(CURSOR_MATCH, 12.5, 2))
+    assert [item.id for item in restarted.items] == [item.id for item in first.items]
+    assert len(search(first.next_cursor).items) == 1
+
+
+def test_cursor_of_another_listing_is_invalid(search):
+    with pytest.raises(InvalidCursor):
+        search(encode_cursor(CURSOR_DATA_COUNT, 3, 3))
@@ -0,0 +1,76 @@
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.models import indicators_model, user_model  # noqa: F401
+from src.models.base_model import Base
+from src.services import indicators_service
+from src.services.indicators_service import IndicatorsService
+from src.utils.series import SeriesOptions, shape_series
+
+
+def test_windowed_request_caches_the_full_series():
+    engine = create_engine("sqlite://")
+    Base.metadata.tables["time_periods"].create(engine)
+    Base.metadata.tables["data_values"].create(engine)
+    with engine.begin() as connection:
+        connection.execute(text("""
+            INSERT INTO time_periods (period_id, period_label, start_year, start_month, end_year, end_month)
+            VALUES (:id, :label, :year, 'January', :year, 'December')
+        """), [{"id": year - 1999, "label": str(year), "year": year} for year in range(2000, 2010)])
+        connection.execute(text("""
+            INSERT INTO data_values (entity_id, indicator_id, period_id, value) VALUES (1, 1, :id, :value)
+        """), [{"id": period_id, "value": period_id * 10} for period_id in range(1, 11)])
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    service = IndicatorsService()
+    IndicatorsService.series_cache.clear()
+    db = sessionmaker(bind=engine)()
+
+    window = SeriesOptions(from_year=2003, to_year=2005)
+    series = service.get_series(db, [1], [1])[(1, 1)]
+    labels, values = shape_series(series.period_ids, series.values, service.get_periods(db), window)
+    assert labels.tolist() == ["2003", "2004", "2005"]
+    assert values.tolist() == [40.0, 50.0, 60.0]
+
+    # Otra ventana sale del cache, sin volver a leer data_values
+    reads = sum("data_values" in statement for statement in statements)
+    assert len(service.get_series(db, [1], [1])[(1, 1)].values) == 10
+    assert sum("data_values" in statement for statement in statements) == reads == 1
+    IndicatorsService.series_cache.clear()
+
+
+def test_large_windowed_miss_reads_the_window_and_caches_the_full_series_in_background(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    for table in ("time_periods", "data_values", "indicator_entities"):
+        Base.metadata.tables[table].create(engine)
+    with engine.begin() as connection:
+        connection.execute(text("""
+            INSERT INTO time_periods (period_id, period_label, start_year, start_month, end_year, end_month)
+            VALUES (:id, :label, :year, 'January', :year, 'December')
+        """), [{"id": year - 1999, "label": str(year), "year": year} for year in range(2000, 2010)])
+        connection.execute(text("""
+            INSERT INTO data_values (entity_id, indicator_id, period_id, value) VALUES (:entity, 1, :id, :value)
+        """), [{"entity": entity, "id": period_id, "value": period_id * 10} for entity in (1, 2) for period_id in range(1, 11)])
+        # La entidad 1 supera el umbral; la 2 no
+        connection.execute(text("INSERT INTO indicator_entities VALUES (1, 1, 10), (1, 2, 3)"))
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session_factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(indicators_service, "SessionLocal", session_factory)
+    monkeypatch.setattr(indicators_service._SETTINGS, "series_window_min_values", 5)
+    service = IndicatorsService()
+    IndicatorsService.series_cache.clear()
+
+    with session_factory() as db:
+        series = service.get_series(db, [1], [1, 2], from_year=2003, to_year=2005)
+    # La serie grande llega recortada en SQL; la chica completa, como siempre
+    assert series[(1, 1)].values.tolist() == [40.0, 50.0, 60.0]
+    assert len(series[(1, 2)].values) == 10
+    assert any("period_id IN" in statement for statement in statements)
+
+    IndicatorsService.series_loader.submit(lambda: None).result()
+    cached, missing = IndicatorsService.series_cache.get_many([(1, 1), (1, 2)])
+    assert not missing and len(cached[(1, 1)].values) == 10
+    IndicatorsService.series_cache.clear()
@@ -0,0 +1,23 @@
+import pytest
+from src.schema.auth_schemas import UserIdentity
+from src.services.session_token_service import SessionTokenService
+
+USER = UserIdentity(id=7, email="user@example.com")
+
+
+def test_tokens_are_valid_across_instances_with_the_same_secret():
+    token, _ = SessionTokenService("shared-secret").issue(USER)
+    payload = SessionTokenService("shared-secret").verify(token)
+    assert SessionTokenService.to_identity(payload) == USER
+    with pytest.raises(ValueError):
+        SessionTokenService("other-secret").verify(token)
+
+
+def test_without_secret_session_tokens_are_disabled():
+    token, _ = SessionTokenService("shared-secret").issue(USER)
+    service = SessionTokenService("")
+    assert not service.enabled
+    with pytest.raises(RuntimeError):
+        service.issue(USER)
+    with pytest.raises(ValueError):
+        service.verify(token)
@@ -0,0 +1,19 @@
+from src.services.suggest_index_service import SUGGEST_ENTITY, SUGGEST_INDICATOR, PrefixIndex, Suggestion, _ranked
+
+
+def test_kinds_are_ranked_relative_to_their_own_counts():
+    indicators = [Suggestion(SUGGEST_INDICATOR, i, f"I{i}", f"Gdp {i}", count) for i, count in enumerate([100, 50, 10])]
+    # Las entidades suman valores de todos sus indicadores: conteos mucho mayores
+    entities = [Suggestion(SUGGEST_ENTITY, i, f"E{i}", f"Germany {i}", count) for i, count in enumerate([90000, 80000, 70000, 5])]
+
+    index = PrefixIndex(_ranked([indicators, entities]), top_k=5)
+    top = index.search("g", 4)
+
+    assert [(s.kind, s.data_count) for s in top] == [
+        (SUGGEST_INDICATOR, 100), (SUGGEST_ENTITY, 90000), (SUGGEST_ENTITY, 80000), (SUGGEST_INDICATOR, 50)]
+
+
+def test_ties_share_a_rank():
+    suggestions = [Suggestion(SUGGEST_INDICATOR, i, f"I{i}", name, 10) for i, name in enumerate(["Beta", "Alpha"])]
+
+    assert [s.name for s in _ranked([suggestions])] == ["Alpha", "Beta"]
@@ -0,0 +1,103 @@
+import asyncio
+import datetime
+import threading
+import time
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt
+from google.auth import jwt as google_jwt
+from src.services.auth_service import AuthService, FirebaseTokenVerifier, StaticCertSource
+
+PROJECT_ID = "axioma-test"
+KID = "local-key"
+
+
+def key_pair() -> tuple[rsa.RSAPrivateKey, str]:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "securetoken")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    return key, certificate.public_bytes(serialization.Encoding.PEM).decode("ascii")
+
+
+@pytest.fixture(scope="module")
+def keys():
+    return key_pair()
+
+
+@pytest.fixture
+def verifier(keys):
+    _, certificate = keys
+    verifier = FirebaseTokenVerifier(PROJECT_ID, StaticCertSource({KID: certificate}))
+    asyncio.run(verifier.refresh())
+    return verifier
+
+
+def sign(key: rsa.RSAPrivateKey, **overrides) -> str:
+    now = int(time.time())
+    payload = {
+        "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+        "aud": PROJECT_ID,
+        "sub": "firebase-uid",
+        "email": "user@example.com",
+        "iat": now,
+        "exp": now + 3600,
+        **overrides,
+    }
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    return google_jwt.encode(crypt.RSASigner.from_string(pem, key_id=KID), payload).decode("ascii")
+
+
+def test_valid_token_passes(verifier, keys):
+    claims = verifier.verify(sign(keys[0]))
+    assert claims["uid"] == "firebase-uid" and claims["email"] == "user@example.com"
+
+
+@pytest.mark.parametrize("overrides", [
+    {"aud": "another-project"},
+    {"iss": "https://securetoken.google.com/another-project"},
+    {"iat": int(time.time()) - 7200, "exp": int(time.time()) - 3600},
+    {"sub": ""},
+], ids=["audience", "issuer", "expired", "subject"])
+def test_invalid_claims_are_rejected(verifier, keys, overrides):
+    with pytest.raises(ValueError):
+        verifier.verify(sign(keys[0], **overrides))
+
+
+def test_bad_signature_is_rejected(verifier):
+    other_key, _ = key_pair()
+    with pytest.raises(ValueError):
+        verifier.verify(sign(other_key))
+
+
+def test_verify_requires_certificates():
+    with pytest.raises(ValueError):
+        FirebaseTokenVerifier(PROJECT_ID, StaticCertSource({})).verify("token")
+
+
+def test_validate_token_verifies_off_the_event_loop(monkeypatch, verifier, keys):
+    threads = []
+    verify = verifier.verify
+    monkeypatch.setattr(verifier, "verify", lambda token: threads.append(threading.get_ident()) or verify(token))
+    monkeypatch.setattr(AuthService, "token_verifier", verifier)
+    AuthService.token_cache.clear()
+
+    async def main():
+        claims = await AuthService.validate_token(sign(keys[0]))
+        return claims, threading.get_ident()
+
+    claims, loop_thread = asyncio.run(main())
+    AuthService.token_cache.clear()
+    assert claims["uid"] == "firebase-uid"
+    assert threads and threads[0] != loop_thread